@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+优先级/行动计划存储基准
+运行: python benchmarks/bench_actions.py [写入次数]
+
+对比点击 “更新优先级”、“执行推荐” 时 UI 线程的等待时间:
+- 同步: 每次点击打开连接、写入并提交一个事务
+- 写后队列: ActionStore 只入队，后台线程批量提交
+并统计多个 AM 会话并发写入时的吞吐，以及读缓存命中时的读取耗时。
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.actions import ActionStore, _connect
+
+
+def sync_writes(path, n):
+    latencies = []
+    for i in range(n):
+        start = time.perf_counter()
+        conn = _connect(path)
+        with conn:
+            conn.execute(
+                "INSERT INTO priority_overrides (seller, priority, am, updated) VALUES (?, ?, '', ?) "
+                "ON CONFLICT(seller) DO UPDATE SET priority = excluded.priority, updated = excluded.updated",
+                (f"Seller{i % 500:04d}", ["P0", "P1", "P2"][i % 3], time.time()),
+            )
+        conn.close()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def queued_writes(store, n, am=""):
+    latencies = []
+    for i in range(n):
+        start = time.perf_counter()
+        store.set_priority(f"Seller{i % 500:04d}", ["P0", "P1", "P2"][i % 3], am=am)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def p99(values):
+    return sorted(values)[int(len(values) * 0.99)] * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ActionStore(Path(tmp) / "actions.sqlite")
+
+        latencies = sync_writes(store.path, n)
+        print(f"同步提交 {n} 次写入: 平均 {sum(latencies) / n * 1000:.3f} ms, p99 {p99(latencies):.3f} ms")
+
+        start = time.perf_counter()
+        latencies = queued_writes(store, n)
+        enqueued = time.perf_counter() - start
+        store.flush()
+        total = time.perf_counter() - start
+        print(f"写后队列 {n} 次写入: 平均 {sum(latencies) / n * 1000:.4f} ms, p99 {p99(latencies):.4f} ms"
+              f"（入队 {enqueued * 1000:.1f} ms，全部落盘 {total * 1000:.1f} ms）")
+
+        sessions = 16
+        before = store.committed
+        start = time.perf_counter()
+        threads = [threading.Thread(target=queued_writes, args=(store, n, f"AM{t}")) for t in range(sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        store.flush()
+        elapsed = time.perf_counter() - start
+        written = store.committed - before
+        print(f"{sessions} 个会话并发写入 {written:,} 次: {elapsed * 1000:.0f} ms（{written / elapsed:,.0f} 次/秒）")
+
+        store.priorities()
+        start = time.perf_counter()
+        for _ in range(1000):
+            store.priorities()
+        cached = (time.perf_counter() - start) / 1000
+        conn = sqlite3.connect(store.path)
+        start = time.perf_counter()
+        for _ in range(100):
+            dict(conn.execute("SELECT seller, priority FROM priority_overrides"))
+        uncached = (time.perf_counter() - start) / 100
+        conn.close()
+        print(f"读取全部优先级: 缓存 {cached * 1000:.3f} ms, 直接查询 {uncached * 1000:.3f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
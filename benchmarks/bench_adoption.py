@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+功能采用位图索引基准
+运行: python benchmarks/bench_adoption.py [卖家数量]
+
+对比位图索引和 pandas 布尔筛选（国家、类目为 category 列，功能为 bool 列）:
+- 人群查询 “GMV强劲、已用FBA、未启用广告”（所选国家）的计数
+- 按国家 / 类目的各功能采用率汇总
+- AI功能采用建议（全部规则的人群数量和示例卖家）
+以及两种表示的内存占用。
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.adoption import ADOPTION_RULES, AdoptionIndex, GMV_TIERS, generate_mock_adoption
+from grow.datastore import generate_mock_data
+from grow.schema import FEATURE_FLAGS
+
+COUNTRIES = ["SG", "MY", "TH"]
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def pandas_rules(frame):
+    scope = frame["Country"].isin(COUNTRIES)
+    result = []
+    for _, _, _, conditions in ADOPTION_RULES:
+        mask = scope & frame["GMV档位"].isin(conditions.get("gmv", GMV_TIERS))
+        for feature in conditions.get("has", []):
+            mask &= frame[feature]
+        for feature in conditions.get("lacks", []):
+            mask &= ~frame[feature]
+        matched = frame.loc[mask, ["Seller", "GMV"]]
+        result.append((len(matched), matched["Seller"].iloc[matched["GMV"].argmax()]))
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sellers = generate_mock_data(n)
+    adopted = generate_mock_adoption(sellers)
+    start = time.perf_counter()
+    index = AdoptionIndex.from_frame(sellers, adopted)
+    print(f"{n:,} 个卖家，建立位图索引 {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rank = sellers["GMV"].rank(ascending=False, method="first") - 1
+    frame = pd.DataFrame({
+        "Seller": sellers["Seller"],
+        "Country": sellers["Country"].astype("category"),
+        "Category": sellers["Category"].astype("category"),
+        "GMV": sellers["GMV"],
+        "GMV档位": pd.Categorical(np.select([rank < 0.3 * n, rank < 0.7 * n], GMV_TIERS[:2], GMV_TIERS[2]),
+                                categories=GMV_TIERS),
+    })
+    frame[FEATURE_FLAGS] = adopted
+
+    bitmap_bytes = index.features.nbytes + sum(bits.nbytes for _, bits in index.groups.values())
+    pandas_bytes = frame.drop(columns=["Seller", "GMV"]).memory_usage(deep=True).sum()
+    print(f"内存: 位图 {bitmap_bytes / 1e6:.1f} MB，pandas 列 {pandas_bytes / 1e6:.1f} MB")
+
+    cases = [
+        ("人群查询", lambda: index.count(index.query(gmv=["强劲"], has=["FBA"], lacks=["广告"], countries=COUNTRIES)),
+         lambda: int((frame["GMV档位"].eq("强劲") & frame["FBA"] & ~frame["广告"]
+                      & frame["Country"].isin(COUNTRIES)).sum())),
+        ("按国家汇总", lambda: index.adoption_rates("国家"),
+         lambda: frame.groupby("Country", observed=True)[FEATURE_FLAGS].mean()),
+        ("按类目汇总", lambda: index.adoption_rates("类目", COUNTRIES),
+         lambda: frame[frame["Country"].isin(COUNTRIES)].groupby("Category", observed=True)[FEATURE_FLAGS].mean()),
+        ("采用建议", lambda: [(r[3], r[4]) for r in index.recommendations(COUNTRIES)], lambda: pandas_rules(frame)),
+    ]
+    for label, bitmap_fn, pandas_fn in cases:
+        bitmap, bitmap_result = timed(bitmap_fn)
+        masked, pandas_result = timed(pandas_fn)
+        if isinstance(bitmap_result, pd.DataFrame):
+            expected = pandas_result.loc[bitmap_result.iloc[:, 0]]
+            assert np.allclose(bitmap_result[FEATURE_FLAGS].to_numpy(), expected.to_numpy())
+        else:
+            assert bitmap_result == pandas_result
+        print(f"{label}: 位图 {bitmap * 1000:.2f} ms，pandas 布尔筛选 {masked * 1000:.1f} ms（{masked / bitmap:,.0f}x）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+接触节奏引擎基准
+运行: python benchmarks/bench_cadence.py [潜在卖家数量]
+
+潜在卖家在两周内陆续加入节奏，模拟时钟推进 30 天，统计:
+- 加入（排期）耗时、全部接触发出的吞吐（FakeSink 与逐条发送的堆调度器对比）
+- 修改响应阈值后重新安排升级跟进的耗时
+- 通过本地 SMTP / WhatsApp 替身发送的吞吐
+"""
+
+import heapq
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.cadence import (
+    CadenceEngine, FakeSink, SmtpSender, WhatsAppSender, CADENCE, DAY, ESCALATION_CHANNELS,
+    MOCK_RESPONSE_RATES, simulate_responses,
+)
+from grow.stub_servers import SmtpSink, WhatsAppSink
+
+T0 = 20_000 * DAY
+
+
+def fake_senders():
+    return {channel: FakeSink(keep=0) for channel in ["邮件", *ESCALATION_CHANNELS]}
+
+
+def naive_heap(names, starts, threshold_days, horizon):
+    """逐条入堆、逐条弹出并单独调用发送器的调度器"""
+    sink = FakeSink(keep=0)
+    rng = np.random.default_rng(0)
+    offsets = [t.offset_days for t in CADENCE] + [threshold_days]
+    heap = []
+    for i, start in enumerate(starts.tolist()):
+        for step, offset in enumerate(offsets):
+            heapq.heappush(heap, (start + offset * DAY, i, step))
+    responded = np.zeros(len(names), dtype=bool)
+    while heap and heap[0][0] <= horizon:
+        _, i, step = heapq.heappop(heap)
+        if responded[i]:
+            continue
+        sink.send([{"prospect": names[i], "touch": step}])
+        responded[i] = rng.random() < MOCK_RESPONSE_RATES[step]
+    return sink.sent
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    names = [f"Prospect{i:07d}" for i in range(n)]
+    starts = T0 + np.random.default_rng(1).uniform(0, 14, n) * DAY
+    horizon = T0 + 30 * DAY
+
+    engine = CadenceEngine(fake_senders(), on_sent=simulate_responses, clock=lambda: T0)
+    start = time.perf_counter()
+    engine.enroll(names, starts)
+    enrolled = time.perf_counter() - start
+    print(f"{n:,} 个潜在卖家加入节奏: {enrolled * 1000:.0f} ms（{len(engine._slots)} 个时间轮刻度）")
+
+    start = time.perf_counter()
+    engine.catch_up(T0 + 10 * DAY)
+    # 阈值修改发生在节奏进行中
+    replan_start = time.perf_counter()
+    replanned = engine.configure(threshold_days=5)
+    replan = time.perf_counter() - replan_start
+    engine.catch_up(horizon)
+    elapsed = time.perf_counter() - start - replan
+    sent = int(engine.sent.sum())
+    print(f"时间轮: 30 天内发出 {sent:,} 条接触，{elapsed * 1000:.0f} ms（{sent / elapsed:,.0f} 条/秒）")
+    print(f"修改响应阈值: 重新安排 {replanned:,} 个升级跟进，{replan * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    naive_sent = naive_heap(names, starts, 7, horizon)
+    naive = time.perf_counter() - start
+    print(f"逐条堆调度: 发出 {naive_sent:,} 条接触（含排期），{naive * 1000:.0f} ms"
+          f"（{naive_sent / naive:,.0f} 条/秒）")
+
+    messages = [{"prospect": name, "channel": "邮件", "touch": "Day 1", "content": "初次介绍"}
+                for name in names[:5000]]
+    with SmtpSink() as smtp, WhatsAppSink() as whatsapp:
+        for label, sender in [("SMTP 替身", SmtpSender(*smtp.address)), ("WhatsApp 替身", WhatsAppSender(whatsapp.url))]:
+            start = time.perf_counter()
+            for batch in range(0, len(messages), 1000):
+                sender.send(messages[batch:batch + 1000])
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {len(messages):,} 条 {elapsed * 1000:.0f} ms（{len(messages) / elapsed:,.0f} 条/秒）")
+
+
+if __name__ == "__main__":
+    main()
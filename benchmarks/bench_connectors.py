@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+数据源拉取耗时基准
+运行: python benchmarks/bench_connectors.py
+
+用本地替身服务器模拟三个数据源的延迟，对比逐个同步拉取和并发拉取的首屏耗时。
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.connectors import ConnectorPool
+from grow.stub_servers import start_stub_sources
+
+LATENCIES = {"Quicksight": 0.6, "VOS Hub": 0.4, "Selection AI": 0.25}
+ROUNDS = 5
+
+
+def main():
+    servers = start_stub_sources(LATENCIES)
+    sources = [s.source() for s in servers]
+    pool = ConnectorPool(sources)
+    try:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for source in sources:
+                requests.get(source.base_url + source.path, timeout=source.timeout).json()
+        sequential = (time.perf_counter() - start) / ROUNDS
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            pool.fetch_all_sync()
+        concurrent = (time.perf_counter() - start) / ROUNDS
+    finally:
+        pool.close()
+        for s in servers:
+            s.stop()
+
+    print("数据源延迟: " + ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in LATENCIES.items()))
+    print(f"逐个同步拉取: {sequential * 1000:7.0f} ms")
+    print(f"并发拉取:     {concurrent * 1000:7.0f} ms (最慢数据源 {max(LATENCIES.values()) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
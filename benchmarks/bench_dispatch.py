@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+批量发送基准
+运行: python benchmarks/bench_dispatch.py [卖家数量] [渲染进程数]
+
+向 N 个卖家发送定制化指导（默认 5 万）:
+- 提交任务阻塞调用方（Streamlit 会话）的时间
+- 后台线程内渲染与进程池渲染的端到端耗时（FakeSink）
+- 发送期间主线程的响应延迟（每 10 ms 醒来一次的计时器的最大超时）
+- 经本地 SMTP 替身发送的吞吐
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.cadence import FakeSink
+from grow.dispatch import Dispatcher, SmtpMailer
+from grow.stub_servers import SmtpSink
+
+
+def interventions(n):
+    rng = np.random.RandomState(0)
+    milestones = np.array(["账户设置", "KYC验证", "产品Listing", "首次发货"], dtype=object)
+    issues = np.array(["账户信息待补充", "KYC文档缺失", "Listing质量", "首次发货延迟"], dtype=object)
+    step = rng.randint(0, 4, n)
+    return pd.DataFrame({
+        "卖家": [f"Onboarding{i:07d}" for i in range(n)],
+        "里程碑": milestones[step],
+        "识别问题": issues[step],
+        "已延迟": rng.randint(1, 15, n),
+        "推荐行动": "联系协助",
+        "预期解决时间": rng.randint(1, 4, n),
+        "优先级": "高",
+    })
+
+
+def probe(stop, lags):
+    """主线程计时器: 记录每次醒来比预期晚了多久"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        time.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+def run(label, dispatcher, frame):
+    start = time.perf_counter()
+    job = dispatcher.submit("onboarding_guidance", frame)
+    submitted = time.perf_counter() - start
+    stop, lags = threading.Event(), []
+    watcher = threading.Thread(target=lambda: (job.wait(), stop.set()))
+    watcher.start()
+    probe(stop, lags)
+    watcher.join()
+    dispatcher.close()
+    print(f"{label}: 提交 {submitted * 1000:.1f} ms，完成 {job.elapsed:.2f} s"
+          f"（{job.sent / job.elapsed:,.0f} 封/秒），主线程最大延迟 {max(lags) * 1000:.1f} ms")
+    return job
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, os.cpu_count() or 1)
+    frame = interventions(n)
+    print(f"{n:,} 个卖家，{os.cpu_count()} 个 CPU 核")
+
+    run("后台线程渲染", Dispatcher(FakeSink(keep=0), workers=1), frame)
+    # 第一次使用进程池包含启动 worker 的时间
+    run(f"进程池渲染（{workers} 进程）", Dispatcher(FakeSink(keep=0), workers=workers), frame)
+
+    with SmtpSink() as smtp:
+        job = run("SMTP 替身", Dispatcher(SmtpMailer(*smtp.address), workers=1), frame)
+        assert smtp.received == job.sent == n
+
+
+if __name__ == "__main__":
+    main()
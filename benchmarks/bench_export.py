@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+报告导出基准
+运行: python benchmarks/bench_export.py [CSV/Parquet 行数] [Excel 行数]
+
+由 Parquet 文件中的成功报告（默认 100 万行，Excel 默认 5 万行）导出到磁盘文件:
+- 逐批流式导出（grow.export，每批 BATCH_ROWS 行）
+- 对照: 读入完整 DataFrame，pandas to_csv / to_excel / to_parquet 写入内存中的 BytesIO
+每种方式各在一个子进程中运行，比较耗时和峰值内存（子进程最大 RSS，减去只导入依赖的空载子进程）。
+"""
+
+import io
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.export import export
+from grow.schema import FEATURE_FLAGS
+
+
+def write_mock_report(path, n):
+    rng = np.random.RandomState(0)
+    baseline = rng.lognormal(10, 1, n)
+    frame = pd.DataFrame({
+        "卖家": [f"Seller{i:07d}" for i in range(n)],
+        "国家": pd.Categorical(rng.choice(["SG", "MY", "TH", "VN", "ID", "PH"], n)),
+        "整体评分": pd.Categorical(rng.choice(["A+", "A", "B+", "B", "C+", "C"], n)),
+        "功能采用": rng.choice([0, 0.25, 0.5, 0.75, 1.0], n),
+        "基准收入": np.where(rng.rand(n) < 0.2, np.nan, baseline),
+        "当前收入": baseline * rng.lognormal(0.1, 0.2, n),
+        "预测增长": rng.normal(0.2, 0.1, n),
+        "信心度": rng.uniform(0.8, 0.95, n),
+        "功能贡献": rng.choice(["无显著贡献", *FEATURE_FLAGS, "全功能"], n),
+    })
+    frame.to_parquet(path, index=False, row_group_size=100_000)
+
+
+def streaming(source, extension, target):
+    with open(target, "wb") as sink:
+        export(source, extension, sink)
+
+
+def naive(source, extension, target):
+    frame = pd.read_parquet(source)
+    buffer = io.BytesIO()
+    if extension == "csv":
+        frame.to_csv(buffer, index=False, encoding="utf-8-sig")
+    elif extension == "xlsx":
+        frame.to_excel(buffer, index=False, engine="openpyxl")
+    else:
+        frame.to_parquet(buffer, index=False)
+    Path(target).write_bytes(buffer.getvalue())
+
+
+def idle():
+    pass
+
+
+def _measured(target, args, queue):
+    target(*args)
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def run(label, target, *args):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measured, args=(target, args, queue))
+    start = time.perf_counter()
+    process.start()
+    # 子进程自己的最大 RSS（RUSAGE_CHILDREN 是所有已结束子进程中的最大值，不能区分各次运行）
+    peak = queue.get()
+    process.join()
+    elapsed = time.perf_counter() - start
+    assert process.exitcode == 0
+    print(f"  {label}: {elapsed:.2f} s，子进程峰值内存 {peak:.0f} MB")
+    return elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    xlsx_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        # 在子进程中生成数据: 子进程启动时继承父进程当时的 RSS 作为峰值起点
+        for name, rows in (("report.parquet", n), ("small.parquet", xlsx_rows)):
+            process = multiprocessing.get_context("spawn").Process(target=write_mock_report, args=(root / name, rows))
+            process.start()
+            process.join()
+        cases = [("csv", "report.parquet", n), ("parquet", "report.parquet", n), ("xlsx", "small.parquet", xlsx_rows)]
+        _, baseline = run("空载子进程（导入依赖后的起点）", idle)
+        for extension, source, rows in cases:
+            print(f"{extension}（{rows:,} 行）")
+            fast, fast_peak = run("逐批流式导出到文件", streaming, root / source, extension, root / f"stream.{extension}")
+            slow, slow_peak = run("完整 DataFrame 写入 BytesIO", naive, root / source, extension, root / f"naive.{extension}")
+            print(f"  耗时 {slow / fast:.1f}x，峰值内存（减去空载起点）{slow_peak - baseline:.0f} MB → {fast_peak - baseline:.0f} MB")
+            if extension == "parquet":
+                assert pq.read_table(root / "stream.parquet").num_rows == rows
+            assert fast_peak < slow_peak
+
+
+if __name__ == "__main__":
+    main()
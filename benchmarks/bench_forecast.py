@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+增长潜力预测基准
+运行: python benchmarks/bench_forecast.py [卖家数量] [拟合进程数]
+
+N 个卖家（默认 20 万）× 104 周 GMV:
+- 对照: 逐卖家 np.linalg.lstsq 拟合（抽样 2000 个卖家后按比例估算全量耗时）
+- 批量最小二乘，调用线程内拟合
+- 进程池 + 共享内存分块拟合
+- 1% 卖家的最新一周数据变化后再次运行: 只重新拟合这些卖家
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.forecast import HORIZON_WEEKS, ForecastCache, GrowthForecaster, design, fit_forecast
+
+
+def mock_weekly(n, weeks=104):
+    rng = np.random.RandomState(0)
+    t = np.arange(weeks)[:, None]
+    level = rng.uniform(5e3, 5e4, n) * (1 + rng.uniform(-0.1, 0.5, n)) ** (t / 52)
+    season = 1 + rng.uniform(0, 0.3, n) * np.sin(2 * np.pi * t / 52)
+    return (level * season * rng.lognormal(0, 0.08, (weeks, n))).astype(np.float32, order="F")
+
+
+def loop_forecast(weekly):
+    """逐卖家拟合，只算点预测"""
+    weeks = weekly.shape[0]
+    x, future_x = design(weeks), design(weeks + HORIZON_WEEKS)[weeks:]
+    growth = np.empty(weekly.shape[1])
+    for i in range(weekly.shape[1]):
+        y = np.log(np.maximum(weekly[:, i].astype(np.float64), 1.0))
+        beta, residual, *_ = np.linalg.lstsq(x, y, rcond=None)
+        sigma2 = residual[0] / (weeks - x.shape[1])
+        growth[i] = np.exp(future_x @ beta + sigma2 / 2).sum() / weekly[-HORIZON_WEEKS:, i].sum(dtype=np.float64) - 1
+    return growth
+
+
+def timed(label, forecaster, ids, weekly):
+    result = forecaster.run(ids, weekly)
+    print(f"{label}: {result['seconds']:.2f} s（重新拟合 {result['recomputed']:,}，复用缓存 {result['cached']:,}）")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, os.cpu_count() or 1)
+    weekly = mock_weekly(n)
+    ids = np.arange(1, n + 1)
+    print(f"{n:,} 个卖家 × {weekly.shape[0]} 周，{os.cpu_count()} 个 CPU 核")
+
+    sample = min(n, 2000)
+    start = time.perf_counter()
+    growth = loop_forecast(weekly[:, :sample])
+    slow = (time.perf_counter() - start) * n / sample
+    print(f"逐卖家 lstsq（估算全量）: {slow:.1f} s")
+    assert np.allclose(growth, fit_forecast(weekly[:, :sample])[:, 0])
+
+    inline = timed("批量最小二乘（调用线程内）", GrowthForecaster(workers=1), ids, weekly)
+    pooled = GrowthForecaster(workers=workers)
+    timed(f"进程池 + 共享内存（{workers} 进程，含启动 worker）", pooled, ids, weekly)
+    pooled.cache = ForecastCache()
+    result = timed(f"进程池 + 共享内存（{workers} 进程）", pooled, ids, weekly)
+    pooled.close()
+    assert np.allclose(result["forecast"], inline["forecast"])
+    print(f"批量拟合加速 {slow / inline['seconds']:.0f}x")
+
+    forecaster = GrowthForecaster(ForecastCache(), workers=1)
+    forecaster.run(ids, weekly)
+    changed = weekly.copy()
+    rows = np.random.RandomState(1).choice(n, n // 100, replace=False)
+    changed[-1, rows] *= 1.05
+    result = timed("1% 卖家数据更新后增量预测", forecaster, ids, changed)
+    assert result["recomputed"] == len(rows)
+    result = timed("数据无变化时再次预测", forecaster, ids, changed)
+    assert result["recomputed"] == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+片段重跑基准: 单次交互的耗时
+运行: python benchmarks/bench_fragments.py [每项重复次数]
+
+对每个交互（按钮、滑块），对比:
+- 整页重跑: 不拆分为片段时，任何交互都会从头执行整个脚本（侧边栏和当前标签页）
+- 片段重跑: 现在只重新执行交互所在的面板
+
+两者都用 streamlit.testing 的 AppTest 驱动，包含相同的脚本运行开销。
+AppTest 不模拟片段局部重跑，因此 “片段重跑” 用只包含该面板的脚本来测量。
+"""
+
+import logging
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest
+
+from grow_ai_assistant import TABS
+
+# (交互说明, 面板函数, 控件类型, 控件标签, 操作)
+INTERACTIONS = [
+    ("Goal: 执行推荐", "goal_action_plan_panel", "button", "执行推荐", "click"),
+    ("Goal: 重新分析高潜力卖家", "goal_high_potential_panel", "button", "重新分析高潜力卖家", "click"),
+    ("Recruitment: 更新优先级", "recruitment_priority_panel", "button", "更新优先级", "click"),
+    ("Recruitment: 响应阈值滑块", "recruitment_engagement_panel", "slider", "响应阈值 (天)", 10),
+    ("Recruitment: 刷新招募数据", "recruitment_pipeline_panel", "button", "刷新招募数据", "click"),
+    ("Onboarding: 发送定制化指导", "onboarding_guidance_panel", "button", "发送定制化指导", "click"),
+    ("Onboarding: 更新预测模型", "onboarding_prediction_panel", "button", "更新预测模型", "click"),
+    ("Win: 发送改善建议", "win_quality_panel", "button", "发送改善建议", "click"),
+    ("Win: 更新增长预测", "win_growth_panel", "button", "更新增长预测", "click"),
+]
+
+PANEL_SCRIPT = f"""
+import sys
+sys.path.insert(0, {str(ROOT)!r})
+import grow_ai_assistant as app
+app.{{panel}}()
+"""
+
+
+def interact(at, kind, label, action):
+    widget = next(w for w in getattr(at, kind) if label in w.label)
+    if action == "click":
+        widget.click()
+    else:
+        widget.set_value(action)
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    assert not at.exception, at.exception
+    return elapsed
+
+
+def measure(at, kind, label, action, repeat):
+    # 滑块在两个值之间来回切换，保证每次都是真实的值变化
+    timings = []
+    for i in range(repeat):
+        value = action if action == "click" or i % 2 == 0 else 1
+        timings.append(interact(at, kind, label, value))
+    return statistics.median(timings)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+
+    full = AppTest.from_file(str(ROOT / "grow_ai_assistant.py"), default_timeout=300)
+    start = time.perf_counter()
+    full.run()
+    cold = time.perf_counter() - start
+    assert not full.exception, full.exception
+
+    print(f"📊 每项交互重复 {repeat} 次，取中位数（首次整页运行 {cold * 1000:.0f} ms，含建数据和缓存）")
+    print(f"{'交互':<28}{'整页重跑':>12}{'片段重跑':>12}{'加速':>8}")
+    for name, panel, kind, label, action in INTERACTIONS:
+        # 整页运行只渲染打开的标签页，先切换到面板所在的标签页
+        full.session_state["main_tab"] = next(tab for tab in TABS if name.split(":")[0] in tab)
+        full.run()
+        before = measure(full, kind, label, action, repeat)
+        fragment = AppTest.from_string(PANEL_SCRIPT.format(panel=panel), default_timeout=300).run()
+        after = measure(fragment, kind, label, action, repeat)
+        print(f"{name:<28}{before * 1000:>9.1f} ms{after * 1000:>9.1f} ms{before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
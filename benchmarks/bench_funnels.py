@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+事件溯源漏斗基准
+运行: python benchmarks/bench_funnels.py [卖家数量]
+
+对比招募漏斗的两种查询方式（近90天进入漏斗、所选国家、按优先级分布）:
+- 重扫: 每次查询在完整事件日志上筛选、分组计数
+- 增量计数器: FunnelTracker 在按天前缀和上相减
+并统计批量和逐条写入的耗时。
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.datastore import COUNTRIES
+from grow.funnels import (
+    FunnelTracker, RECRUITMENT_STAGES, RECRUITMENT_ADVANCE, RECRUITMENT_DWELL, generate_mock_transitions,
+)
+
+END = pd.Timestamp("2026-06-30 12:00")
+DAYS = 365
+
+
+def rescan(events, start, end, countries):
+    """重扫事件日志: 按进入日期筛选后按 优先级 × 阶段 计数，并计算平均周期"""
+    entered = events.loc[events["阶段"] == RECRUITMENT_STAGES[0], ["卖家", "时间"]]
+    entered = entered.set_index("卖家")["时间"]
+    cohort = events["卖家"].map(entered)
+    day = cohort.dt.normalize()
+    subset = events[(day >= start) & (day <= end) & events["国家"].isin(countries)]
+    counts = subset.groupby(["优先级", "阶段"]).size()
+    signed = subset[subset["阶段"] == RECRUITMENT_STAGES[-1]]
+    cycle = ((signed["时间"] - cohort[signed.index]) / pd.Timedelta(days=1)).groupby(signed["优先级"]).mean()
+    return counts, cycle
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.RandomState(0)
+    events = generate_mock_transitions(
+        [f"S{i:07d}" for i in range(n)], rng.choice(COUNTRIES, n), rng.choice(["P0", "P1", "P2"], n),
+        RECRUITMENT_STAGES, RECRUITMENT_ADVANCE, RECRUITMENT_DWELL, END, days=DAYS,
+    )
+    print(f"{n:,} 个卖家，{len(events):,} 条阶段变化事件")
+
+    tracker = FunnelTracker(RECRUITMENT_STAGES, END - pd.Timedelta(days=DAYS))
+    start = time.perf_counter()
+    for batch in np.array_split(np.arange(len(events)), 20):
+        tracker.record_many(events.iloc[batch])
+    ingest = time.perf_counter() - start
+    print(f"写入: {ingest * 1000:.0f} ms（{len(events) / ingest:,.0f} 条/秒）")
+
+    window = (END.normalize() - pd.Timedelta(days=89), END.normalize())
+    countries = ["SG", "MY", "TH"]
+    scan, (counts, cycle) = timed(lambda: rescan(events, *window, countries), repeat=3)
+    print(f"重扫事件日志: {scan * 1000:.0f} ms/次")
+
+    # 逐条追加所选国家以外的事件: 每条只累加受影响的单元，并使最近几天的前缀和失效
+    start = time.perf_counter()
+    for i in range(1000):
+        tracker.record(f"single{i}", RECRUITMENT_STAGES[0], END, "PH", "P0")
+    single = (time.perf_counter() - start) / 1000
+    print(f"逐条写入: {single * 1e6:.0f} µs/条")
+    first, _ = timed(lambda: tracker.priority_table(*window, countries), repeat=1)
+    cached, table = timed(lambda: tracker.priority_table(*window, countries))
+    print(f"增量计数器: 写入后首次查询 {first * 1000:.2f} ms（重建前缀和），之后 {cached * 1000:.3f} ms/次")
+    print(f"加速: {scan / cached:,.0f}x")
+
+    for priority, count, rate, days in zip(*table.values()):
+        expected = counts[priority][RECRUITMENT_STAGES[0]]
+        print(f"  {priority}: 数量 {count:,}（重扫 {expected:,}）签约率 {rate:.1%} 平均周期 {days:.1f} 天"
+              f"（重扫 {cycle[priority]:.1f}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+规范类型表格 vs 预格式化字符串表格
+运行: python benchmarks/bench_schema.py [行数]
+
+以招募页的 prospect_analysis 为模板放大到 N 行，对比:
+- 内存: memory_usage(deep=True)
+- 按 “现有市场GMS” 排序: 字符串表需要先解析 “$2.5M” / “$150K” 才能得到正确顺序
+- 显示格式化: 整表格式化 vs 只格式化一页（50 行）
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow import schema
+from grow.formatting import format_frame
+from grow.table_view import PAGE_SIZE
+
+
+def typed_table(n, seed=0):
+    rng = np.random.RandomState(seed)
+    return schema.PROSPECT_ANALYSIS.frame({
+        "卖家": [f"Prospect{i:07d}" for i in range(n)],
+        "现有市场GMS": rng.randint(50, 5000, n) * 1000.0,
+        "品牌地位": rng.choice(schema.BRAND.categories, n),
+        "跨市场匹配度": rng.randint(50, 100, n) / 100,
+        "优先级": rng.choice(schema.PRIORITY.categories, n),
+        "业务潜力": rng.choice(schema.POTENTIAL.categories, n),
+    })
+
+
+def parse_money(values):
+    """旧表格排序前必须做的解析: “$2.5M” → 2500000"""
+    text = values.str.lstrip("$")
+    scale = np.where(text.str.endswith("M"), 1e6, np.where(text.str.endswith("K"), 1e3, 1.0))
+    return text.str.rstrip("MK").astype(float) * scale
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    typed = typed_table(n)
+    # 当前的字符串表: 所有列都是预格式化的 object 字符串
+    strings = format_frame(typed, schema.PROSPECT_ANALYSIS.formats).astype(object)
+
+    typed_mb = typed.memory_usage(deep=True).sum() / 1e6
+    strings_mb = strings.memory_usage(deep=True).sum() / 1e6
+
+    lexical, _ = timed(lambda: strings.sort_values("现有市场GMS", ascending=False))
+    parsed, _ = timed(lambda: strings.iloc[np.argsort(-parse_money(strings["现有市场GMS"]).to_numpy(), kind="stable")])
+    typed_sort, _ = timed(lambda: typed.sort_values("现有市场GMS", ascending=False))
+    priority_sort, _ = timed(lambda: typed.sort_values(["优先级", "现有市场GMS"], ascending=[True, False]))
+    format_all, _ = timed(lambda: format_frame(typed, schema.PROSPECT_ANALYSIS.formats), 1)
+    format_page, _ = timed(lambda: format_frame(typed.iloc[:PAGE_SIZE], schema.PROSPECT_ANALYSIS.formats))
+
+    print(f"📊 prospect_analysis × {n:,} 行")
+    print(f"内存:     字符串表 {strings_mb:8.1f} MB | 规范类型 {typed_mb:8.1f} MB ({strings_mb / typed_mb:.1f}x)")
+    print(f"按GMS排序: 字符串字典序 {lexical * 1000:7.1f} ms (顺序错误) | "
+          f"解析后排序 {parsed * 1000:7.1f} ms | 数值列 {typed_sort * 1000:7.1f} ms")
+    print(f"按优先级+GMS排序（类别+数值）: {priority_sort * 1000:7.1f} ms")
+    print(f"显示格式化: 整表 {format_all * 1000:8.1f} ms | 一页 {format_page * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
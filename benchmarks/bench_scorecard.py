@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+绩效记分卡基准
+运行: python benchmarks/bench_scorecard.py [卖家数量]
+
+由原始 Listing、广告、库存表计算 N 个卖家的记分卡（默认 10 万）:
+- 按卖家分块流式计算（范围读取 + 排序索引连接 + bincount 聚合 + np.digitize 分级）
+- 对照: 一次读入全部原始表，pandas groupby + merge，逐行函数判定等级
+两种方式各在一个子进程中运行，比较耗时、峰值内存（子进程最大 RSS）和结果。
+"""
+
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.datastore import generate_mock_data
+from grow.scorecard import (
+    GRADE_LABELS, GRADE_THRESHOLDS, HEALTH_LABELS, HEALTH_THRESHOLDS, HEALTHY_COVER_DAYS,
+    MAX_IMAGES, SCORE_WEIGHTS, TARGET_ROI, TARGET_TITLE_LENGTH, build_scorecard, load_scorecard,
+    write_mock_raw_tables,
+)
+
+
+def streaming(root, sellers):
+    build_scorecard(root / "raw", sellers, root / "streaming.parquet")
+
+
+def _label(value, thresholds, labels):
+    if pd.isna(value):
+        return None
+    for threshold, label in zip(thresholds, labels):
+        if value < threshold:
+            return label
+    return labels[-1]
+
+
+def _grade(row):
+    parts = [(row["listing"], SCORE_WEIGHTS[0]),
+             (min(max(row["roi"] / TARGET_ROI, 0), 1) * 100, SCORE_WEIGHTS[1]),
+             (row["healthy"] * 100, SCORE_WEIGHTS[2])]
+    parts = [(score, weight) for score, weight in parts if not pd.isna(score)]
+    total = sum(s * w for s, w in parts) / sum(w for _, w in parts)
+    return pd.Series({"综合得分": total, "整体评分": _label(total, GRADE_THRESHOLDS, GRADE_LABELS),
+                      "库存健康": _label(row["healthy"], HEALTH_THRESHOLDS, HEALTH_LABELS)})
+
+
+def naive(root, sellers):
+    listings = pd.read_parquet(root / "raw" / "listings.parquet")
+    ads = pd.read_parquet(root / "raw" / "ad_spend.parquet")
+    inventory = pd.read_parquet(root / "raw" / "inventory.parquet")
+
+    listings["score"] = (0.35 * np.minimum(listings["Images"] / MAX_IMAGES, 1)
+                         + 0.25 * np.minimum(listings["Title_Length"] / TARGET_TITLE_LENGTH, 1)
+                         + 0.2 * listings["A_Plus"] + 0.2 * (listings["Rating"] - 1) / 4) * 100
+    listing = listings.groupby("Seller_ID")["score"].mean().rename("listing")
+    spend = ads.groupby("Seller_ID")[["Spend", "Ad_Sales"]].sum()
+    roi = (spend["Ad_Sales"] / spend["Spend"]).rename("roi")
+    cover = inventory["On_Hand"] / inventory["Daily_Units"]
+    healthy = cover.between(*HEALTHY_COVER_DAYS).groupby(inventory["Seller_ID"]).mean().rename("healthy")
+
+    frame = (sellers.merge(listing, left_on="Seller_ID", right_index=True, how="left")
+             .merge(roi, left_on="Seller_ID", right_index=True, how="left")
+             .merge(healthy, left_on="Seller_ID", right_index=True, how="left"))
+    frame = frame.join(frame.apply(_grade, axis=1))
+    frame = frame.rename(columns={"Seller": "卖家", "Country": "国家", "roi": "广告ROI"})
+    frame["Listing质量"] = frame["listing"].round().astype(np.int64)
+    frame[["Seller_ID", "卖家", "国家", "Listing质量", "广告ROI", "库存健康", "整体评分", "综合得分"]].to_parquet(
+        root / "naive.parquet", index=False)
+
+
+def run(label, target, root, sellers):
+    process = multiprocessing.get_context("spawn").Process(target=target, args=(root, sellers))
+    start = time.perf_counter()
+    process.start()
+    process.join()
+    elapsed = time.perf_counter() - start
+    assert process.exitcode == 0
+    # 子进程中最大的 RSS（先运行内存较小的方式）
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"{label}: {elapsed:.2f} s，子进程峰值内存 {peak:.0f} MB")
+    return elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sellers = generate_mock_data(n)[["Seller_ID", "Seller", "Country"]]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_mock_raw_tables(root / "raw", sellers)
+        rows = {name: pq.ParquetFile(root / "raw" / f"{name}.parquet").metadata.num_rows
+                for name in ("listings", "ad_spend", "inventory")}
+        print(f"{n:,} 个卖家，原始表 " + "、".join(f"{k} {v:,} 行" for k, v in rows.items()))
+
+        fast, fast_peak = run("分块流式计算", streaming, root, sellers)
+        slow, slow_peak = run("pandas 全量 merge + 逐行分级", naive, root, sellers)
+        print(f"加速 {slow / fast:.1f}x，峰值内存降至 {fast_peak / slow_peak:.0%}")
+
+        a = load_scorecard(root / "streaming.parquet")
+        b = load_scorecard(root / "naive.parquet")
+        assert (a["整体评分"].astype(str) == b["整体评分"].astype(str)).all()
+        assert (a["库存健康"].astype(str) == b["库存健康"].astype(str)).all()
+        assert np.allclose(a["综合得分"], b["综合得分"]) and np.allclose(a["广告ROI"], b["广告ROI"], equal_nan=True)
+        print("两种方式结果一致")
+        assert fast < slow
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+会话数增长时的进程内存基准
+运行: python benchmarks/bench_shared_tables.py [卖家数量]
+
+对比两种加载方式下进程 RSS 随会话数（1 → 100）的变化:
+- pickled: 模拟 @st.cache_data，每个会话拿到一份反序列化的 DataFrame 副本
+- mapped:  内存映射的 Arrow IPC 表，所有会话共享同一份只读数据
+每种方式在独立子进程中运行，互不影响。
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.datastore import SellerStore, SELLER_COLUMNS, AI_COLUMNS
+
+SESSION_COUNTS = [1, 10, 25, 50, 100]
+COUNTRIES = ("SG", "MY", "TH", "ID", "VN", "PH")
+
+
+def rss_mb():
+    """当前进程常驻内存 (MB)，仅支持 Linux"""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def run_mode(mode, data_dir):
+    store = SellerStore(data_dir)
+    sessions = []
+    results = []
+
+    if mode == "pickled":
+        table = store.mapped()
+        blob = pickle.dumps((
+            table.to_pandas(SELLER_COLUMNS, COUNTRIES),
+            table.to_pandas(AI_COLUMNS, COUNTRIES),
+        ))
+        load = lambda: pickle.loads(blob)
+    else:
+        shared = {}
+
+        def load():
+            # 等价于 @st.cache_resource: 同一参数只构建一次
+            if COUNTRIES not in shared:
+                table = store.mapped()
+                shared[COUNTRIES] = (
+                    table.to_pandas(SELLER_COLUMNS, COUNTRIES),
+                    table.to_pandas(AI_COLUMNS, COUNTRIES),
+                )
+            return shared[COUNTRIES]
+
+    base = rss_mb()
+    for n in SESSION_COUNTS:
+        while len(sessions) < n:
+            seller_data, ai_analysis = load()
+            # 每个会话至少读一次数据，确保映射页面被访问
+            seller_data["GMV"].sum()
+            sessions.append((seller_data, ai_analysis))
+        results.append((n, rss_mb() - base))
+    return results
+
+
+def main():
+    if len(sys.argv) > 2:
+        mode, data_dir = sys.argv[1], sys.argv[2]
+        for n, mb in run_mode(mode, data_dir):
+            print(f"{n} {mb:.1f}")
+        return
+
+    n_sellers = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = SellerStore(data_dir).ensure(n_sellers)
+        store.export_ipc()
+
+        print(f"📊 {n_sellers:,} 个卖家，RSS 增量 (MB)")
+        print(f"{'会话数':>6} {'pickled':>10} {'mapped':>10}")
+        columns = {}
+        for mode in ("pickled", "mapped"):
+            out = subprocess.run(
+                [sys.executable, __file__, mode, data_dir],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            columns[mode] = [line.split()[1] for line in out.strip().splitlines()]
+        for i, n in enumerate(SESSION_COUNTS):
+            print(f"{n:>9} {columns['pickled'][i]:>10} {columns['mapped'][i]:>10}")
+
+
+if __name__ == "__main__":
+    main()
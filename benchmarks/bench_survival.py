@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+入驻完成时间预测基准
+运行: python benchmarks/bench_survival.py [卖家数量]
+
+- 训练: 全量训练与增量训练（只累计新完成的里程碑）的耗时
+- 推理: 一次批量预测所有入驻中卖家，与逐卖家查表的循环对比
+- 准确率: 近7天回测，与 “按全体平均耗时减去已停留天数” 的简单估计对比
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.onboarding import DONE, NOT_STARTED, IN_PROGRESS, generate_mock_onboarding, unpack
+from grow.survival import GRID_DAYS, fit, backtest, _fit_days, _strata
+
+NOW = pd.Timestamp("2026-06-30 12:00")
+HOLDOUT = 7
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def per_seller(model, states, dwell, strata):
+    """逐卖家、逐里程碑查表"""
+    out = []
+    for i in range(len(states)):
+        total = 0.0
+        for m in range(4):
+            s = strata[i][m]
+            if states[i][m] == NOT_STARTED:
+                total += model.mean[s]
+            elif states[i][m] != DONE:
+                b = min(int(dwell[i][m] / GRID_DAYS), model.residual.shape[1] - 1)
+                total += max(model.residual[s, b] - (dwell[i][m] - b * GRID_DAYS), GRID_DAYS / 2)
+        out.append(total)
+    return out
+
+
+def naive_accuracy(tracker, tolerance=1.0):
+    """简单估计: 剩余 = 该里程碑全体平均耗时 - 已停留天数（至少 0）"""
+    t = tracker.day(NOW)
+    cutoff = t - HOLDOUT
+    started, completed = tracker.started, tracker.completed
+    history = completed <= cutoff
+    means = np.nanmean(np.where(history, completed - started, np.nan), axis=0)
+    active = (started <= cutoff) & ~history
+    predicted = np.maximum(np.broadcast_to(means, started.shape)[active] - (cutoff - started[active]), 0)
+    actual = completed[active] - cutoff
+    resolved = actual <= HOLDOUT
+    correct = np.where(resolved, np.abs(predicted - actual) <= tolerance, predicted >= HOLDOUT - tolerance)
+    return correct.mean(), np.abs(predicted - actual)[resolved].mean()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tracker = generate_mock_onboarding(n, now=NOW)
+    print(f"{n:,} 个入驻中卖家")
+
+    full, (model, events) = timed(lambda: fit(tracker, NOW))
+    print(f"全量训练: {full * 1000:.0f} ms（{events:,} 条完成记录）")
+    rows = np.flatnonzero(unpack(tracker.packed)[:, 3] == IN_PROGRESS)[:10_000]
+    later = NOW + pd.Timedelta(hours=1)
+    tracker.set_status(rows, 3, DONE, NOW + pd.Timedelta(minutes=30))
+    incremental, (_, new) = timed(lambda: fit(tracker, later, previous=model))
+    print(f"增量训练: {incremental * 1000:.0f} ms（新增 {new:,} 条完成记录）")
+    model, _ = _fit_days(tracker, tracker.day(later))
+
+    result = tracker.evaluate(later)
+    batch, remaining = timed(lambda: model.predict(tracker, result=result))
+    in_flight = int((result["progress"] < 1).sum())
+    print(f"批量预测: {batch * 1000:.0f} ms（{in_flight:,} 个未完成卖家）")
+
+    sample = min(n, 100_000)
+    strata = _strata(tracker)[:sample].tolist()
+    states, dwell = result["states"][:sample].tolist(), result["dwell"][:sample].tolist()
+    start = time.perf_counter()
+    slow = per_seller(model, states, dwell, strata)
+    loop = (time.perf_counter() - start) * n / sample
+    print(f"逐卖家循环: 折算 {loop * 1000:,.0f} ms（{sample:,} 个样本）")
+    print(f"加速: {loop / batch:,.0f}x")
+    assert np.allclose(slow, remaining[:sample], rtol=1e-4)
+
+    accuracy, mae, samples = backtest(tracker, NOW, HOLDOUT)
+    naive, naive_mae = naive_accuracy(tracker)
+    print(f"近{HOLDOUT}天回测（{samples:,} 个进行中的里程碑，误差±1天内为准确）:")
+    print(f"  生存模型: 准确率 {accuracy:.1%}，平均误差 {mae:.2f} 天")
+    print(f"  平均耗时减已停留: 准确率 {naive:.1%}，平均误差 {naive_mae:.2f} 天")
+
+
+if __name__ == "__main__":
+    main()
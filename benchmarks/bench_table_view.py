@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+服务端分页表格基准
+运行: python benchmarks/bench_table_view.py [卖家数量]
+
+对比卖家明细表每次重跑发送到浏览器的数据:
+- 整表: st.dataframe(frame) 把整张表序列化为 Arrow 发送
+- 分页: TableIndex 在服务端排序/搜索，只序列化当前一页
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.datastore import generate_mock_data
+from grow.table_view import TableIndex, PAGE_SIZE
+
+
+def ipc_bytes(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    frame = generate_mock_data(n)
+
+    full_time, full_size = timed(lambda: ipc_bytes(pa.Table.from_pandas(frame, preserve_index=False)), 3)
+
+    start = time.perf_counter()
+    index = TableIndex(frame, search_columns=["Seller_ID", "Seller", "Category"])
+    build = time.perf_counter() - start
+
+    cases = [
+        ("默认顺序", dict()),
+        ("按GMV降序", dict(sort_by="GMV", descending=True)),
+        ("搜索 '_SG'", dict(search="_SG")),
+        ("筛选 T1 + 按增长排序", dict(sort_by="Growth Rate", filters={"Tier": ["T1"]})),
+    ]
+
+    print(f"📊 {n:,} 个卖家，每页 {PAGE_SIZE} 行")
+    print(f"整表发送:     {full_size / 1e6:8.1f} MB, 序列化 {full_time * 1000:8.1f} ms/次")
+    print(f"索引构建:     {build * 1000:8.1f} ms (一次性，进程内共享)")
+    for name, query in cases:
+        index._queries.clear()
+        first, positions = timed(lambda: index.query(**query), 1)
+        cached, _ = timed(lambda: index.query(**query))
+        page_time, size = timed(lambda: ipc_bytes(index.page(positions, 3)))
+        print(f"{name:<20} 首次查询 {first * 1000:7.1f} ms | 缓存 {cached * 1000:6.3f} ms | "
+              f"翻页 {page_time * 1000:5.2f} ms, {size / 1e3:5.1f} KB ({len(positions):,} 行命中)")
+
+
+if __name__ == "__main__":
+    main()
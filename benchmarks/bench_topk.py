@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+高潜力卖家 Top-K 索引基准
+运行: python benchmarks/bench_topk.py [卖家数量] [每轮更新数]
+
+每轮随机更新一批卖家的 GMV / WoW 增长，然后取 Top-10，对比:
+- sort_values: 更新 DataFrame 后重新评分变化行，再全表 sort_values
+- TopKIndex:   增量更新 + 按桶缓存的 Top-K 查询
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grow.datastore import generate_mock_data
+from grow.scoring import score_sellers, rank_keys
+from grow.topk import TopKIndex
+
+ROUNDS = 20
+K = 10
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = np.random.RandomState(0)
+    frame = generate_mock_data(n)
+    frame["rank_key"] = rank_keys(frame["AI_Growth_Score"], frame["Revenue_Potential"])
+
+    start = time.perf_counter()
+    index = TopKIndex(frame, frame, k=K)
+    build = time.perf_counter() - start
+
+    updates = [
+        (rng.randint(0, n, batch), rng.randint(20000, 400000, batch), rng.uniform(-5, 30, batch))
+        for _ in range(ROUNDS)
+    ]
+
+    baseline = 0.0
+    for rows, gmv, growth in updates:
+        start = time.perf_counter()
+        frame.loc[rows, "GMV"] = gmv
+        frame.loc[rows, "Growth Rate"] = growth
+        sub = frame.loc[rows]
+        scores = score_sellers(sub["GMV"], sub["Growth Rate"], sub["Compliance Score"],
+                               sub["Active Days"], sub["VOS_Sentiment"])
+        frame.loc[rows, "rank_key"] = rank_keys(scores["AI_Growth_Score"], scores["Revenue_Potential"])
+        expected = frame.sort_values("rank_key", ascending=False).head(K)
+        baseline += time.perf_counter() - start
+
+    incremental = 0.0
+    query = 0.0
+    for rows, gmv, growth in updates:
+        start = time.perf_counter()
+        index.update(index.seller_ids[rows], gmv, growth)
+        mid = time.perf_counter()
+        top = index.top(K)
+        incremental += time.perf_counter() - start
+        query += time.perf_counter() - mid
+
+    # 再查询一次（无更新）代表纯读取路径
+    start = time.perf_counter()
+    index.top(K)
+    clean_query = time.perf_counter() - start
+
+    assert np.allclose(np.sort(index.keys[top]), np.sort(expected["rank_key"].to_numpy()))
+    print(f"📊 {n:,} 个卖家, 每轮更新 {batch} 个, 共 {ROUNDS} 轮")
+    print(f"索引构建:            {build * 1000:9.1f} ms (一次性)")
+    print(f"sort_values 基线:    {baseline / ROUNDS * 1000:9.2f} ms/轮")
+    print(f"TopKIndex 更新+查询: {incremental / ROUNDS * 1000:9.2f} ms/轮 (其中查询 {query / ROUNDS * 1000:.2f} ms)")
+    print(f"无更新时查询:        {clean_query * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
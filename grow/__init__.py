@@ -0,0 +1,5 @@
+"""
+GROW AI Assistant 数据与计算层
+
+grow_ai_assistant.py 只负责页面渲染，数据加载和各模块的计算逻辑放在这个包里。
+"""
@@ -0,0 +1,263 @@
+"""
+优先级调整和行动计划存储
+
+Recruitment 的 “更新优先级” 和 Goal 的 “执行推荐” 写入本地 SQLite（WAL 模式），
+多个 AM 的会话、多个进程可以同时读写。
+
+- 写入先放进队列，由后台写线程按批次在一个事务里提交（write-behind），UI 线程不等待磁盘
+- 读取走进程内缓存（数据库中已提交的内容）叠加尚未提交的写入，自己的修改立即可见
+- 提交失败时这一批写入留在未提交写入中（读取仍能看到，标记为未保存），
+  写线程重新连接数据库并按指数退避重试，直到提交成功
+- 任何连接（本进程的写线程或其他进程）提交后 PRAGMA data_version 会变化，
+  读取时据此使缓存失效，下次从数据库重新加载
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+from grow.datastore import DEFAULT_DATA_DIR
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS priority_overrides (
+    seller TEXT PRIMARY KEY,
+    priority TEXT NOT NULL,
+    am TEXT NOT NULL DEFAULT '',
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS action_items (
+    uid TEXT PRIMARY KEY,
+    seller TEXT NOT NULL,
+    title TEXT NOT NULL,
+    recommendation TEXT NOT NULL,
+    impact TEXT NOT NULL DEFAULT '',
+    am TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS action_items_seller ON action_items (seller, created);
+CREATE INDEX IF NOT EXISTS action_items_created ON action_items (created);
+"""
+
+ACTION_FIELDS = ("uid", "seller", "title", "recommendation", "impact", "am", "created")
+
+_STOP = "stop"
+# 提交失败后的重试间隔（秒）: 从 RETRY_DELAY 起每次加倍，最长 RETRY_MAX_DELAY
+RETRY_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class ActionStore:
+    """带写后队列和读缓存的优先级/行动计划存储（进程内共享一个实例）
+
+    batch_size 为每个事务最多提交的新写入数（重试的写入另计）。
+    last_error 为最近一次提交失败的原因，提交成功后清空。
+    """
+
+    def __init__(self, path=None, batch_size=256):
+        self.path = str(path or DEFAULT_DATA_DIR / "actions.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.batch_size = batch_size
+        self.last_error = ""
+        self.committed = 0
+
+        setup = _connect(self.path)
+        setup.executescript(_SCHEMA)
+        setup.commit()
+        setup.close()
+
+        self._read = _connect(self.path)
+        self._lock = threading.Lock()
+        self._data_version = None
+        # 数据库中已提交内容的缓存
+        self._priorities = None
+        self._actions = {}
+        # (条数上限, 最近的行动计划)
+        self._recent = None
+        # 已入队、尚未提交的写入
+        self._pending_priorities = {}
+        self._pending_actions = {}
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="grow-action-writer", daemon=True)
+        self._writer.start()
+
+    # ---------- 写入（不阻塞） ----------
+
+    def set_priority(self, seller, priority, am=""):
+        write = (seller, priority, am, time.time())
+        with self._lock:
+            self._pending_priorities[seller] = write
+        self._queue.put(("priority", write))
+
+    def add_action(self, seller, title, recommendation, impact="", am=""):
+        """记录一条行动计划，返回其 uid"""
+        item = dict(zip(ACTION_FIELDS, (
+            uuid.uuid4().hex, seller, title, recommendation, impact, am, time.time(),
+        )))
+        with self._lock:
+            self._pending_actions.setdefault(seller, []).append(item)
+        self._queue.put(("action", item))
+        return item["uid"]
+
+    def flush(self, timeout=None):
+        """等待此前入队的写入全部提交，返回是否在超时前完成"""
+        done = threading.Event()
+        self._queue.put(("barrier", done))
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        self._queue.put((_STOP, None))
+        self._writer.join(timeout)
+        self._read.close()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending_priorities) + sum(len(v) for v in self._pending_actions.values())
+
+    def unsaved_actions(self):
+        """尚未提交到数据库的行动计划 uid"""
+        with self._lock:
+            return {a["uid"] for items in self._pending_actions.values() for a in items}
+
+    # ---------- 读取 ----------
+
+    def _sync(self):
+        """有新的提交时清空缓存；调用方持有 self._lock"""
+        version = self._read.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._priorities = None
+            self._actions = {}
+            self._recent = None
+
+    def priorities(self):
+        """所有卖家的手动优先级 {卖家: 优先级}"""
+        with self._lock:
+            self._sync()
+            if self._priorities is None:
+                self._priorities = dict(self._read.execute("SELECT seller, priority FROM priority_overrides"))
+            merged = dict(self._priorities)
+            merged.update({seller: w[1] for seller, w in self._pending_priorities.items()})
+        return merged
+
+    def priority(self, seller, default=None):
+        return self.priorities().get(seller, default)
+
+    def actions(self, seller):
+        """某个卖家的行动计划，按创建时间排序"""
+        with self._lock:
+            self._sync()
+            committed = self._actions.get(seller)
+            if committed is None:
+                committed = self._actions[seller] = self._query_actions("WHERE seller = ? ORDER BY created", (seller,))
+            pending = self._pending_actions.get(seller, [])
+        seen = {a["uid"] for a in committed}
+        return committed + [a for a in pending if a["uid"] not in seen]
+
+    def recent_actions(self, limit=10):
+        """最近的行动计划（所有卖家，最新的在前）"""
+        with self._lock:
+            self._sync()
+            if self._recent is None or self._recent[0] < limit:
+                self._recent = (limit, self._query_actions("ORDER BY created DESC LIMIT ?", (limit,)))
+            committed = self._recent[1][:limit]
+            pending = [a for items in self._pending_actions.values() for a in items]
+        seen = {a["uid"] for a in committed}
+        merged = committed + [a for a in pending if a["uid"] not in seen]
+        return sorted(merged, key=lambda a: a["created"], reverse=True)[:limit]
+
+    def _query_actions(self, clause, params):
+        rows = self._read.execute(f"SELECT {', '.join(ACTION_FIELDS)} FROM action_items {clause}", params)
+        return [dict(zip(ACTION_FIELDS, r)) for r in rows]
+
+    # ---------- 后台写线程 ----------
+
+    def _run(self):
+        conn = None
+        # 提交失败、等待重试的写入和在它们之后入队的 flush
+        retry, waiters = [], []
+        delay, retry_at = 0.0, 0.0
+        stop = False
+        while not stop:
+            batch = []
+            try:
+                timeout = max(retry_at - time.monotonic(), 0) if retry else None
+                batch.append(self._queue.get(timeout=timeout))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = any(kind == _STOP for kind, _ in batch)
+            retry += [(kind, payload) for kind, payload in batch if kind in ("priority", "action")]
+            waiters += [done for kind, done in batch if kind == "barrier"]
+            if retry and (stop or time.monotonic() >= retry_at):
+                if conn is None:
+                    conn = self._open_writer()
+                if conn is not None and self._commit(conn, retry):
+                    retry, delay = [], 0.0
+                else:
+                    # 连接可能已不可用，下次重试时重新连接
+                    if conn is not None:
+                        conn.close()
+                    conn = None
+                    delay = min(delay * 2 or RETRY_DELAY, RETRY_MAX_DELAY)
+                    retry_at = time.monotonic() + delay
+            if not retry:
+                for done in waiters:
+                    done.set()
+                waiters = []
+        if conn is not None:
+            conn.close()
+
+    def _open_writer(self):
+        try:
+            return _connect(self.path)
+        except sqlite3.Error as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return None
+
+    def _commit(self, conn, writes):
+        """在一个事务里提交一批写入，返回是否成功"""
+        priorities = [p for kind, p in writes if kind == "priority"]
+        actions = [a for kind, a in writes if kind == "action"]
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO priority_overrides (seller, priority, am, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(seller) DO UPDATE SET priority = excluded.priority, "
+                    "am = excluded.am, updated = excluded.updated WHERE excluded.updated >= updated",
+                    priorities,
+                )
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO action_items ({', '.join(ACTION_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * len(ACTION_FIELDS))})",
+                    [tuple(a[f] for f in ACTION_FIELDS) for a in actions],
+                )
+        except sqlite3.Error as e:
+            # 写入仍保留在未提交写入中（读取能看到，标记为未保存），由 _run 退避后重试
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        self.last_error = ""
+        self.committed += len(writes)
+        with self._lock:
+            for write in priorities:
+                # 只移除仍是最新的那次写入（期间可能又被修改）
+                if self._pending_priorities.get(write[0]) is write:
+                    del self._pending_priorities[write[0]]
+            for action in actions:
+                items = self._pending_actions.get(action["seller"], [])
+                items[:] = [a for a in items if a is not action]
+                if not items:
+                    self._pending_actions.pop(action["seller"], None)
+        return True
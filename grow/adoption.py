@@ -0,0 +1,181 @@
+"""
+功能采用位图索引
+
+每个增长功能（FBA、广告、促销、优惠券）、国家、类目和 GMV 档位各对应一个位图:
+第 i 位表示第 i 个卖家是否启用该功能 / 属于该分组，按 64 位一字压缩为 uint64 数组，
+100 万卖家每个位图 125 KB。
+
+“GMV 强劲、已用 FBA、未启用广告” 这类人群查询是几个位图的按位与 / 与非，
+按国家或类目的采用率汇总是 分组位图 & 功能位图 的 popcount，
+都只扫描 (卖家数 / 64) 个字，不构造逐卖家的布尔列。
+AI功能采用建议是一组预定义的人群查询（ADOPTION_RULES）。
+"""
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import COUNTRIES
+from grow.schema import FEATURE_FLAGS
+
+# GMV 档位: 按全量卖家的 GMV 分位，前 30% 为 强劲，其后 40% 为 中等
+GMV_TIERS = ["强劲", "中等", "较弱"]
+GMV_TIER_SHARES = (0.3, 0.4)
+
+# AI功能采用建议: (图标, 人群, 建议, 查询条件)
+ADOPTION_RULES = [
+    ("🎯", "GMV强劲、已用FBA但未启用广告", "推荐启用广告",
+     {"gmv": ["强劲"], "has": ["FBA"], "lacks": ["广告"]}),
+    ("🚚", "GMV中等以上但未使用FBA", "推荐FBA入仓",
+     {"gmv": ["强劲", "中等"], "lacks": ["FBA"]}),
+    ("🏷️", "已投广告但缺少优惠券功能", "推荐启用促销工具",
+     {"has": ["广告"], "lacks": ["优惠券"]}),
+]
+
+
+def to_bitset(mask):
+    """布尔数组 → uint64 位图（第 i 位对应第 i 个元素）"""
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder="little")
+    padded = np.zeros(-(-len(packed) // 8) * 8, dtype=np.uint8)
+    padded[:len(packed)] = packed
+    return padded.view(np.uint64)
+
+
+def to_mask(bits, n):
+    """uint64 位图 → 长度为 n 的布尔数组"""
+    return np.unpackbits(bits.view(np.uint8), count=n, bitorder="little").astype(bool)
+
+
+def popcount(bits):
+    """位图（或最后一维为位图的数组）中 1 的个数"""
+    return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+
+
+class AdoptionIndex:
+    """全量卖家的功能采用位图
+
+    adopted 为 (卖家数, 功能数) 布尔矩阵，列顺序同 FEATURE_FLAGS。
+    """
+
+    def __init__(self, sellers, countries, categories, gmv, adopted):
+        self.sellers = np.asarray(sellers, dtype=object)
+        self.gmv = np.asarray(gmv, dtype=np.float64)
+        self.n = len(self.sellers)
+        adopted = np.asarray(adopted, dtype=bool)
+        self.features = np.stack([to_bitset(adopted[:, i]) for i in range(len(FEATURE_FLAGS))])
+        self.universe = to_bitset(np.ones(self.n, dtype=bool))
+
+        country_codes = pd.Categorical(countries, categories=COUNTRIES).codes
+        categories = pd.Categorical(categories)
+        self.categories = list(categories.categories)
+        self.groups = {
+            "国家": (COUNTRIES, np.stack([to_bitset(country_codes == i) for i in range(len(COUNTRIES))])),
+            "类目": (self.categories,
+                     np.stack([to_bitset(categories.codes == i) for i in range(len(self.categories))])),
+        }
+        # GMV 档位按排名划分，同值的卖家可能落在不同档
+        rank = np.empty(self.n, dtype=np.int64)
+        rank[np.argsort(-self.gmv, kind="stable")] = np.arange(self.n)
+        cuts = np.cumsum(GMV_TIER_SHARES) * self.n
+        tier = np.searchsorted(cuts, rank, side="right")
+        self.groups["GMV"] = (GMV_TIERS, np.stack([to_bitset(tier == i) for i in range(len(GMV_TIERS))]))
+
+    @classmethod
+    def from_frame(cls, seller_data, adopted):
+        return cls(seller_data["Seller"], seller_data["Country"], seller_data["Category"],
+                   seller_data["GMV"], adopted)
+
+    # ---------- 更新 ----------
+
+    def set(self, rows, feature, enabled=True):
+        """启用或停用 rows 这些卖家的一个功能"""
+        rows = np.asarray(rows, dtype=np.int64)
+        words, bits = rows >> 6, np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64))
+        target = self.features[FEATURE_FLAGS.index(feature)]
+        if enabled:
+            np.bitwise_or.at(target, words, bits)
+        else:
+            np.bitwise_and.at(target, words, ~bits)
+
+    # ---------- 查询 ----------
+
+    def _any(self, by, values):
+        """属于任一所选分组的卖家（values 为 None 时为全部卖家）"""
+        if values is None:
+            return self.universe
+        labels, bits = self.groups[by]
+        index = [labels.index(v) for v in values if v in labels]
+        return np.bitwise_or.reduce(bits[index], axis=0) if index else np.zeros_like(self.universe)
+
+    def query(self, has=(), lacks=(), countries=None, categories=None, gmv=None):
+        """满足全部条件的卖家位图: 启用 has 中所有功能、未启用 lacks 中任何功能、属于所选国家/类目/GMV 档位"""
+        bits = self._any("国家", countries) & self._any("类目", categories) & self._any("GMV", gmv)
+        for feature in has:
+            bits &= self.features[FEATURE_FLAGS.index(feature)]
+        for feature in lacks:
+            bits &= ~self.features[FEATURE_FLAGS.index(feature)]
+        return bits
+
+    def count(self, bits):
+        return int(popcount(bits))
+
+    def rows(self, bits):
+        return np.flatnonzero(to_mask(bits, self.n))
+
+    def adoption_rates(self, by="国家", countries=None):
+        """按国家或类目汇总的卖家数和各功能采用率（只统计所选国家的卖家）"""
+        labels, groups = self.groups[by]
+        groups = groups & self._any("国家", countries)
+        sellers = popcount(groups)
+        adopted = popcount(groups[:, None, :] & self.features[None, :, :])
+        keep = sellers > 0
+        rates = adopted[keep] / sellers[keep, None]
+        frame = pd.DataFrame(rates, columns=FEATURE_FLAGS)
+        frame.insert(0, by, np.asarray(labels, dtype=object)[keep])
+        frame.insert(1, "卖家数", sellers[keep])
+        return frame
+
+    def seller_table(self, bits):
+        """位图中卖家的功能采用表（FEATURE_ADOPTION 的列）"""
+        rows = self.rows(bits)
+        frame = pd.DataFrame({"卖家": self.sellers[rows]})
+        for i, feature in enumerate(FEATURE_FLAGS):
+            frame[feature] = to_mask(self.features[i], self.n)[rows]
+        frame["采用率"] = frame[FEATURE_FLAGS].mean(axis=1)
+        return frame
+
+    def recommendations(self, countries=None, rules=ADOPTION_RULES):
+        """AI功能采用建议: 每条规则的 (图标, 人群, 建议, 卖家数, GMV 最高的卖家)"""
+        result = []
+        for icon, label, action, conditions in rules:
+            rows = self.rows(self.query(countries=countries, **conditions))
+            example = self.sellers[rows[self.gmv[rows].argmax()]] if len(rows) else None
+            result.append((icon, label, action, len(rows), example))
+        return result
+
+
+# ---------- 模拟数据 ----------
+
+_NAMED_ADOPTION = {
+    # 卖家: (FBA, 广告, 促销, 优惠券)
+    "TechGiant_SG": (True, True, True, False),
+    "ElectroMax_ID": (False, True, False, True),
+    "FashionHub_MY": (True, False, True, True),
+    "BeautyPro_VN": (True, True, False, True),
+    "HealthPlus_ID": (True, False, True, False),
+}
+# 各功能的基础采用率，GMV 越高越容易采用
+MOCK_ADOPTION_RATES = (0.6, 0.45, 0.5, 0.35)
+
+
+def generate_mock_adoption(seller_data, seed=21):
+    """模拟每个卖家的功能采用情况（演示卖家固定）"""
+    rng = np.random.RandomState(seed)
+    gmv = seller_data["GMV"].to_numpy(dtype=np.float64)
+    percentile = gmv.argsort().argsort() / max(len(gmv) - 1, 1)
+    p = np.asarray(MOCK_ADOPTION_RATES)[None, :] + 0.3 * (percentile[:, None] - 0.5)
+    adopted = rng.random_sample(p.shape) < p
+    named = seller_data["Seller"].map(_NAMED_ADOPTION)
+    rows = np.flatnonzero(named.notna().to_numpy())
+    if len(rows):
+        adopted[rows] = np.array(named.iloc[rows].tolist(), dtype=bool)
+    return adopted
@@ -0,0 +1,429 @@
+"""
+招募接触节奏引擎
+
+每个潜在卖家从加入之日起按 CADENCE 的 Day 1/3/7/14 邮件节奏接触；
+首次接触后超过响应阈值（天）仍未回复的，通过升级渠道（电话、LinkedIn、WhatsApp）跟进。
+
+待发送的接触保存在时间轮中: 按刻度（默认 1 小时）分桶，桶内是一批潜在卖家编号的数组，
+桶的先后由一个小根堆维护。加入、到期、重新安排都按数组批量处理，
+10 万个潜在卖家的节奏只占几百个桶。到期的接触按渠道分组，分批交给渠道发送器；
+已回复的潜在卖家在到期时跳过。修改响应阈值时，尚未升级的潜在卖家的升级接触会被重新安排。
+发送失败的一批接触不算发出，按指数退避（1、2、4… 个刻度，最多 RETRY_MAX_TICKS 个）重新放回时间轮。
+
+发送器只需实现 send(messages) -> 发送条数，messages 为
+{"prospect", "channel", "touch", "content"} 字典的列表:
+- FakeSink: 离线发送器，只记录（默认）
+- SmtpSender: 通过 SMTP 发送邮件（GROW_SMTP_HOST / GROW_SMTP_PORT）
+- WhatsAppSender: 调用 WhatsApp 批量消息接口（GROW_WHATSAPP_URL）
+"""
+
+import base64
+import heapq
+import os
+import smtplib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.header import Header
+from functools import lru_cache
+
+import numpy as np
+import requests
+
+DAY = 86400.0
+
+
+@dataclass(frozen=True)
+class Touch:
+    """节奏中的一个接触点，offset_days 为距加入当天的天数"""
+    label: str
+    offset_days: int
+    channel: str
+    content: str
+
+
+CADENCE = (
+    Touch("Day 1", 0, "邮件", "初次介绍"),
+    Touch("Day 3", 2, "邮件", "价值主张"),
+    Touch("Day 7", 6, "邮件", "案例分享"),
+    Touch("Day 14", 13, "邮件", "最后机会"),
+)
+# 升级跟进在节奏中的编号（排在所有邮件接触点之后）
+ESCALATION = len(CADENCE)
+ESCALATION_CHANNELS = ["电话", "LinkedIn", "WhatsApp"]
+ESCALATION_CONTENT = "直接沟通"
+
+# 发送失败后重试的最长间隔（刻度数）；连续失败时间隔从 1 个刻度起加倍
+RETRY_MAX_TICKS = 24
+
+# 演示用: 各接触点的历史响应率，用于模拟回复
+MOCK_RESPONSE_RATES = (0.25, 0.18, 0.12, 0.08, 0.35)
+
+
+def render_message(message):
+    return f"{message['prospect']} 您好，{message['content']}: 欢迎加入 Amazon 跨市场销售计划。"
+
+
+@lru_cache(maxsize=64)
+def _encoded_subject(touch, content):
+    return Header(f"[{touch}] {content}", "utf-8").encode()
+
+
+# ---------- 发送器 ----------
+
+class FakeSink:
+    """离线发送器: 记录发送的消息（只保留最近 keep 条），可模拟每批延迟"""
+
+    def __init__(self, latency=0.0, keep=1000):
+        self.latency = latency
+        self.sent = 0
+        self.batches = 0
+        self.messages = deque(maxlen=keep)
+
+    def send(self, messages):
+        self.batches += 1
+        if self.latency:
+            time.sleep(self.latency)
+        self.sent += len(messages)
+        self.messages.extend(messages)
+        return len(messages)
+
+
+class SmtpSender:
+    """通过 SMTP 发送邮件，每批复用一个连接
+
+    潜在卖家没有邮箱字段，收件人为 {卖家}@recipient_domain。
+    邮件直接拼成 MIME 文本（标题按接触点缓存编码），不经过 email 包逐封构建头部。
+    """
+
+    def __init__(self, host, port=25, from_addr="grow-ai@example.com",
+                 recipient_domain="example.com", timeout=10.0):
+        self.host = host
+        self.port = port
+        self.from_addr = from_addr
+        self.recipient_domain = recipient_domain
+        self.timeout = timeout
+
+    def send(self, messages):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            for message in messages:
+                to_addr = f"{message['prospect']}@{self.recipient_domain}"
+                body = base64.encodebytes(render_message(message).encode()).decode()
+                email = (
+                    f"From: {self.from_addr}\r\nTo: {to_addr}\r\n"
+                    f"Subject: {_encoded_subject(message['touch'], message['content'])}\r\n"
+                    "MIME-Version: 1.0\r\nContent-Type: text/plain; charset=utf-8\r\n"
+                    f"Content-Transfer-Encoding: base64\r\n\r\n{body}"
+                )
+                smtp.sendmail(self.from_addr, [to_addr], email)
+        return len(messages)
+
+
+class WhatsAppSender:
+    """调用 WhatsApp 消息网关的批量接口: POST {url}/messages"""
+
+    def __init__(self, url, token=None, timeout=10.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def send(self, messages):
+        payload = {"messages": [{"to": m["prospect"], "text": render_message(m)} for m in messages]}
+        response = self.session.post(f"{self.url}/messages", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return len(messages)
+
+
+def senders_from_env():
+    """各渠道的发送器；未配置 SMTP / WhatsApp 网关时使用 FakeSink，电话和 LinkedIn 只记录为 AM 待办"""
+    senders = {channel: FakeSink() for channel in ["邮件", *ESCALATION_CHANNELS]}
+    if os.environ.get("GROW_SMTP_HOST"):
+        senders["邮件"] = SmtpSender(os.environ["GROW_SMTP_HOST"], int(os.environ.get("GROW_SMTP_PORT", "25")))
+    if os.environ.get("GROW_WHATSAPP_URL"):
+        senders["WhatsApp"] = WhatsAppSender(os.environ["GROW_WHATSAPP_URL"], os.environ.get("GROW_WHATSAPP_TOKEN"))
+    return senders
+
+
+# ---------- 节奏引擎 ----------
+
+class CadenceEngine:
+    """按节奏批量发送接触的时间轮调度器
+
+    senders 为 {渠道: 发送器}；tick 为时间轮刻度（秒），接触在其到期时间所在的刻度内发出；
+    on_sent(engine, sent) 在每次发送后调用，sent 为 {接触点编号: 潜在卖家编号数组}。
+    failed 为累计发送失败（已重新排队）的条数；last_error 为最近一次失败的原因，各渠道恢复后清空。
+    """
+
+    def __init__(self, senders, threshold_days=7, escalation_channel="电话", tick=3600.0,
+                 batch_size=1000, on_sent=None, clock=time.time):
+        if escalation_channel not in ESCALATION_CHANNELS:
+            raise ValueError(f"未知的升级渠道: {escalation_channel}")
+        self.senders = senders
+        self.threshold_days = threshold_days
+        self.escalation_channel = escalation_channel
+        self.tick = tick
+        self.batch_size = batch_size
+        self.on_sent = on_sent
+        self.clock = clock
+        self.last_error = ""
+        self.failed = 0
+        # 渠道 → 连续失败次数，决定重试间隔
+        self._failures = {}
+
+        self.names = []
+        self._ids = {}
+        self._start = np.zeros(0)
+        self._responded = np.zeros(0, dtype=bool)
+        self._escalated = np.zeros(0, dtype=bool)
+        self._last_step = np.zeros(0, dtype=np.int8)
+
+        # 时间轮: 刻度 → [(接触点编号, 潜在卖家编号数组)]，堆中是有待发送接触的刻度
+        self._slots = {}
+        self._heap = []
+        steps = ESCALATION + 1
+        self.pending = np.zeros(steps, dtype=np.int64)
+        self.sent = np.zeros(steps, dtype=np.int64)
+        self.skipped = np.zeros(steps, dtype=np.int64)
+        self.responses = np.zeros(steps, dtype=np.int64)
+
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def touch(self, step):
+        if step == ESCALATION:
+            return Touch(f"{self.escalation_channel}跟进", self.threshold_days, self.escalation_channel,
+                         ESCALATION_CONTENT)
+        return CADENCE[step]
+
+    # ---------- 计划 ----------
+
+    def _schedule(self, step, ids, due):
+        if len(ids) == 0:
+            return
+        slots = np.floor(due / self.tick).astype(np.int64)
+        order = np.argsort(slots, kind="stable")
+        slots, ids = slots[order], ids[order]
+        bounds = np.flatnonzero(np.diff(slots)) + 1
+        for slot, chunk in zip(slots[np.r_[0, bounds]].tolist(), np.split(ids, bounds)):
+            bucket = self._slots.get(slot)
+            if bucket is None:
+                bucket = self._slots[slot] = []
+                heapq.heappush(self._heap, slot)
+            bucket.append((step, chunk))
+        self.pending[step] += len(ids)
+
+    def enroll(self, names, start=None):
+        """批量加入潜在卖家，start 为开始时间（标量或逐个），已加入的卖家忽略；返回新加入的人数"""
+        names = list(names)
+        start = np.broadcast_to(np.asarray(self.clock() if start is None else start, dtype=np.float64),
+                                (len(names),))
+        with self._lock:
+            fresh = {}
+            for i, name in enumerate(names):
+                if name not in self._ids and name not in fresh:
+                    fresh[name] = i
+            if not fresh:
+                return 0
+            first = len(self.names)
+            ids = np.arange(first, first + len(fresh))
+            self.names.extend(fresh)
+            self._ids.update(zip(fresh, ids.tolist()))
+            starts = start[np.fromiter(fresh.values(), dtype=np.int64, count=len(fresh))]
+            self._start = np.concatenate([self._start, starts])
+            self._responded = np.concatenate([self._responded, np.zeros(len(ids), dtype=bool)])
+            self._escalated = np.concatenate([self._escalated, np.zeros(len(ids), dtype=bool)])
+            self._last_step = np.concatenate([self._last_step, np.full(len(ids), -1, dtype=np.int8)])
+
+            for step, touch in enumerate(CADENCE):
+                self._schedule(step, ids, starts + touch.offset_days * DAY)
+            self._schedule(ESCALATION, ids, starts + self.threshold_days * DAY)
+        self._wake.set()
+        return len(ids)
+
+    def configure(self, threshold_days=None, escalation_channel=None):
+        """修改响应阈值或升级渠道，返回重新安排升级跟进的潜在卖家数
+
+        渠道在发送时读取，修改后对所有尚未发出的升级跟进生效；
+        阈值变化时撤下时间轮中所有升级跟进，按新阈值重新安排（已过期的在下一次发送时立即发出）。
+        """
+        with self._lock:
+            if escalation_channel is not None:
+                if escalation_channel not in ESCALATION_CHANNELS:
+                    raise ValueError(f"未知的升级渠道: {escalation_channel}")
+                self.escalation_channel = escalation_channel
+            if threshold_days is None or threshold_days == self.threshold_days:
+                return 0
+            self.threshold_days = threshold_days
+            for slot, bucket in list(self._slots.items()):
+                kept = [entry for entry in bucket if entry[0] != ESCALATION]
+                if len(kept) == len(bucket):
+                    continue
+                if kept:
+                    self._slots[slot] = kept
+                else:
+                    # 堆中留下的刻度在弹出时发现桶不存在，直接跳过
+                    del self._slots[slot]
+            self.pending[ESCALATION] = 0
+            active = np.flatnonzero(~self._responded & ~self._escalated)
+            self._schedule(ESCALATION, active, self._start[active] + threshold_days * DAY)
+        self._wake.set()
+        return len(active)
+
+    def record_responses(self, names):
+        """记录潜在卖家的回复: 后续接触不再发送，回复计入最近一次接触的响应率"""
+        ids = [self._ids[name] for name in names if name in self._ids]
+        self.respond(np.asarray(ids, dtype=np.int64))
+
+    def respond(self, ids):
+        """按潜在卖家编号（names 中的位置）记录回复"""
+        with self._lock:
+            ids = ids[~self._responded[ids]]
+            self._responded[ids] = True
+            steps = self._last_step[ids]
+            np.add.at(self.responses, steps[steps >= 0], 1)
+
+    # ---------- 发送 ----------
+
+    def next_due(self):
+        """最早一个待发送刻度的开始时间，没有待发送的接触时返回 None"""
+        with self._lock:
+            return self._heap[0] * self.tick if self._heap else None
+
+    def run_due(self, now=None):
+        """发出所有已到期的接触，返回 {接触点编号: 发出的潜在卖家编号数组}（不含发送失败、重新排队的）"""
+        current = int((self.clock() if now is None else now) // self.tick)
+        outbox = {}
+        with self._lock:
+            due = []
+            while self._heap and self._heap[0] <= current:
+                due.extend(self._slots.pop(heapq.heappop(self._heap), None) or [])
+            sent = {}
+            for step, ids in due:
+                self.pending[step] -= len(ids)
+                active = ids[~self._responded[ids]]
+                if step == ESCALATION:
+                    active = active[~self._escalated[active]]
+                    self._escalated[active] = True
+                self.skipped[step] += len(ids) - len(active)
+                if len(active) == 0:
+                    continue
+                touch = self.touch(step)
+                messages, steps, prospects, previous = outbox.setdefault(touch.channel, ([], [], [], []))
+                messages.extend(
+                    {"prospect": self.names[i], "channel": touch.channel, "touch": touch.label,
+                     "content": touch.content}
+                    for i in active.tolist()
+                )
+                steps.append(np.full(len(active), step, dtype=np.int64))
+                prospects.append(active)
+                previous.append(self._last_step[active])
+                self._last_step[active] = step
+
+        for channel, (messages, steps, prospects, previous) in outbox.items():
+            steps, prospects, previous = (np.concatenate(a) for a in (steps, prospects, previous))
+            sender = self.senders[channel]
+            for start in range(0, len(messages), self.batch_size):
+                batch = slice(start, start + self.batch_size)
+                try:
+                    sender.send(messages[batch])
+                except Exception as e:
+                    self.last_error = f"{channel}: {type(e).__name__}: {e}"
+                    self.failed += len(messages[batch])
+                    self._retry(channel, current, steps[batch], prospects[batch], previous[batch])
+                    continue
+                with self._lock:
+                    np.add.at(self.sent, steps[batch], 1)
+                    self._failures.pop(channel, None)
+                    if not self._failures:
+                        self.last_error = ""
+                for step in np.unique(steps[batch]).tolist():
+                    ids = prospects[batch][steps[batch] == step]
+                    sent[step] = np.concatenate([sent[step], ids]) if step in sent else ids
+
+        if sent and self.on_sent is not None:
+            self.on_sent(self, sent)
+        return sent
+
+    def _retry(self, channel, current, steps, ids, previous):
+        """把发送失败的一批接触放回时间轮，恢复为未发出的状态"""
+        with self._lock:
+            failures = self._failures[channel] = self._failures.get(channel, 0) + 1
+            due = (current + min(2 ** (failures - 1), RETRY_MAX_TICKS)) * self.tick
+            self._last_step[ids] = previous
+            for step in np.unique(steps).tolist():
+                retry = ids[steps == step]
+                if step == ESCALATION:
+                    self._escalated[retry] = False
+                self._schedule(step, retry, np.full(len(retry), due))
+
+    def catch_up(self, now=None):
+        """按刻度顺序逐个发出积压的到期接触，返回发出的条数
+
+        与一次性发出相比，较早接触的回复能先被记录，已回复的潜在卖家不会再收到后续接触。
+        """
+        now = self.clock() if now is None else now
+        total = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                return total
+            total += sum(len(ids) for ids in self.run_due(due).values())
+
+    # ---------- 后台线程 ----------
+
+    def start(self, initial_run=True):
+        """启动后台发送线程；initial_run 时先同步发出积压的到期接触"""
+        if self._thread is not None:
+            return self
+        if initial_run:
+            self.catch_up()
+        self._thread = threading.Thread(target=self._run, name="grow-cadence", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.catch_up()
+            due = self.next_due()
+            # 最多等一个刻度，时钟跳变或新加入的卖家也能及时发出
+            wait = self.tick if due is None else min(max(due - self.clock(), 0.0), self.tick)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    # ---------- 展示 ----------
+
+    def plan_table(self):
+        """各接触点的 渠道、已发送、待发送、响应率、状态（ENGAGEMENT_PLAN 的列）"""
+        with self._lock:
+            touches = [self.touch(step) for step in range(ESCALATION + 1)]
+            sent, pending, responses = self.sent.copy(), self.pending.copy(), self.responses.copy()
+        rate = np.divide(responses, sent, out=np.full(len(sent), np.nan), where=sent > 0)
+        status = np.select([(pending == 0) & (sent > 0), sent > 0], ["✅ 已发送", "📅 待发送"], "📅 计划中")
+        return {
+            "接触点": [t.label for t in touches],
+            "渠道": [t.channel for t in touches],
+            "内容类型": [t.content for t in touches],
+            "已发送": sent,
+            "待发送": pending,
+            "响应率": rate,
+            "状态": status,
+        }
+
+
+def simulate_responses(engine, sent, rates=MOCK_RESPONSE_RATES, seed=None):
+    """演示用: 按各接触点的历史响应率随机模拟回复（作为 on_sent 回调）"""
+    rng = np.random.default_rng(seed)
+    for step, ids in sent.items():
+        engine.respond(ids[rng.random(len(ids)) < rates[step]])
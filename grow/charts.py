@@ -0,0 +1,61 @@
+"""
+图表构建
+
+所有图表都构建为 Plotly 图形，在浏览器端渲染。
+构建函数按输入数据（元组，可哈希）做记忆化，数据不变时重新运行脚本不会重新构建图形。
+返回的图形在会话之间共享，调用方不要修改。
+"""
+
+from functools import lru_cache
+
+import plotly.graph_objects as go
+
+RECRUITMENT_COLORS = ("#ff9999", "#66b3ff", "#99ff99", "#ffcc99")
+ONBOARDING_COLORS = ("#ff6b6b", "#4ecdc4", "#45b7d1", "#96ceb4", "#feca57")
+
+
+def conversion_labels(counts):
+    """“数量 (相对第一阶段的转化率)” 标签"""
+    first = counts[0] if counts and counts[0] else 1
+    return [f"{c} ({c / first * 100:.1f}%)" for c in counts]
+
+
+def _layout(fig, title, **axes):
+    fig.update_layout(
+        title=title,
+        height=400,
+        margin=dict(l=20, r=20, t=50, b=20),
+        showlegend=False,
+        **axes,
+    )
+    return fig
+
+
+@lru_cache(maxsize=64)
+def recruitment_funnel_figure(stages, counts, colors=RECRUITMENT_COLORS):
+    """招募漏斗: 水平条形图，第一阶段在最上方"""
+    fig = go.Figure(go.Bar(
+        x=list(counts), y=list(stages), orientation="h",
+        marker_color=list(colors[:len(stages)]),
+        text=conversion_labels(counts), textposition="outside", cliponaxis=False,
+    ))
+    return _layout(
+        fig, "招募漏斗分析",
+        xaxis_title="数量",
+        yaxis=dict(autorange="reversed"),
+    )
+
+
+@lru_cache(maxsize=64)
+def onboarding_funnel_figure(stages, counts, colors=ONBOARDING_COLORS):
+    """入驻转化漏斗: 竖直条形图"""
+    fig = go.Figure(go.Bar(
+        x=list(stages), y=list(counts),
+        marker_color=list(colors[:len(stages)]),
+        text=[str(c) for c in counts], textposition="outside", cliponaxis=False,
+    ))
+    return _layout(
+        fig, "入驻转化漏斗",
+        yaxis_title="数量",
+        xaxis=dict(tickangle=-45),
+    )
@@ -0,0 +1,110 @@
+"""
+外部数据源连接器: Quicksight、VOS Hub、Selection AI
+
+所有数据源共用一个带连接池的 requests.Session，通过 asyncio 并发拉取:
+每个数据源有独立超时，整体并发数由信号量限制。
+首屏耗时取决于最慢的数据源，而不是三者之和。
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass(frozen=True)
+class SourceConfig:
+    """单个数据源的配置"""
+    name: str
+    base_url: str
+    path: str = "/"
+    timeout: float = 5.0
+
+
+@dataclass
+class SourceResult:
+    """单个数据源的拉取结果"""
+    name: str
+    ok: bool
+    payload: dict = field(default_factory=dict)
+    error: str = ""
+    elapsed: float = 0.0
+
+
+# 数据源名称 → (环境变量, 接口路径)
+DEFAULT_SOURCES = {
+    "Quicksight": ("GROW_QUICKSIGHT_URL", "/api/metrics"),
+    "VOS Hub": ("GROW_VOS_HUB_URL", "/api/sentiment"),
+    "Selection AI": ("GROW_SELECTION_AI_URL", "/api/selection"),
+}
+
+
+def sources_from_env(timeout=None):
+    """从环境变量读取已配置的数据源，未配置的数据源不返回"""
+    timeout = float(timeout or os.environ.get("GROW_SOURCE_TIMEOUT", "5"))
+    sources = []
+    for name, (env_var, path) in DEFAULT_SOURCES.items():
+        base_url = os.environ.get(env_var)
+        if base_url:
+            sources.append(SourceConfig(name, base_url.rstrip("/"), path, timeout))
+    return sources
+
+
+class ConnectorPool:
+    """共享连接池的异步数据源客户端"""
+
+    def __init__(self, sources, max_concurrency=8, pool_size=16):
+        self.sources = {s.name: s for s in sources}
+        self.max_concurrency = max_concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.sources) or 1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._local = threading.local()
+
+    def _semaphore(self):
+        # asyncio.Semaphore 绑定在事件循环上，每个循环各建一个
+        loop = asyncio.get_running_loop()
+        if getattr(self._local, "loop", None) is not loop:
+            self._local.loop = loop
+            self._local.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._local.semaphore
+
+    def _get(self, source, params):
+        response = self.session.get(
+            source.base_url + source.path, params=params, timeout=source.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch(self, name, params=None):
+        """拉取单个数据源，失败和超时都以 SourceResult.ok=False 返回"""
+        source = self.sources[name]
+        start = time.perf_counter()
+        try:
+            async with self._semaphore():
+                payload = await asyncio.wait_for(
+                    asyncio.to_thread(self._get, source, params), timeout=source.timeout
+                )
+            return SourceResult(name, True, payload, elapsed=time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            error = f"超时 (>{source.timeout:.1f}s)"
+        except (requests.RequestException, ValueError) as e:
+            error = str(e)
+        return SourceResult(name, False, error=error, elapsed=time.perf_counter() - start)
+
+    async def fetch_all(self, params=None):
+        """并发拉取所有数据源"""
+        results = await asyncio.gather(*(self.fetch(name, params) for name in self.sources))
+        return {r.name: r for r in results}
+
+    def fetch_all_sync(self, params=None):
+        """在没有运行中事件循环的线程（如 Streamlit 脚本线程）里调用"""
+        return asyncio.run(self.fetch_all(params))
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,269 @@
+"""
+卖家列式数据存储
+
+卖家数据以 Parquet 格式按 Country 分区（hive 风格目录 Country=SG/...）保存在磁盘上。
+读取时只扫描当前视图需要的列和国家分区，而不是每次都把整张表读进内存。
+
+为了让同一进程内的所有 Streamlit 会话共享同一份数据，Parquet 分区还会导出一份
+未压缩的 Arrow IPC 镜像（<table>.arrow/Country=XX.arrow），通过内存映射只读打开，
+各会话拿到的是同一组映射缓冲区，而不是各自反序列化的副本。
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from grow.scoring import score_sellers
+
+COUNTRIES = ["SG", "MY", "TH", "ID", "VN", "PH"]
+TIERS = ["T0", "T1", "T2", "T3"]
+CATEGORIES = ["Electronics", "Fashion", "Beauty", "Home", "Sports", "Health"]
+
+# 卖家基础数据列
+SELLER_COLUMNS = [
+    "Seller_ID", "Seller", "Country", "Category", "GMV", "Growth Rate",
+    "Compliance Score", "Active Days", "Tier",
+]
+
+# AI分析结果列
+AI_COLUMNS = [
+    "Seller_ID", "Seller", "AI_Growth_Score", "Product_Gap_Count", "Compliance_Risk",
+    "VOS_Sentiment", "Revenue_Potential", "AI_Recommendation",
+]
+
+DEFAULT_DATA_DIR = Path(
+    os.environ.get("GROW_DATA_DIR", Path(__file__).resolve().parent.parent / "data")
+)
+
+_NAMED_SELLERS = [
+    "TechGiant_SG", "ElectroMax_ID", "FashionHub_MY", "BeautyPro_VN",
+    "HomeDecor_TH", "SportsPro_PH", "GadgetWorld_SG", "StyleMax_MY",
+    "KitchenPro_TH", "HealthPlus_ID"
+]
+_NAMED_COUNTRIES = ["SG", "ID", "MY", "VN", "TH", "PH", "SG", "MY", "TH", "ID"]
+_NAMED_CATEGORIES = ["Electronics", "Electronics", "Fashion", "Beauty", "Home",
+                     "Sports", "Electronics", "Fashion", "Home", "Health"]
+_RECOMMENDATIONS = [
+    "扩展产品线", "优化listing质量", "提升合规分数", "增加广告投入",
+    "改善客户服务", "扩展到新类目", "优化价格策略", "提升品牌形象",
+    "增加库存深度", "改善物流效率"
+]
+
+
+def generate_mock_data(n_sellers=10, seed=42):
+    """生成模拟的卖家数据（包含基础数据和AI分析列）
+
+    前10个卖家固定为演示用的知名卖家，超出部分按国家和类目随机生成。
+    """
+    rng = np.random.RandomState(seed)
+    n_named = min(n_sellers, len(_NAMED_SELLERS))
+    n_extra = n_sellers - n_named
+
+    countries = np.concatenate([
+        np.array(_NAMED_COUNTRIES[:n_named], dtype=object),
+        rng.choice(COUNTRIES, n_extra).astype(object),
+    ])
+    categories = np.concatenate([
+        np.array(_NAMED_CATEGORIES[:n_named], dtype=object),
+        rng.choice(CATEGORIES, n_extra).astype(object),
+    ])
+    ids = np.arange(1, n_sellers + 1, dtype=np.int64)
+    names = np.array(
+        _NAMED_SELLERS[:n_named]
+        + [f"Seller{i:07d}_{c}" for i, c in zip(ids[n_named:], countries[n_named:])],
+        dtype=object,
+    )
+
+    frame = pd.DataFrame({
+        "Seller_ID": ids,
+        "Seller": names,
+        "Country": countries,
+        "Category": categories,
+        "GMV": rng.randint(20000, 200000, n_sellers),
+        "Growth Rate": rng.uniform(-5, 25, n_sellers),
+        "Compliance Score": rng.randint(60, 95, n_sellers),
+        "Active Days": rng.randint(30, 365, n_sellers),
+        "Tier": rng.choice(TIERS, n_sellers, p=[0.1, 0.2, 0.4, 0.3]),
+    })
+
+    # AI分析结果
+    frame["Compliance_Risk"] = rng.choice(["Low", "Medium", "High"], n_sellers, p=[0.6, 0.3, 0.1])
+    frame["VOS_Sentiment"] = rng.uniform(3.0, 5.0, n_sellers)
+    frame["AI_Recommendation"] = np.resize(np.array(_RECOMMENDATIONS, dtype=object), n_sellers)
+    scores = score_sellers(
+        frame["GMV"], frame["Growth Rate"], frame["Compliance Score"],
+        frame["Active Days"], frame["VOS_Sentiment"],
+    )
+    for column, values in scores.items():
+        frame[column] = values
+    return frame[SELLER_COLUMNS + AI_COLUMNS[2:]]
+
+
+_mapped_tables = {}
+_mapped_lock = threading.Lock()
+
+
+class MappedTable:
+    """只读、内存映射的按国家分区 Arrow 表
+
+    select() 返回的 Arrow 表直接引用映射缓冲区，不复制数据。
+    """
+
+    def __init__(self, paths):
+        self.partitions = {}
+        for country, path in sorted(paths.items()):
+            source = pa.memory_map(str(path), "r")
+            self.partitions[country] = pa.ipc.open_file(source).read_all()
+        self.schema = next(iter(self.partitions.values())).schema if self.partitions else None
+
+    @property
+    def num_rows(self):
+        return sum(t.num_rows for t in self.partitions.values())
+
+    def select(self, columns=None, countries=None):
+        """按列和国家切片（零拷贝）"""
+        names = self.partitions if countries is None else [c for c in countries if c in self.partitions]
+        tables = [self.partitions[c] for c in names]
+        if not tables:
+            return self.schema.empty_table().select(columns) if columns else self.schema.empty_table()
+        if columns is not None:
+            tables = [t.select(list(columns)) for t in tables]
+        return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+    def to_pandas(self, columns=None, countries=None):
+        """转换为 DataFrame，数值列在可能时直接复用映射内存"""
+        return self.select(columns, countries).to_pandas(split_blocks=True)
+
+
+def iter_mock_weekly_facts(seller_data, weeks=104, end=None, seed=7):
+    """按周生成模拟的卖家周度事实数据，每次产出 (周一日期, DataFrame)
+
+    每行是一个已上线卖家在该周的记录:
+    Launched（本周上线）、FBA_Adopted（本周开通FBA）、FBA_BA（本周新增FBA BA数）、
+    GMS（本周销售额）、Ads_Active（本周是否投放广告）。
+    """
+    rng = np.random.RandomState(seed)
+    end = pd.Timestamp(end or pd.Timestamp.today()).normalize()
+    end = end - pd.Timedelta(days=end.weekday())
+    n = len(seller_data)
+
+    launch_week = rng.randint(0, weeks, n)
+    fba_delay = rng.geometric(0.08, n)
+    fba_week = np.where(rng.rand(n) < 0.6, launch_week + fba_delay, weeks + 1)
+    ads_propensity = rng.beta(6, 3, n)
+    weekly_gms = seller_data["GMV"].to_numpy(dtype=np.float64) / 52.0
+
+    base = seller_data[["Seller_ID", "Country", "Tier", "Category"]].reset_index(drop=True)
+    for w in range(weeks):
+        live = np.flatnonzero(launch_week <= w)
+        ramp = np.minimum(1.0, (w - launch_week[live] + 1) / 8.0)
+        has_fba = fba_week[live] <= w
+        facts = base.iloc[live].reset_index(drop=True)
+        facts["Launched"] = launch_week[live] == w
+        facts["FBA_Adopted"] = fba_week[live] == w
+        facts["FBA_BA"] = np.where(has_fba, rng.poisson(0.01, len(live)), 0)
+        facts["GMS"] = np.round(weekly_gms[live] * ramp * rng.lognormal(0.0, 0.15, len(live)), 2)
+        facts["Ads_Active"] = rng.rand(len(live)) < ads_propensity[live]
+        yield end - pd.Timedelta(weeks=weeks - 1 - w), facts
+
+
+class SellerStore:
+    """按 Country 分区的 Parquet 卖家数据集"""
+
+    def __init__(self, root=DEFAULT_DATA_DIR, table="sellers"):
+        self.root = Path(root)
+        self.path = self.root / table
+        self.ipc_path = self.root / f"{table}.arrow"
+
+    def exists(self):
+        return self.path.is_dir() and any(self.path.glob("Country=*"))
+
+    def write(self, frame):
+        """整体重写数据集，先写临时目录再替换，避免读到写了一半的分区"""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        ds.write_dataset(
+            table, tmp_path, format="parquet",
+            partitioning=["Country"], partitioning_flavor="hive",
+        )
+        shutil.rmtree(self.path, ignore_errors=True)
+        shutil.rmtree(self.ipc_path, ignore_errors=True)
+        os.replace(tmp_path, self.path)
+
+    def countries(self):
+        """磁盘上已有的国家分区"""
+        return sorted(p.name.split("=", 1)[1] for p in self.path.glob("Country=*"))
+
+    def dataset(self):
+        return ds.dataset(self.path, format="parquet", partitioning="hive")
+
+    def load(self, columns=None, countries=None):
+        """读取指定列和国家，只扫描命中的分区和列
+
+        columns 为 None 时读取全部列；countries 为 None 时读取全部国家。
+        结果按 Seller_ID 排序，保证不同列投影之间行顺序一致。
+        """
+        dataset = self.dataset()
+        if columns is not None:
+            columns = list(dict.fromkeys(columns))
+            read_columns = columns if "Seller_ID" in columns else columns + ["Seller_ID"]
+        else:
+            read_columns = None
+        row_filter = None
+        if countries is not None:
+            row_filter = ds.field("Country").isin(pa.array(list(countries), type=pa.string()))
+
+        table = dataset.to_table(columns=read_columns, filter=row_filter)
+        frame = table.to_pandas()
+        if "Country" in frame.columns:
+            frame["Country"] = frame["Country"].astype(str)
+        frame = frame.sort_values("Seller_ID", kind="stable", ignore_index=True)
+        if columns is not None:
+            frame = frame[columns]
+        return frame
+
+    def export_ipc(self):
+        """把 Parquet 分区导出为未压缩的 Arrow IPC 文件，供内存映射使用
+
+        每个国家一个文件，行按 Seller_ID 排序。已导出且不旧于 Parquet 分区时直接复用。
+        """
+        if self.ipc_path.is_dir() and self.ipc_path.stat().st_mtime >= self.path.stat().st_mtime:
+            return {p.stem.split("=", 1)[1]: p for p in self.ipc_path.glob("Country=*.arrow")}
+
+        tmp_path = self.ipc_path.with_name(self.ipc_path.name + ".tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        dataset = self.dataset()
+        for country in self.countries():
+            table = dataset.to_table(filter=ds.field("Country") == country)
+            table = table.sort_by("Seller_ID").combine_chunks()
+            with pa.OSFile(str(tmp_path / f"Country={country}.arrow"), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        shutil.rmtree(self.ipc_path, ignore_errors=True)
+        os.replace(tmp_path, self.ipc_path)
+        return self.export_ipc()
+
+    def mapped(self):
+        """进程内共享的内存映射表，同一数据集只映射一次"""
+        key = str(self.ipc_path.resolve())
+        with _mapped_lock:
+            version = self.path.stat().st_mtime_ns
+            cached = _mapped_tables.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, MappedTable(self.export_ipc()))
+                _mapped_tables[key] = cached
+            return cached[1]
+
+    def ensure(self, n_sellers=10, seed=42):
+        """数据集不存在时用模拟数据初始化"""
+        if not self.exists():
+            self.write(generate_mock_data(n_sellers, seed))
+        return self
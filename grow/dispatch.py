@@ -0,0 +1,258 @@
+"""
+批量发送定制化文档
+
+“📤 发送定制化指导”（干预行动）和 “📧 发送改善建议”（质量改善建议）把表中每一行
+按模板渲染为一封给该卖家的邮件。发送在进程内唯一的后台线程中进行，Streamlit 会话提交任务后立即返回，
+只轮询任务进度:
+- 行按 chunk_size 分块，渲染（模板填充、MIME 编码）交给进程池，不占用 Streamlit 进程的 GIL；
+  同时在途的块数有上限，渲染好的块发送后即丢弃，内存与发送总数无关
+- 渲染好的邮件按块交给发送器: 只需实现 send(messages) -> 发送条数，messages 为 (收件人, MIME 文本) 列表；
+  配置了 GROW_SMTP_HOST 时为 SmtpMailer，否则为只记录的 FakeSink
+- 任务依次执行；某一块发送失败时记录错误并继续下一块
+
+卖家没有邮箱字段，收件人为 {卖家}@recipient_domain。
+"""
+
+import base64
+import itertools
+import multiprocessing
+import os
+import queue
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from email.header import Header
+from functools import lru_cache
+
+import pyarrow as pa
+
+from grow.cadence import FakeSink
+
+ENABLEMENT_RESOURCES = [
+    "📄 快速入门指南 (中英文)",
+    "❓ 常见问题FAQ",
+    "🎥 产品Listing最佳实践视频",
+    "📞 专属客服热线",
+    "💬 卖家社群支持",
+]
+
+# 模板: (标题, 正文)，按列名填充
+TEMPLATES = {
+    "onboarding_guidance": (
+        "[入驻指导] {里程碑}: {识别问题}",
+        "{卖家} 您好，\n\n"
+        "您的入驻流程在「{里程碑}」阶段遇到了问题: {识别问题}（已延迟 {已延迟} 天）。\n\n"
+        "推荐行动: {推荐行动}\n"
+        "预计解决时间: {预期解决时间} 天\n\n"
+        "卖家赋能资源:\n" + "".join(f"• {resource}\n" for resource in ENABLEMENT_RESOURCES) +
+        "\n如需帮助，请直接回复此邮件或联系您的客户经理。\n",
+    ),
+    "quality_improvements": (
+        "[改善建议] {主要问题}",
+        "{卖家} 您好，\n\n"
+        "我们分析了您的店铺表现，发现主要问题: {主要问题}。\n\n"
+        "建议行动: {建议行动}\n"
+        "预期提升: {预期提升}\n\n"
+        "如需帮助，请直接回复此邮件或联系您的客户经理。\n",
+    ),
+}
+
+
+class _Row(dict):
+    """模板中缺失或为空的字段显示为 “-”"""
+
+    def __missing__(self, key):
+        return "-"
+
+
+@lru_cache(maxsize=1024)
+def _encoded_subject(subject):
+    # 标题只由问题类型决定，种类很少；逐封编码占渲染时间的大部分
+    return Header(subject, "utf-8").encode()
+
+
+def render_chunk(kind, rows, from_addr, recipient_domain):
+    """把一块行渲染为 (收件人, MIME 文本) 列表；在进程池中执行"""
+    subject_template, body_template = TEMPLATES[kind]
+    rendered = []
+    for row in rows:
+        row = _Row((k, v) for k, v in row.items() if v is not None)
+        to_addr = f"{row['卖家']}@{recipient_domain}"
+        subject = _encoded_subject(subject_template.format_map(row))
+        body = base64.encodebytes(body_template.format_map(row).encode()).decode()
+        rendered.append((to_addr, (
+            f"From: {from_addr}\r\nTo: {to_addr}\r\nSubject: {subject}\r\n"
+            "MIME-Version: 1.0\r\nContent-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Transfer-Encoding: base64\r\n\r\n{body}"
+        )))
+    return rendered
+
+
+class SmtpMailer:
+    """通过 SMTP 发送渲染好的邮件，每块复用一个连接"""
+
+    def __init__(self, host, port=25, from_addr="grow-ai@example.com", timeout=10.0):
+        self.host = host
+        self.port = port
+        self.from_addr = from_addr
+        self.timeout = timeout
+
+    def send(self, messages):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            for to_addr, email in messages:
+                smtp.sendmail(self.from_addr, [to_addr], email)
+        return len(messages)
+
+
+def mailer_from_env():
+    """配置了 GROW_SMTP_HOST 时通过 SMTP 发送，否则只记录"""
+    if os.environ.get("GROW_SMTP_HOST"):
+        return SmtpMailer(os.environ["GROW_SMTP_HOST"], int(os.environ.get("GROW_SMTP_PORT", "25")))
+    return FakeSink()
+
+
+class DispatchJob:
+    """一次批量发送任务的进度（由后台线程更新，会话只读）"""
+
+    def __init__(self, kind, table):
+        self.kind = kind
+        self.table = table
+        self.total = table.num_rows
+        self.rendered = 0
+        self.sent = 0
+        self.failed = 0
+        self.state = "排队中"
+        self.last_error = ""
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def progress(self):
+        return (self.sent + self.failed) / self.total if self.total else 1.0
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+class Dispatcher:
+    """进程内共享的批量发送器
+
+    workers 为渲染进程数（默认 CPU 核数）；为 1 时在后台线程内直接渲染，不启动进程池。
+    """
+
+    def __init__(self, sink, workers=None, chunk_size=500, from_addr="grow-ai@example.com",
+                 recipient_domain="example.com"):
+        self.sink = sink
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.from_addr = from_addr
+        self.recipient_domain = recipient_domain
+        self._jobs = queue.Queue()
+        self._executor = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, kind, rows):
+        """提交任务并立即返回；rows 为 DataFrame 或 pyarrow.Table，每行一封邮件"""
+        if kind not in TEMPLATES:
+            raise ValueError(f"未知的文档类型: {kind}")
+        table = rows if isinstance(rows, pa.Table) else pa.Table.from_pandas(rows, preserve_index=False)
+        job = DispatchJob(kind, table)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="grow-dispatch", daemon=True)
+                self._thread.start()
+        self._jobs.put(job)
+        return job
+
+    def close(self):
+        with self._lock:
+            if self._thread is not None:
+                self._jobs.put(None)
+                self._thread.join()
+                self._thread = None
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                self._execute(job)
+            except Exception as e:
+                job.last_error = f"{type(e).__name__}: {e}"
+                job.state = "失败"
+            finally:
+                job.finished = time.monotonic()
+                job._done.set()
+
+    def _chunks(self, job):
+        for offset in range(0, job.total, self.chunk_size):
+            yield job.table.slice(offset, self.chunk_size).to_pylist()
+
+    def _rendered(self, job):
+        """按顺序产出渲染好的块；进程池中同时在途的块不超过 workers 的两倍"""
+        args = (job.kind, self.from_addr, self.recipient_domain)
+        chunks = self._chunks(job)
+        if self.workers > 1:
+            if self._executor is None:
+                # spawn: 不复制 Streamlit 进程中的线程和锁
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            pending = deque()
+            try:
+                for rows in chunks:
+                    # 先记入在途块再提交: submit 因进程池损坏报错时这一块也会重新渲染
+                    pending.append([rows, None])
+                    pending[-1][1] = self._executor.submit(render_chunk, args[0], rows, *args[1:])
+                    if len(pending) >= self.workers * 2:
+                        yield pending[0][1].result()
+                        pending.popleft()
+                while pending:
+                    yield pending[0][1].result()
+                    pending.popleft()
+            except BrokenProcessPool as e:
+                # 进程池不可用时退回后台线程内渲染，未完成的块重新渲染
+                job.last_error = f"{type(e).__name__}: {e}"
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self.workers = 1
+                # 剩余的块仍从生成器逐块取出，内存不随发送总数增长
+                chunks = itertools.chain([rows for rows, _ in pending], chunks)
+        for rows in chunks:
+            yield render_chunk(args[0], rows, *args[1:])
+
+    def _execute(self, job):
+        job.started = time.monotonic()
+        job.state = "发送中"
+        for messages in self._rendered(job):
+            if job._cancel.is_set():
+                job.state = "已取消"
+                return
+            job.rendered += len(messages)
+            try:
+                job.sent += self.sink.send(messages)
+            except Exception as e:
+                job.failed += len(messages)
+                job.last_error = f"{type(e).__name__}: {e}"
+        job.state = "已完成"
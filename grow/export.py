@@ -0,0 +1,180 @@
+"""
+表格和报告导出
+
+任何表（DataFrame、pyarrow.Table、TableIndex 的查询结果、Parquet 文件或 RecordBatch 迭代器）
+都按 BATCH_ROWS 行一批逐批写出为 CSV、Excel 或 Parquet，写出过程中只持有一批行，
+不会先把整表转成 DataFrame 或 Python 对象:
+- CSV: pyarrow CSVWriter，带 UTF-8 BOM，Excel 直接打开中文列名不乱码
+- Excel: openpyxl 的 write-only 模式，行追加后即写入临时文件；超过单个工作表的行数上限时续写到新工作表
+- Parquet: ParquetWriter，每批一个行组
+
+类别列按值写出，浮点列的 NaN 写为空值。
+export() 不指定输出时写入 SpooledTemporaryFile（小文件在内存中，超过 SPOOL_BYTES 转存磁盘），
+页面在 st.download_button 的延迟生成回调中调用，点击下载时才生成文件。
+Streamlit 把回调的结果（bytes 或文件对象）整个读入内存中的媒体存储再提供下载，
+所以下载时生成的文件会完整地在内存中存放一份；写到磁盘或对象存储（sink 参数）时没有这一份。
+"""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from grow.attribution import contributions
+from grow.schema import FEATURE_FLAGS
+
+BATCH_ROWS = 10_000
+SPOOL_BYTES = 8 * 1024 * 1024
+# Excel 单个工作表的行数上限（含表头）
+XLSX_MAX_ROWS = 1_048_576
+
+EXPORT_FORMATS = {
+    # 显示名: (扩展名, MIME)
+    "CSV": ("csv", "text/csv"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _first(batches):
+    """(第一批, 剩余批次的迭代器)；没有数据时第一批为 None"""
+    batches = iter(batches)
+    return next(batches, None), batches
+
+
+def iter_batches(source, batch_rows=BATCH_ROWS, rows=None):
+    """各种表 → RecordBatch 迭代器；rows 为要导出的行号（如 TableIndex.query 的结果），按其顺序逐批取出"""
+    if isinstance(source, pd.DataFrame):
+        source = pa.Table.from_pandas(source, preserve_index=False)
+    elif hasattr(source, "table"):
+        source = source.table
+    elif isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        # 默认的 pre_buffer 会把整个文件读入内存，逐行组读取时关闭
+        source = pq.ParquetFile(source, pre_buffer=False)
+    if isinstance(source, pq.ParquetFile):
+        schema, batches = source.schema_arrow, source.iter_batches(batch_size=batch_rows)
+    elif isinstance(source, pa.Table):
+        schema = source.schema
+        if rows is None:
+            batches = source.to_reader(max_chunksize=batch_rows)
+        else:
+            rows = np.asarray(rows)
+            batches = (batch for start in range(0, len(rows), batch_rows)
+                       for batch in source.take(rows[start:start + batch_rows]).to_batches())
+    else:
+        yield from source
+        return
+    first, rest = _first(batches)
+    # 空表也产出一个空批次，导出的文件仍有表头
+    yield pa.RecordBatch.from_pylist([], schema=schema) if first is None else first
+    yield from rest
+
+
+def _cleaned(batch):
+    """类别列解码为值，浮点 NaN 转为空值"""
+    columns = []
+    for column in batch.columns:
+        if pa.types.is_dictionary(column.type):
+            column = column.dictionary_decode()
+        if pa.types.is_floating(column.type):
+            column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def write_csv(batches, sink):
+    first, rest = _first(batches)
+    sink.write(b"\xef\xbb\xbf")
+    if first is None:
+        return
+    first = _cleaned(first)
+    writer = pa_csv.CSVWriter(sink, first.schema)
+    try:
+        writer.write_batch(first)
+        for batch in rest:
+            writer.write_batch(_cleaned(batch))
+    finally:
+        writer.close()
+
+
+def write_xlsx(batches, sink, sheet_name="数据"):
+    # openpyxl 只在导出 Excel 时导入，显示导出菜单不加载它
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet, sheet_rows, header = None, XLSX_MAX_ROWS, []
+    for batch in batches:
+        batch = _cleaned(batch)
+        header = batch.schema.names
+        for row in zip(*(column.to_pylist() for column in batch.columns)):
+            if sheet_rows == XLSX_MAX_ROWS:
+                sheets = len(workbook.worksheets)
+                sheet = workbook.create_sheet(f"{sheet_name} ({sheets + 1})" if sheets else sheet_name)
+                sheet.append(header)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet(sheet_name).append(header)
+    workbook.save(sink)
+
+
+def write_parquet(batches, sink):
+    first, rest = _first(batches)
+    if first is None:
+        return
+    first = _cleaned(first)
+    with pq.ParquetWriter(sink, first.schema) as writer:
+        writer.write_batch(first)
+        for batch in rest:
+            writer.write_batch(_cleaned(batch))
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
+
+
+def export(source, extension, sink=None, batch_rows=BATCH_ROWS, rows=None):
+    """逐批导出为 extension（csv / xlsx / parquet）格式
+
+    sink 为可写的二进制文件对象；不指定时写入 SpooledTemporaryFile，写完后回到开头返回。
+    """
+    if extension not in WRITERS:
+        raise ValueError(f"不支持的导出格式: {extension}")
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) if sink is None else sink
+    WRITERS[extension](iter_batches(source, batch_rows, rows), output)
+    if sink is None:
+        output.seek(0)
+    return output
+
+
+# ---------- 成功报告 ----------
+
+def success_report_batches(sellers, grades, adoption, attribution, forecast, batch_rows=BATCH_ROWS):
+    """全量卖家成功报告，逐批组装（每批只构造 batch_rows 行）
+
+    所有输入与 sellers（Seller、Country、Category、Tier 列）按行对齐:
+    grades 为整体评分，adoption 为功能采用率，attribution 为 grow.attribution.attribute 的结果，
+    forecast 为 GrowthForecaster.run 的预测。
+    """
+    lifts = attribution[FEATURE_FLAGS].to_numpy()
+    columns = {
+        "卖家": sellers["Seller"].to_numpy(),
+        "国家": sellers["Country"].to_numpy(),
+        "类目": sellers["Category"].to_numpy(),
+        "层级": sellers["Tier"].to_numpy(),
+        "整体评分": np.asarray(grades, dtype=object),
+        "功能采用": np.asarray(adoption, dtype=np.float64),
+        "基准收入": attribution["基准收入"].to_numpy(),
+        "当前收入": attribution["当前收入"].to_numpy(),
+        "收入提升": attribution["收入提升"].to_numpy(),
+        "预测增长": forecast["预测增长"].to_numpy(),
+        "信心度": forecast["信心度"].to_numpy(),
+    }
+    for start in range(0, len(sellers), batch_rows):
+        chunk = {name: values[start:start + batch_rows] for name, values in columns.items()}
+        chunk["功能贡献"] = contributions(lifts[start:start + batch_rows])
+        yield pa.RecordBatch.from_pandas(pd.DataFrame(chunk), preserve_index=False)
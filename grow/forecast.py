@@ -0,0 +1,227 @@
+"""
+增长潜力预测
+
+每个卖家的周 GMV（由每日 GMV 矩阵按整周汇总，周数 × 卖家数）拟合对数线性趋势 + 年度季节项:
+log(周GMV) = a + b·t + Σ_k [c_k·sin(2πkt/52) + d_k·cos(2πkt/52)]
+所有卖家共用同一个设计矩阵，最小二乘解是一次矩阵乘法，不逐卖家拟合。
+预测增长 = 未来 13 周的预测 GMV / 最近 13 周的 GMV - 1，
+预测区间由残差方差和参数不确定性给出（90%），信心度 = 1 - 区间半宽 / 预测值。
+
+拟合按卖家分块交给进程池: 周 GMV 放在共享内存中，worker 按名字挂载后只读自己那一段列，
+不经过 pickle 复制输入。结果按卖家存入 ForecastCache，键为输入序列的指纹，
+再次运行时只重新拟合序列有变化的卖家。
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SEASON_WEEKS = 52
+HARMONICS = 2
+HORIZON_WEEKS = 13
+# 90% 预测区间
+INTERVAL_Z = 1.645
+FORECAST_COLUMNS = ["预测增长", "预测下限", "预测上限", "信心度"]
+# 模型或输出变化时加 1，旧缓存整体失效
+MODEL_VERSION = 1
+
+
+def weekly_from_daily(daily, chunk_size=50_000):
+    """每日 GMV (天数, 卖家数) → 周 GMV (周数, 卖家数)，从最后一天往前按整周汇总，丢弃最早不足一周的天"""
+    days, n = daily.shape
+    weeks = days // 7
+    weekly = np.empty((weeks, n), dtype=np.float32, order="F")
+    for start in range(0, n, chunk_size):
+        block = np.asarray(daily[days - weeks * 7:, start:start + chunk_size], dtype=np.float64)
+        weekly[:, start:start + chunk_size] = block.reshape(weeks, 7, -1).sum(axis=1)
+    return weekly
+
+
+def design(weeks, harmonics=HARMONICS):
+    """设计矩阵 (weeks, 2 + 2·harmonics): 常数、趋势（按年计）、年度正余弦项"""
+    t = np.arange(weeks)
+    columns = [np.ones(weeks), t / SEASON_WEEKS]
+    for k in range(1, harmonics + 1):
+        angle = 2 * np.pi * k * t / SEASON_WEEKS
+        columns += [np.sin(angle), np.cos(angle)]
+    return np.column_stack(columns)
+
+
+def fit_forecast(weekly, horizon=HORIZON_WEEKS):
+    """一批卖家的预测 (卖家数, 4)，列同 FORECAST_COLUMNS"""
+    weeks = weekly.shape[0]
+    y = np.log(np.maximum(np.asarray(weekly, dtype=np.float64), 1.0))
+    x = design(weeks)
+    xtx_inv = np.linalg.inv(x.T @ x)
+    beta = xtx_inv @ (x.T @ y)
+    sigma2 = ((y - x @ beta) ** 2).sum(axis=0) / (weeks - x.shape[1])
+
+    future_x = design(weeks + horizon)[weeks:]
+    future = np.exp(future_x @ beta + sigma2 / 2).sum(axis=0)
+    recent = np.maximum(np.asarray(weekly[-horizon:], dtype=np.float64).sum(axis=0), 1.0)
+    # 未来各周平均对数水平的标准差: 周波动按 horizon 周平均 + 参数不确定性
+    mean_x = future_x.mean(axis=0)
+    sd = np.sqrt(sigma2 * (1 / horizon + mean_x @ xtx_inv @ mean_x))
+    ratio = future / recent
+    lower, upper = ratio * np.exp(-INTERVAL_Z * sd), ratio * np.exp(INTERVAL_Z * sd)
+    confidence = np.clip(1 - (upper - lower) / (2 * ratio), 0, 1)
+    return np.column_stack([ratio - 1, lower - 1, upper - 1, confidence])
+
+
+def _multipliers(length):
+    return np.random.RandomState(length).randint(1, 2 ** 62, size=length, dtype=np.int64).astype(np.uint64) | 1
+
+
+def fingerprints(weekly, chunk_size=50_000):
+    """每个卖家输入序列的 64 位指纹（按位的乘加哈希，整块向量化计算）"""
+    weeks, n = weekly.shape
+    multipliers = _multipliers(weeks)[:, None]
+    result = np.empty(n, dtype=np.uint64)
+    for start in range(0, n, chunk_size):
+        bits = np.asarray(weekly[:, start:start + chunk_size], dtype=np.float32).view(np.uint32)
+        result[start:start + chunk_size] = (bits.astype(np.uint64) * multipliers).sum(axis=0, dtype=np.uint64)
+    return result ^ np.uint64(weeks)
+
+
+class ForecastCache:
+    """按卖家的预测结果缓存
+
+    每个卖家记录输入序列的指纹和预测结果；update 后版本号加 1，
+    指定 path 时保存为 .npz 文件（先写临时文件再替换），进程重启后继续使用。
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.version = 0
+        self.seller_ids = np.empty(0, dtype=np.int64)
+        self.fingerprints = np.empty(0, dtype=np.uint64)
+        self.results = np.empty((0, len(FORECAST_COLUMNS)))
+        if self.path is not None and self.path.exists():
+            with np.load(self.path) as saved:
+                if int(saved["model_version"]) == MODEL_VERSION:
+                    self.version = int(saved["version"])
+                    self.seller_ids = saved["seller_ids"]
+                    self.fingerprints = saved["fingerprints"]
+                    self.results = saved["results"]
+
+    def __len__(self):
+        return len(self.seller_ids)
+
+    def lookup(self, seller_ids, fingerprints):
+        """(结果, 命中) : 卖家在缓存中且指纹相同才算命中，未命中的结果为 NaN"""
+        seller_ids = np.asarray(seller_ids, dtype=np.int64)
+        results = np.full((len(seller_ids), len(FORECAST_COLUMNS)), np.nan)
+        if not len(self.seller_ids):
+            return results, np.zeros(len(seller_ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.seller_ids, seller_ids), len(self.seller_ids) - 1)
+        hit = (self.seller_ids[pos] == seller_ids) & (self.fingerprints[pos] == fingerprints)
+        results[hit] = self.results[pos[hit]]
+        return results, hit
+
+    def update(self, seller_ids, fingerprints, results):
+        seller_ids = np.asarray(seller_ids, dtype=np.int64)
+        keep = ~np.isin(self.seller_ids, seller_ids)
+        ids = np.concatenate([self.seller_ids[keep], seller_ids])
+        order = np.argsort(ids, kind="stable")
+        self.seller_ids = ids[order]
+        self.fingerprints = np.concatenate([self.fingerprints[keep], fingerprints])[order]
+        self.results = np.concatenate([self.results[keep], results])[order]
+        self.version += 1
+        if self.path is not None:
+            tmp_path = self.path.with_name(self.path.name + ".tmp.npz")
+            np.savez(tmp_path, model_version=MODEL_VERSION, version=self.version, seller_ids=self.seller_ids,
+                     fingerprints=self.fingerprints, results=self.results)
+            tmp_path.replace(self.path)
+
+
+def _fit_shared(name, shape, start, stop):
+    """进程池任务: 挂载共享内存中的周 GMV，拟合 [start, stop) 列"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        weekly = np.ndarray(shape, dtype=np.float32, buffer=shm.buf, order="F")
+        return start, fit_forecast(weekly[:, start:stop])
+    finally:
+        del weekly
+        shm.close()
+
+
+class GrowthForecaster:
+    """批量增长预测（进程内共享）
+
+    workers 为拟合进程数（默认 CPU 核数）；为 1 时在调用线程内拟合，不启动进程池。
+    """
+
+    def __init__(self, cache=None, workers=None, chunk_size=20_000):
+        self.cache = ForecastCache() if cache is None else cache
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def run(self, seller_ids, weekly):
+        """预测 weekly 各列卖家的增长，只重新拟合输入有变化的卖家
+
+        返回 {"forecast": DataFrame（FORECAST_COLUMNS，行与 seller_ids 对齐）,
+              "recomputed": 重新拟合的卖家数, "cached": 复用缓存的卖家数, "version": 缓存版本, "seconds": 耗时}
+        """
+        start = time.perf_counter()
+        seller_ids = np.asarray(seller_ids, dtype=np.int64)
+        prints = fingerprints(weekly)
+        results, hit = self.cache.lookup(seller_ids, prints)
+        stale = np.flatnonzero(~hit)
+        if len(stale):
+            results[stale] = self._fit(weekly, stale)
+            self.cache.update(seller_ids[stale], prints[stale], results[stale])
+        return {
+            "forecast": pd.DataFrame(results, columns=FORECAST_COLUMNS),
+            "recomputed": len(stale),
+            "cached": int(hit.sum()),
+            "version": self.cache.version,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _fit(self, weekly, columns):
+        if self.workers <= 1 or len(columns) <= self.chunk_size:
+            return self._fit_inline(weekly, columns)
+        shape = (weekly.shape[0], len(columns))
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 4, 1))
+        try:
+            shared = np.ndarray(shape, dtype=np.float32, buffer=shm.buf, order="F")
+            for start in range(0, len(columns), self.chunk_size):
+                shared[:, start:start + self.chunk_size] = weekly[:, columns[start:start + self.chunk_size]]
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            results = np.empty((len(columns), len(FORECAST_COLUMNS)))
+            futures = [self._executor.submit(_fit_shared, shm.name, shape, start, start + self.chunk_size)
+                       for start in range(0, len(columns), self.chunk_size)]
+            for future in futures:
+                start, part = future.result()
+                results[start:start + len(part)] = part
+            del shared
+            return results
+        except BrokenProcessPool:
+            # 进程池不可用时退回调用线程内拟合
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            return self._fit_inline(weekly, columns)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _fit_inline(self, weekly, columns):
+        results = np.empty((len(columns), len(FORECAST_COLUMNS)))
+        for start in range(0, len(columns), self.chunk_size):
+            part = columns[start:start + self.chunk_size]
+            results[start:start + len(part)] = fit_forecast(weekly[:, part])
+        return results
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
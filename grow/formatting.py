@@ -0,0 +1,85 @@
+"""
+显示格式化层
+
+表格数据统一以数值、类别、布尔类型保存（见 grow.schema），
+只在渲染时把当前可见的行转换为 “$2.5M”、“95%”、“✅ 已启用” 这样的显示文本。
+每个格式化函数接收一列（Series），返回同长度的字符串列；缺失值显示为 “N/A”。
+"""
+
+import pandas as pd
+
+MISSING = "N/A"
+
+
+def _apply(values, fn):
+    values = pd.Series(values)
+    result = pd.Series(MISSING, index=values.index, dtype=object)
+    present = values.notna()
+    result[present] = [fn(v) for v in values[present]]
+    return result
+
+
+def money(values):
+    """金额: $2.5M / $150K / $800"""
+    def fmt(v):
+        if abs(v) >= 1e6:
+            return f"${v / 1e6:.1f}M"
+        if abs(v) >= 1e3:
+            return f"${v / 1e3:.0f}K"
+        return f"${v:.0f}"
+    return _apply(values, fmt)
+
+
+def percent(values):
+    """比例 0.95 → 95%"""
+    return _apply(values, lambda v: f"{v * 100:.0f}%")
+
+
+def signed_percent(values):
+    """带符号的变化比例 0.25 → +25%"""
+    return _apply(values, lambda v: f"{v * 100:+.0f}%")
+
+
+def score(values):
+    """百分制评分 85 → 85/100"""
+    return _apply(values, lambda v: f"{v:.0f}/100")
+
+
+def multiple(values):
+    """倍数 3.2 → 3.2x"""
+    return _apply(values, lambda v: f"{v:.1f}x")
+
+
+def days(values):
+    """天数 18 → 18天"""
+    return _apply(values, lambda v: f"{v:.0f}天")
+
+
+def flag(values):
+    """功能开关 True → ✅ 已启用"""
+    return _apply(values, lambda v: "✅ 已启用" if v else "❌ 未启用")
+
+
+FORMATTERS = {
+    "money": money,
+    "percent": percent,
+    "signed_percent": signed_percent,
+    "score": score,
+    "multiple": multiple,
+    "days": days,
+    "flag": flag,
+}
+
+
+def format_frame(frame, formats):
+    """按 {列名: 格式名} 把 frame 中的列转换为显示文本，返回新的 DataFrame
+
+    只应对当前可见的行调用；未列出的列（文本、类别）原样保留。
+    """
+    if not formats:
+        return frame
+    frame = frame.copy()
+    for column, name in formats.items():
+        if column in frame.columns:
+            frame[column] = FORMATTERS[name](frame[column]).to_numpy()
+    return frame
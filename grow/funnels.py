@@ -0,0 +1,296 @@
+"""
+事件溯源的转化漏斗
+
+卖家在漏斗中的每次阶段变化是一条只追加的事件（卖家, 阶段, 时间, 国家, 优先级），
+漏斗数字全部由事件推导。事件写入时只更新常数个按 阶段 × 国家 × 优先级 × 天 的计数单元:
+- cohort: 按卖家进入漏斗的日期归档，用于漏斗形状、转化率和平均周期
+- activity: 按事件发生的日期归档，用于 “本月新签约” 这类时间段内的活动量
+- elapsed: 按进入日期归档的 “从进入漏斗到达到该阶段” 的天数之和
+单条事件用 np.add.at 只累加受影响的单元；大批事件用 bincount 一次累加整个立方体。
+查询任意日期范围、国家、优先级的切片时，在按天前缀和上相减，不重扫事件历史。
+前缀和在写入后的第一次查询时更新，只重算最早被修改的那一天之后的部分。
+
+卖家的国家和优先级以进入漏斗时为准；阶段只前进，重复或回退的事件记入日志但不计数。
+跳过中间阶段的事件视为同时达到被跳过的阶段。
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import COUNTRIES
+from grow.schema import PRIORITY
+
+PRIORITIES = list(PRIORITY.categories)
+
+RECRUITMENT_STAGES = ("潜在对象", "已联系", "谈判中", "已签约")
+ONBOARDING_STAGES = ("初次接触", "签约意向", "开始入驻", "完成入驻", "首次销售")
+
+EVENT_COLUMNS = ["卖家", "阶段", "时间", "国家", "优先级"]
+
+# 一批事件触及的单元数不到计数器单元总数的 1/ADD_AT_RATIO 时逐单元累加，否则用 bincount
+ADD_AT_RATIO = 16
+
+
+class FunnelTracker:
+    """一个漏斗的事件日志和增量计数器
+
+    start_day 为计数器的第一天，更早的事件会被拒绝。
+    """
+
+    def __init__(self, stages, start_day, countries=COUNTRIES, priorities=PRIORITIES):
+        self.stages = tuple(stages)
+        self.start_day = pd.Timestamp(start_day).normalize()
+        self.dims = {"Country": list(countries), "Priority": list(priorities)}
+        self._stage_codes = {s: i for i, s in enumerate(self.stages)}
+        self._codes = {name: {v: i for i, v in enumerate(values)} for name, values in self.dims.items()}
+        shape = (len(self.stages), len(countries), len(priorities), 0)
+        self.cohort = np.zeros(shape, dtype=np.int64)
+        self.activity = np.zeros(shape, dtype=np.int64)
+        self.elapsed = np.zeros(shape)
+        self.n_days = 0
+        # 只追加的事件日志（每次写入的一批为一段），可用 events() 取出重放
+        self.log = []
+        # record() 逐条写入、尚未合并成一段的事件
+        self._tail = []
+        # 卖家 → [当前阶段, 进入日期, 国家编码, 优先级编码, 进入时间（天）]
+        self._state = {}
+        # cohort、activity、elapsed 沿天的前缀和；前 _clean_days 天是最新的
+        self._prefix = tuple(np.zeros(shape, dtype=a.dtype) for a in (self.cohort, self.activity, self.elapsed))
+        self._clean_days = 0
+        self._lock = threading.Lock()
+
+    # ---------- 写入 ----------
+
+    def _grow(self, n_days):
+        capacity = self.cohort.shape[3]
+        if n_days <= capacity:
+            return
+        pad = [(0, 0)] * 3 + [(0, max(n_days, capacity * 2, 32) - capacity)]
+        self.cohort = np.pad(self.cohort, pad)
+        self.activity = np.pad(self.activity, pad)
+        self.elapsed = np.pad(self.elapsed, pad)
+        self._prefix = tuple(np.pad(prefix, pad) for prefix in self._prefix)
+
+    def _days(self, times):
+        """时间 → 距 start_day 的天数（浮点）"""
+        return (pd.to_datetime(times) - self.start_day) / pd.Timedelta(days=1)
+
+    def _advance(self, seller, stage, t, country, priority, reached):
+        """推进卖家的状态，把需要累加的计数单元追加到 reached"""
+        state = self._state.get(seller)
+        if state is None:
+            c, p = self._codes["Country"].get(country), self._codes["Priority"].get(priority)
+            if c is None or p is None:
+                raise ValueError(f"未知的国家或优先级: {country}, {priority}")
+            state = self._state[seller] = [-1, int(t), c, p, t]
+        previous, cohort, c, p, entered = state
+        for s in range(previous + 1, stage + 1):
+            reached.append((s, c, p, cohort, int(t), t - entered))
+        if stage > previous:
+            state[0] = stage
+
+    def _add(self, reached):
+        cells = np.array(reached)
+        s, c, p, cohort, day = (cells[:, i].astype(np.int64) for i in range(5))
+        self._grow(int(day.max()) + 1)
+        self.n_days = max(self.n_days, int(day.max()) + 1)
+        shape = self.cohort.shape
+        size = self.cohort.size
+        by_cohort = np.ravel_multi_index((s, c, p, cohort), shape)
+        by_day = np.ravel_multi_index((s, c, p, day), shape)
+        if len(cells) * ADD_AT_RATIO < size:
+            # 计数器是连续数组，ravel() 为视图，原地累加
+            np.add.at(self.cohort.ravel(), by_cohort, 1)
+            np.add.at(self.elapsed.ravel(), by_cohort, cells[:, 5])
+            np.add.at(self.activity.ravel(), by_day, 1)
+        else:
+            self.cohort += np.bincount(by_cohort, minlength=size).reshape(shape)
+            self.elapsed += np.bincount(by_cohort, weights=cells[:, 5], minlength=size).reshape(shape)
+            self.activity += np.bincount(by_day, minlength=size).reshape(shape)
+        # 进入日期不晚于事件日期，从最早的进入日期起前缀和需要重算
+        self._clean_days = min(self._clean_days, int(cohort.min()))
+
+    def record(self, seller, stage, time, country=None, priority=None):
+        """追加一条阶段变化事件；卖家第一次出现时需要 country 和 priority
+
+        不构造 DataFrame，只累加这条事件涉及的常数个计数单元。
+        """
+        code = self._stage_codes.get(stage)
+        if code is None:
+            raise ValueError(f"未知的阶段: { {stage} }")
+        t = float(self._days(pd.Timestamp(time)))
+        if t < 0:
+            raise ValueError(f"事件早于计数器起始日 {self.start_day.date()}")
+        with self._lock:
+            reached = []
+            self._advance(seller, code, t, country, priority, reached)
+            if reached:
+                self._add(reached)
+            self._tail.append((seller, stage, time, country, priority))
+
+    def record_many(self, events):
+        """按时间顺序追加一批事件（EVENT_COLUMNS 列），返回条数"""
+        stages = events["阶段"].map(self._stage_codes).to_numpy()
+        if pd.isna(stages).any():
+            raise ValueError(f"未知的阶段: {set(events['阶段'][pd.isna(stages)])}")
+        days = self._days(events["时间"]).to_numpy(dtype=np.float64)
+        if len(days) and days.min() < 0:
+            raise ValueError(f"事件早于计数器起始日 {self.start_day.date()}")
+        sellers, countries, priorities = (events[c].tolist() for c in ("卖家", "国家", "优先级"))
+        with self._lock:
+            # 逐条推进卖家状态（每条事件常数次操作），计数单元的累加按批一次完成
+            reached = []
+            processed = 0
+            try:
+                for seller, stage, t, country, priority in zip(
+                    sellers, stages.astype(np.int64).tolist(), days.tolist(), countries, priorities
+                ):
+                    self._advance(seller, stage, t, country, priority, reached)
+                    processed += 1
+            finally:
+                # 出错时已处理的事件照常生效，计数器与日志保持一致
+                if reached:
+                    self._add(reached)
+                if processed:
+                    self._flush_tail()
+                    self.log.append(events[EVENT_COLUMNS].iloc[:processed].reset_index(drop=True))
+        return processed
+
+    def _flush_tail(self):
+        """把逐条写入的事件合并为日志中的一段；调用方持有 self._lock"""
+        if self._tail:
+            self.log.append(pd.DataFrame(self._tail, columns=EVENT_COLUMNS))
+            self._tail = []
+
+    def events(self):
+        """事件日志的 DataFrame 副本"""
+        with self._lock:
+            self._flush_tail()
+            if not self.log:
+                return pd.DataFrame(columns=EVENT_COLUMNS)
+            return pd.concat(self.log, ignore_index=True)
+
+    # ---------- 查询 ----------
+
+    def _prefix_sums(self):
+        """按天前缀和，只重算 _clean_days 之后的部分；调用方持有 self._lock"""
+        first, n = self._clean_days, self.n_days
+        if first < n:
+            for array, prefix in zip((self.cohort, self.activity, self.elapsed), self._prefix):
+                np.cumsum(array[..., first:n], axis=3, out=prefix[..., first:n])
+                if first:
+                    prefix[..., first:n] += prefix[..., first - 1:first]
+            self._clean_days = n
+        return self._prefix
+
+    def _window(self, which, start, end, countries, priorities):
+        """日期在 [start, end] 内（含两端，None 为不限）的计数，按阶段返回"""
+        first = 0 if start is None else max(int(self._days(start) // 1), 0)
+        last = self.n_days - 1 if end is None else min(int(self._days(end) // 1), self.n_days - 1)
+        if last < first:
+            return np.zeros(len(self.stages))
+        with self._lock:
+            prefix = self._prefix_sums()[which]
+            block = prefix[..., last] - (prefix[..., first - 1] if first else 0)
+        for axis, (name, values) in enumerate(zip(self.dims, (countries, priorities)), start=1):
+            if values is not None:
+                codes = [self._codes[name][v] for v in values if v in self._codes[name]]
+                block = np.take(block, codes, axis=axis)
+        return block.sum(axis=(1, 2))
+
+    def counts(self, start=None, end=None, countries=None, priorities=None, by="cohort"):
+        """各阶段人数
+
+        by="cohort" 时统计在 [start, end] 内进入漏斗的卖家达到各阶段的人数；
+        by="activity" 时统计在 [start, end] 内达到各阶段的人数（不论何时进入漏斗）。
+        """
+        which = {"cohort": 0, "activity": 1}[by]
+        return self._window(which, start, end, countries, priorities).astype(np.int64)
+
+    def average_days(self, stage=-1, start=None, end=None, countries=None, priorities=None):
+        """在 [start, end] 内进入漏斗、已达到 stage 的卖家，从进入到达到该阶段的平均天数"""
+        stage = self._stage_codes.get(stage, stage)
+        reached = self._window(0, start, end, countries, priorities)[stage]
+        total = self._window(2, start, end, countries, priorities)[stage]
+        return total / reached if reached else float("nan")
+
+    def conversion(self, start=None, end=None, countries=None, priorities=None, from_stage=0, to_stage=-1):
+        """cohort 中从 from_stage 到 to_stage 的转化率"""
+        counts = self.counts(start, end, countries, priorities)
+        from_stage = self._stage_codes.get(from_stage, from_stage)
+        to_stage = self._stage_codes.get(to_stage, to_stage)
+        return counts[to_stage] / counts[from_stage] if counts[from_stage] else float("nan")
+
+    def priority_table(self, start=None, end=None, countries=None):
+        """按优先级的 数量、签约率（到达最后阶段的比例）、平均周期（PRIORITY_DIST 的列）"""
+        rows = {"优先级": [], "数量": [], "签约率": [], "平均周期": []}
+        for priority in self.dims["Priority"]:
+            counts = self.counts(start, end, countries, [priority])
+            rows["优先级"].append(priority)
+            rows["数量"].append(int(counts[0]))
+            rows["签约率"].append(counts[-1] / counts[0] if counts[0] else float("nan"))
+            rows["平均周期"].append(self.average_days(-1, start, end, countries, [priority]))
+        return rows
+
+
+def replay(events, stages, start_day, **kwargs):
+    """由事件日志重建计数器"""
+    tracker = FunnelTracker(stages, start_day, **kwargs)
+    tracker.record_many(events.sort_values("时间", kind="stable"))
+    return tracker
+
+
+# ---------- 模拟数据 ----------
+
+# 各优先级从每个阶段进入下一阶段的比例，以及平均停留天数
+RECRUITMENT_ADVANCE = {"P0": (0.85, 0.60, 0.63), "P1": (0.70, 0.45, 0.57), "P2": (0.55, 0.30, 0.48)}
+RECRUITMENT_DWELL = {"P0": (2, 4, 6), "P1": (3, 6, 9), "P2": (4, 9, 15)}
+ONBOARDING_ADVANCE = {p: (0.75, 0.80, 0.75, 0.84) for p in PRIORITIES}
+ONBOARDING_DWELL = {p: (2, 3, 7, 5) for p in PRIORITIES}
+
+
+def generate_mock_transitions(sellers, countries, priorities, stages, advance, dwell, end, days=180, seed=3):
+    """模拟卖家在漏斗中的阶段变化事件（按时间排序）
+
+    卖家在 end 之前 days 天内均匀进入漏斗，按优先级的比例逐阶段推进，
+    停留时间服从指数分布；晚于 end 的事件不生成。
+    """
+    rng = np.random.RandomState(seed)
+    end = pd.Timestamp(end)
+    sellers = np.asarray(sellers, dtype=object)
+    countries = np.asarray(countries, dtype=object)
+    priorities = np.asarray(priorities, dtype=object)
+    n = len(sellers)
+    t = rng.uniform(-days, 0, n)
+    alive = np.ones(n, dtype=bool)
+    frames = []
+    for stage_index, stage in enumerate(stages):
+        if stage_index:
+            rate = np.array([advance[p][stage_index - 1] for p in priorities])
+            mean = np.array([dwell[p][stage_index - 1] for p in priorities], dtype=np.float64)
+            t = t + rng.exponential(mean)
+            alive &= (rng.random_sample(n) < rate) & (t <= 0)
+        rows = np.flatnonzero(alive)
+        frames.append(pd.DataFrame({
+            "卖家": sellers[rows], "阶段": stage, "时间": end + pd.to_timedelta(t[rows], unit="D"),
+            "国家": countries[rows], "优先级": priorities[rows],
+        }))
+    return pd.concat(frames, ignore_index=True).sort_values("时间", kind="stable", ignore_index=True)
+
+
+def build_mock_funnels(prospects, end=None, days=180):
+    """由潜在卖家池（卖家, 目标市场, 优先级）生成招募和入驻漏斗"""
+    end = pd.Timestamp.now() if end is None else pd.Timestamp(end)
+    start = end.normalize() - pd.Timedelta(days=days)
+    args = (prospects["卖家"], prospects["目标市场"].astype(str), prospects["优先级"].astype(str))
+    recruitment = FunnelTracker(RECRUITMENT_STAGES, start)
+    recruitment.record_many(generate_mock_transitions(
+        *args, RECRUITMENT_STAGES, RECRUITMENT_ADVANCE, RECRUITMENT_DWELL, end, days, seed=3,
+    ))
+    onboarding = FunnelTracker(ONBOARDING_STAGES, start)
+    onboarding.record_many(generate_mock_transitions(
+        *args, ONBOARDING_STAGES, ONBOARDING_ADVANCE, ONBOARDING_DWELL, end, days, seed=4,
+    ))
+    return recruitment, onboarding
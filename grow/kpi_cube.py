@@ -0,0 +1,275 @@
+"""
+ICQ 指标聚合立方体
+
+按 Country × Tier × Category × 周 预先聚合各项指标的和与计数，
+并沿周维度维护前缀和。WoW 变化和 YTD 完成率都只是立方体上的切片查找，
+不再扫描卖家级别的明细数据。新一周的数据到达时只累加该周的切片。
+
+周目标是全部国家的合计；只选部分国家时，计数类目标按所选国家的活跃卖家数占比分摊，
+比率类目标不变。
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import CATEGORIES, COUNTRIES, TIERS
+
+# 立方体中存储的可加度量（周事实表列名 → 度量名）
+MEASURES = ["launched", "fba_adopted", "fba_ba", "gms", "ads_sellers", "active_sellers"]
+_FACT_COLUMNS = {
+    "launched": "Launched",
+    "fba_adopted": "FBA_Adopted",
+    "fba_ba": "FBA_BA",
+    "gms": "GMS",
+    "ads_sellers": "Ads_Active",
+}
+
+# 仪表板上的五个 ICQ 指标: (名称, 分子度量, 分母度量)
+ICQ_METRICS = [
+    ("Launched Sellers", "launched", None),
+    ("FBA Adopted Sellers", "fba_adopted", None),
+    ("FBA BA Count", "fba_ba", None),
+    ("GMS", "gms", None),
+    ("Ads Adoption Rate", "ads_sellers", "active_sellers"),
+]
+
+# 全部国家合计的周目标；YTD 目标按年初至今的周数折算（比率类指标不折算）
+WEEKLY_TARGETS = {
+    "Launched Sellers": 50,
+    "FBA Adopted Sellers": 30,
+    "FBA BA Count": 12,
+    "GMS": 3_000_000,
+    "Ads Adoption Rate": 0.70,
+}
+# YTD 进度表: (名称, 分子度量, 分母度量, 对应的周目标)
+_YTD_METRICS = [
+    ("Launched Sellers", "launched", None, "Launched Sellers"),
+    ("FBA Adopted", "fba_adopted", None, "FBA Adopted Sellers"),
+    ("FBA BA", "fba_ba", None, "FBA BA Count"),
+    ("GMS", "gms", None, "GMS"),
+    ("Ads Adoption", "ads_sellers", "active_sellers", "Ads Adoption Rate"),
+]
+
+_WEEK = pd.Timedelta(weeks=1)
+
+
+class KPICube:
+    """按周增量累加的多维聚合立方体
+
+    cells[country, tier, category, week, measure] 存储该周的和/计数，
+    prefix[..., w, :] 为第 0 周到第 w 周的累计值。
+    """
+
+    def __init__(self, start_week, countries=COUNTRIES, tiers=TIERS, categories=CATEGORIES):
+        self.start_week = pd.Timestamp(start_week).normalize()
+        self.dims = {"Country": list(countries), "Tier": list(tiers), "Category": list(categories)}
+        self._codes = {name: {v: i for i, v in enumerate(values)} for name, values in self.dims.items()}
+        shape = (len(countries), len(tiers), len(categories), 0, len(MEASURES))
+        self.cells = np.zeros(shape)
+        self.prefix = np.zeros(shape)
+        self.n_weeks = 0
+        self._lock = threading.Lock()
+
+    # ---------- 写入 ----------
+
+    def week_index(self, week):
+        offset = pd.Timestamp(week).normalize() - self.start_week
+        if offset.days % 7:
+            raise ValueError(f"周起始日期必须与 {self.start_week.date()} 对齐: {week}")
+        return offset.days // 7
+
+    def _grow(self, n_weeks):
+        capacity = self.cells.shape[3]
+        if n_weeks <= capacity:
+            return
+        new_capacity = max(n_weeks, capacity * 2, 8)
+        pad = [(0, 0)] * 5
+        pad[3] = (0, new_capacity - capacity)
+        self.cells = np.pad(self.cells, pad)
+        self.prefix = np.pad(self.prefix, pad)
+
+    def ingest(self, week, facts):
+        """累加一周的卖家级事实数据
+
+        facts 需包含 Country, Tier, Category 和周事实列
+        （Launched, FBA_Adopted, FBA_BA, GMS, Ads_Active）。同一周可多次追加。
+        """
+        w = self.week_index(week)
+        if w < 0:
+            raise ValueError(f"周 {week} 早于立方体起始周 {self.start_week.date()}")
+
+        coords = [facts[name].map(self._codes[name]) for name in self.dims]
+        known = np.logical_and.reduce([c.notna().to_numpy() for c in coords])
+        coords = [c.to_numpy()[known].astype(np.int64) for c in coords]
+
+        values = np.empty((int(known.sum()), len(MEASURES)))
+        for m, measure in enumerate(MEASURES):
+            if measure == "active_sellers":
+                values[:, m] = 1.0
+            else:
+                values[:, m] = facts[_FACT_COLUMNS[measure]].to_numpy(dtype=np.float64)[known]
+
+        slab = np.zeros(self.cells.shape[:3] + (len(MEASURES),))
+        np.add.at(slab, tuple(coords), values)
+
+        with self._lock:
+            self._grow(w + 1)
+            self.cells[:, :, :, w, :] += slab
+            # 只重算受影响周之后的前缀和；通常 w 就是最新一周
+            if w >= self.n_weeks:
+                previous = self.prefix[:, :, :, self.n_weeks - 1, :] if self.n_weeks else 0.0
+                for gap in range(self.n_weeks, w):
+                    self.prefix[:, :, :, gap, :] = previous
+                self.prefix[:, :, :, w, :] = (self.prefix[:, :, :, w - 1, :] if w else 0.0) + self.cells[:, :, :, w, :]
+                self.n_weeks = w + 1
+            else:
+                self.prefix[:, :, :, w:self.n_weeks, :] += slab[:, :, :, None, :]
+        return w
+
+    # ---------- 查询 ----------
+
+    def _selector(self, countries=None, tiers=None, categories=None):
+        selected = []
+        for name, values in zip(self.dims, (countries, tiers, categories)):
+            if values is None:
+                selected.append(slice(None))
+            else:
+                selected.append([self._codes[name][v] for v in values if v in self._codes[name]])
+        return selected
+
+    def _reduce(self, array, week_index, selector):
+        if week_index < 0:
+            return np.zeros(len(MEASURES))
+        block = array[:, :, :, week_index, :]
+        for axis, sel in enumerate(selector):
+            block = block[(slice(None),) * axis + (sel,)]
+        return block.sum(axis=(0, 1, 2))
+
+    @property
+    def latest_week(self):
+        return self.start_week + (self.n_weeks - 1) * _WEEK if self.n_weeks else None
+
+    def week_totals(self, week=None, **filters):
+        """某一周的各度量合计（默认最新一周）"""
+        w = self.n_weeks - 1 if week is None else self.week_index(week)
+        with self._lock:
+            return dict(zip(MEASURES, self._reduce(self.cells, w, self._selector(**filters))))
+
+    def _days_from_start(self, date):
+        return (pd.Timestamp(date).normalize() - self.start_week).days
+
+    def range_totals(self, start, end, **filters):
+        """周起始日落在 [start, end] 内的各度量合计，用前缀和相减得到"""
+        first = max(-(-self._days_from_start(start) // 7), 0)
+        last = min(self._days_from_start(end) // 7, self.n_weeks - 1)
+        if last < first:
+            return dict.fromkeys(MEASURES, 0.0)
+        selector = self._selector(**filters)
+        with self._lock:
+            totals = self._reduce(self.prefix, last, selector) - self._reduce(self.prefix, first - 1, selector)
+        return dict(zip(MEASURES, totals))
+
+    def ytd_weeks(self):
+        """最新一周所在年份中，年初至今的 (起始日期, 周数)"""
+        latest = self.latest_week
+        year_start = pd.Timestamp(year=latest.year, month=1, day=1)
+        first = max(-(-self._days_from_start(year_start) // 7), 0)
+        return year_start, self.n_weeks - first
+
+    def ytd_totals(self, **filters):
+        """最新一周所在年份的年初至今合计"""
+        if not self.n_weeks:
+            return dict.fromkeys(MEASURES, 0.0)
+        year_start, _ = self.ytd_weeks()
+        return self.range_totals(year_start, self.latest_week, **filters)
+
+
+def _metric_value(totals, numerator, denominator):
+    if denominator is None:
+        return totals[numerator]
+    return totals[numerator] / totals[denominator] if totals[denominator] else 0.0
+
+
+def target_share(cube, countries=None):
+    """所选国家分摊的目标比例: 所选国家的活跃卖家数（全部周累计）占全部国家的比例"""
+    if countries is None or set(cube.dims["Country"]) <= set(countries) or not cube.n_weeks:
+        return 1.0
+    first, last = cube.start_week, cube.latest_week
+    total = cube.range_totals(first, last)["active_sellers"]
+    return cube.range_totals(first, last, countries=countries)["active_sellers"] / total if total else 0.0
+
+
+def _target(name, denominator, share):
+    return WEEKLY_TARGETS[name] * (1 if denominator else share)
+
+
+def build_cube(weekly_facts):
+    """从 (周, 事实表) 序列构建立方体"""
+    cube = None
+    for week, facts in weekly_facts:
+        if cube is None:
+            cube = KPICube(week)
+        cube.ingest(week, facts)
+    return cube
+
+
+# ---------- 展示 ----------
+
+_RATE_METRICS = {"Ads Adoption Rate", "Ads Adoption"}
+
+
+def _format_value(name, value, signed=False):
+    sign = ("+" if value >= 0 else "-") if signed else ("-" if value < 0 else "")
+    magnitude = abs(value)
+    if name == "GMS":
+        return f"{sign}${magnitude / 1e6:.1f}M"
+    if name in _RATE_METRICS:
+        return f"{sign}{magnitude * 100:.0f}%"
+    return f"{sign}{magnitude:.0f}"
+
+
+def icq_metrics(cube, countries=None):
+    """五个 ICQ 指标: 本周值、WoW 变化和目标缺口，返回展示用字典列表"""
+    current = cube.week_totals(countries=countries)
+    previous = cube.week_totals(cube.latest_week - _WEEK, countries=countries) if cube.n_weeks > 1 \
+        else dict.fromkeys(MEASURES, 0.0)
+    share = target_share(cube, countries)
+    label = "目标" if share == 1.0 else "所选国家目标"
+    metrics = []
+    for name, numerator, denominator in ICQ_METRICS:
+        value = _metric_value(current, numerator, denominator)
+        delta = value - _metric_value(previous, numerator, denominator)
+        target = _target(name, denominator, share)
+        gap = value - target
+        metrics.append({
+            "label": name,
+            "value": _format_value(name, value),
+            "delta": f"{_format_value(name, delta, signed=True)} WoW",
+            "caption": f"{label}: {_format_value(name, target)} "
+                       f"({'超额' if gap >= 0 else '缺口'}: {_format_value(name, gap, signed=True)})",
+            "gap": _format_value(name, gap, signed=True),
+            "gap_ratio": gap / target if target else 0.0,
+        })
+    return metrics
+
+
+def ytd_progress_table(cube, countries=None):
+    """YTD 目标进度表（所选国家的目标按 target_share 分摊）"""
+    totals = cube.ytd_totals(countries=countries)
+    _, n_weeks = cube.ytd_weeks() if cube.n_weeks else (None, 0)
+    share = target_share(cube, countries)
+    rows = []
+    for name, numerator, denominator, weekly_target in _YTD_METRICS:
+        actual = _metric_value(totals, numerator, denominator)
+        target = _target(weekly_target, denominator, share) * (1 if denominator else n_weeks)
+        completion = actual / target if target else 0.0
+        rows.append({
+            "指标": name,
+            "YTD实际": _format_value(name, actual),
+            "YTD目标": _format_value(name, target),
+            "完成率": f"{completion * 100:.0f}%",
+            "状态": "🟢 超额完成" if completion >= 1 else "🔴 需努力",
+        })
+    return pd.DataFrame(rows)
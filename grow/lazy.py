@@ -0,0 +1,22 @@
+"""
+延迟导入
+
+LazyModule(name) 是模块的代理: 创建时不导入，第一次访问属性时才导入模块。
+页面脚本用它引用 pandas 和各计算模块，导入 grow_ai_assistant 时不加载这些库，
+某个标签页第一次渲染时才加载它用到的模块。
+导入经过 importlib（有导入锁），多个会话线程和后台线程同时访问也只导入一次；
+导入完成后每次访问只是一次 sys.modules 查找。
+"""
+
+import importlib
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
@@ -0,0 +1,199 @@
+"""
+跨市场潜在卖家匹配引擎
+
+把每个潜在卖家（prospect）表示为特征向量:
+类目 one-hot、现有市场 GMS 分位、品牌层级，
+与目标市场中成功卖家（AI_Growth_Score 排名靠前的卖家）的画像比较，得到跨市场匹配度。
+
+成功卖家按目标市场量化成码本: 相同 (类目, GMS 分位档, 层级) 的卖家合并为一个向量并记录人数，
+每个市场最多 类目数 × GMS 档数 × 层级数 个向量，与卖家总数无关。
+匹配度 = 与最相近的一部分（默认 10%）成功卖家的平均余弦相似度，
+近邻数量按比例取，卖家规模变化时匹配度的分布保持稳定；
+对一批潜在卖家只需一次矩阵乘法和一次按行排序（近似最近邻: 在量化向量上精确计算）。
+"""
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import COUNTRIES
+from grow.schema import BRAND, PRIORITY, POTENTIAL, CATEGORY
+
+# 特征权重: 类目最重要，其次是规模和品牌
+FEATURE_WEIGHTS = {"category": 1.0, "gms": 0.6, "brand": 0.4}
+GMS_BINS = 10
+# 卖家层级 → 品牌强度（与 BRAND 的 领先/区域/新兴 对齐到 [0, 1]）
+TIER_STRENGTH = {"T0": 1.0, "T1": 0.75, "T2": 0.5, "T3": 0.0}
+BRAND_STRENGTH = {"领先品牌": 1.0, "区域品牌": 0.5, "新兴品牌": 0.0}
+
+# 优先级按目标市场内的匹配度排名: 前 10% 为 P0，前 40% 为 P1，其余 P2
+PRIORITY_SHARES = (0.1, 0.4)
+# 现有市场 GMS → 业务潜力
+POTENTIAL_THRESHOLDS = (2.0e6, 1.0e6, 3.0e5)
+
+_NAMED_PROSPECTS = [
+    ("TechCorp_VN", "VN", "Electronics", 2.5e6, "领先品牌"),
+    ("FashionPlus_TH", "TH", "Fashion", 1.8e6, "区域品牌"),
+    ("HomeStyle_MY", "MY", "Home", 1.2e6, "新兴品牌"),
+    ("BeautyMax_SG", "SG", "Beauty", 2.1e6, "领先品牌"),
+]
+
+
+def generate_mock_prospects(n=20000, seed=11):
+    """生成模拟的跨市场潜在卖家池
+
+    前4个为演示用的固定潜在卖家，目标市场为其现有市场以外的国家。
+    """
+    rng = np.random.RandomState(seed)
+    n_named = min(n, len(_NAMED_PROSPECTS))
+    n_extra = n - n_named
+    named = _NAMED_PROSPECTS[:n_named]
+
+    home = np.array([p[1] for p in named] + list(rng.choice(COUNTRIES, n_extra)), dtype=object)
+    # 目标市场: 在现有市场之外随机选一个
+    offset = rng.randint(1, len(COUNTRIES), n)
+    home_idx = pd.Index(COUNTRIES).get_indexer(home)
+    target = np.asarray(COUNTRIES, dtype=object)[(home_idx + offset) % len(COUNTRIES)]
+
+    return pd.DataFrame({
+        "卖家": [p[0] for p in named] + [f"Prospect{i:06d}_{c}" for i, c in zip(range(n_named, n), home[n_named:])],
+        "现有市场": pd.Categorical(home, categories=COUNTRIES),
+        "目标市场": pd.Categorical(target, categories=COUNTRIES),
+        "类目": pd.Categorical(
+            [p[2] for p in named] + list(rng.choice(CATEGORY.categories, n_extra)), dtype=CATEGORY
+        ),
+        "现有市场GMS": np.concatenate([
+            [p[3] for p in named], np.round(rng.lognormal(13.5, 1.0, n_extra), -3),
+        ]),
+        "品牌地位": pd.Categorical(
+            [p[4] for p in named] + list(rng.choice(BRAND.categories, n_extra, p=[0.2, 0.4, 0.4])),
+            dtype=BRAND,
+        ),
+    })
+
+
+def _percentile(values):
+    """数组中每个值的分位 (0, 1]"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values, kind="stable")] = np.arange(1, len(values) + 1)
+    return ranks / len(values)
+
+
+def _gms_bin(percentile):
+    return np.minimum((percentile * GMS_BINS).astype(np.int64), GMS_BINS - 1)
+
+
+def feature_matrix(category_codes, gms_bin, strength):
+    """由类目编码、GMS 分位档、品牌强度组成的单位化特征矩阵（float32）"""
+    n = len(category_codes)
+    n_categories = len(CATEGORY.categories)
+    features = np.zeros((n, n_categories + 2), dtype=np.float32)
+    valid = category_codes >= 0
+    features[np.flatnonzero(valid), category_codes[valid]] = FEATURE_WEIGHTS["category"]
+    features[:, n_categories] = FEATURE_WEIGHTS["gms"] * (np.asarray(gms_bin) + 0.5) / GMS_BINS
+    features[:, n_categories + 1] = FEATURE_WEIGHTS["brand"] * np.asarray(strength, dtype=np.float32)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-12)
+
+
+class ProspectMatcher:
+    """按目标市场的成功卖家画像为潜在卖家打分
+
+    seller_data / ai_analysis 为行对齐的卖家表（ai_analysis 需要 AI_Growth_Score）。
+    success_quantile 以上的卖家视为成功卖家；
+    neighbours 为参与平均的最近邻占该市场成功卖家的比例。
+    """
+
+    def __init__(self, seller_data, ai_analysis, success_quantile=0.8, neighbours=0.1):
+        self.neighbours = neighbours
+        score = ai_analysis["AI_Growth_Score"].to_numpy(dtype=np.float64)
+        success = score >= np.quantile(score, success_quantile) if len(score) else np.zeros(0, bool)
+
+        category = pd.Categorical(seller_data["Category"].to_numpy()[success], dtype=CATEGORY).codes
+        gms_bin = _gms_bin(_percentile(seller_data["GMV"].to_numpy()))[success]
+        strength = seller_data["Tier"].map(TIER_STRENGTH).fillna(0.0).to_numpy()[success]
+        countries = seller_data["Country"].to_numpy()[success]
+
+        # 每个市场: 去重后的量化向量和对应的成功卖家人数
+        self.codebooks = {}
+        for country in np.unique(countries.astype(str)):
+            mask = countries == country
+            keys = pd.DataFrame({"c": category[mask], "g": gms_bin[mask], "s": strength[mask]})
+            counts = keys.value_counts(sort=False).reset_index(name="n")
+            vectors = feature_matrix(counts["c"].to_numpy(), counts["g"].to_numpy(), counts["s"].to_numpy())
+            self.codebooks[country] = (vectors, counts["n"].to_numpy(dtype=np.float32))
+
+    def _knn_fit(self, features, codebook):
+        vectors, counts = codebook
+        k = max(1, int(round(self.neighbours * counts.sum())))
+        sims = features @ vectors.T
+        order = np.argsort(-sims, axis=1)
+        sims = np.take_along_axis(sims, order, axis=1)
+        weights = counts[order]
+        # 按相似度从高到低累计人数，只取最相近的 k 个卖家
+        before = np.cumsum(weights, axis=1) - weights
+        taken = np.clip(k - before, 0.0, weights)
+        return (sims * taken).sum(axis=1) / np.maximum(taken.sum(axis=1), 1.0)
+
+    def score(self, prospects, batch_size=65536):
+        """返回每个潜在卖家在其目标市场的匹配度 (0-1)"""
+        n = len(prospects)
+        fit = np.zeros(n, dtype=np.float64)
+        category = pd.Categorical(prospects["类目"], dtype=CATEGORY).codes
+        gms_bin = _gms_bin(_percentile(prospects["现有市场GMS"]))
+        strength = prospects["品牌地位"].map(BRAND_STRENGTH).astype(float).fillna(0.0).to_numpy()
+        features = feature_matrix(category, gms_bin, strength)
+        target = prospects["目标市场"].astype(str).to_numpy()
+
+        for country, codebook in self.codebooks.items():
+            rows = np.flatnonzero(target == country)
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                fit[chunk] = self._knn_fit(features[chunk], codebook)
+        return fit
+
+    def match(self, prospects):
+        """在潜在卖家表上加入 跨市场匹配度、优先级、业务潜力 列（返回新表）"""
+        fit = self.score(prospects)
+        gms = prospects["现有市场GMS"].to_numpy(dtype=np.float64)
+        share = pd.Series(fit).groupby(prospects["目标市场"].to_numpy()).rank(
+            ascending=False, pct=True, method="max"
+        ).to_numpy()
+        p0, p1 = PRIORITY_SHARES
+        very_high, strong, medium = POTENTIAL_THRESHOLDS
+        result = prospects.copy()
+        result["跨市场匹配度"] = fit
+        result["优先级"] = pd.Categorical(
+            np.select([share <= p0, share <= p1], ["P0", "P1"], "P2"), dtype=PRIORITY
+        )
+        result["业务潜力"] = pd.Categorical(
+            np.select([gms >= very_high, gms >= strong, gms >= medium], ["Very High", "High", "Medium"], "Low"),
+            dtype=POTENTIAL,
+        )
+        return result
+
+
+class MatchIndex:
+    """已打分的潜在卖家池，按目标市场查询 Top-N
+
+    构建时对每个市场按匹配度（相同时现有市场 GMS 高者优先）排好序，查询只是切片。
+    """
+
+    def __init__(self, matched):
+        self.matched = matched.reset_index(drop=True)
+        fit = np.round(self.matched["跨市场匹配度"].to_numpy(dtype=np.float64), 6)
+        gms = self.matched["现有市场GMS"].to_numpy(dtype=np.float64)
+        order = np.lexsort((-gms, -fit))
+        target = self.matched["目标市场"].astype(str).to_numpy()[order]
+        self.markets = {c: order[target == c] for c in np.unique(target)}
+
+    def top(self, market, n=10):
+        rows = self.markets.get(market)
+        if rows is None:
+            return self.matched.iloc[:0]
+        return self.matched.iloc[rows[:n]]
+
+    def top_per_market(self, n=10, markets=None):
+        return {m: self.top(m, n) for m in (markets if markets is not None else self.markets)}
@@ -0,0 +1,247 @@
+"""
+入驻里程碑跟踪和瓶颈识别
+
+所有入驻中卖家的里程碑状态（账户设置、KYC验证、产品Listing、首次发货）
+压缩在一个 uint8 数组里: 每个里程碑占 2 位（待开始 / 进行中 / 待处理 / 完成），每个卖家 1 字节。
+各里程碑的开始、完成时间为 float32 的 (卖家数, 4) 数组（距 base 的天数，未发生为 NaN）。
+
+整体进度、停留天数和 SLA 超时判断都是对整个数组的 NumPy 运算，没有逐卖家的循环:
+进行中或待处理的里程碑停留超过 MILESTONE_SLA_DAYS 即视为卡住，
+每个卡住的卖家取超时最严重的里程碑生成干预行动（INTERVENTION_ACTIONS 的列）。
+"""
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import COUNTRIES
+from grow.schema import MILESTONE, MILESTONE_STEPS
+
+# 状态编码，与 schema.MILESTONE 的类别一一对应
+DONE, IN_PROGRESS, BLOCKED, NOT_STARTED = range(4)
+
+# 各里程碑的 SLA（进行中或待处理的最长天数）
+MILESTONE_SLA_DAYS = np.array([2, 3, 5, 7], dtype=np.float32)
+
+_SHIFTS = np.arange(len(MILESTONE_STEPS), dtype=np.uint8) * 2
+
+# (里程碑, 状态) → (识别问题, 推荐行动, 预期解决天数)，只有进行中和待处理会卡住
+INTERVENTIONS = {
+    (0, IN_PROGRESS): ("账户设置未完成", "发送账户设置指引", 1),
+    (0, BLOCKED): ("账户信息待补充", "协助补充账户信息", 1),
+    (1, IN_PROGRESS): ("KYC审核超时", "跟进KYC审核进度", 2),
+    (1, BLOCKED): ("KYC文档缺失", "联系协助KYC", 2),
+    (2, IN_PROGRESS): ("Listing进度缓慢", "提供Listing模板", 2),
+    (2, BLOCKED): ("Listing质量", "提供图片指导", 1),
+    (3, IN_PROGRESS): ("首次发货延迟", "协助安排FBA入仓", 3),
+    (3, BLOCKED): ("发货计划待确认", "确认发货计划", 2),
+}
+
+
+def _lookup(position):
+    """按 里程碑 × 4 + 状态 索引的查找表"""
+    table = np.empty(len(MILESTONE_STEPS) * 4, dtype=object)
+    for (milestone, status), values in INTERVENTIONS.items():
+        table[milestone * 4 + status] = values[position]
+    return table
+
+
+_ISSUES, _ACTIONS, _RESOLVE_DAYS = _lookup(0), _lookup(1), _lookup(2)
+
+
+def pack(states):
+    """(n, 4) 状态编码 → 每个卖家 1 字节"""
+    states = np.asarray(states, dtype=np.uint8)
+    return np.bitwise_or.reduce(states << _SHIFTS, axis=1).astype(np.uint8)
+
+
+def unpack(packed):
+    """每个卖家 1 字节 → (n, 4) 状态编码"""
+    return (packed[:, None] >> _SHIFTS) & 3
+
+
+class MilestoneTracker:
+    """入驻中卖家的里程碑状态和时间
+
+    states 为 (n, 4) 状态编码，started / completed 为 (n, 4) 时间（Timestamp 数组或距 base 的天数）。
+    """
+
+    def __init__(self, sellers, countries, states, started, completed, base):
+        self.sellers = np.asarray(sellers, dtype=object)
+        self.country_codes = pd.Categorical(countries, categories=COUNTRIES).codes
+        self.packed = pack(states)
+        self.base = pd.Timestamp(base)
+        self.started = self._to_days(started)
+        self.completed = self._to_days(completed)
+
+    def __len__(self):
+        return len(self.sellers)
+
+    def _to_days(self, times):
+        times = np.asarray(times)
+        if np.issubdtype(times.dtype, np.datetime64):
+            times = (times - np.datetime64(self.base)) / np.timedelta64(1, "D")
+        return times.astype(np.float32)
+
+    def day(self, now=None):
+        """时间点距 base 的天数（默认当前时间）"""
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        return np.float32((now - self.base) / pd.Timedelta(days=1))
+
+    # ---------- 更新 ----------
+
+    def set_status(self, rows, milestone, status, time=None):
+        """把 rows 这些卖家的一个里程碑设为 status，同时记录开始/完成时间"""
+        rows = np.asarray(rows)
+        t = self.day(time)
+        shift = _SHIFTS[milestone]
+        self.packed[rows] = (self.packed[rows] & ~np.uint8(3 << shift)) | np.uint8(status << shift)
+        if status in (IN_PROGRESS, BLOCKED):
+            fresh = rows[np.isnan(self.started[rows, milestone])]
+            self.started[fresh, milestone] = t
+            self.completed[rows, milestone] = np.nan
+        elif status == DONE:
+            self.started[rows[np.isnan(self.started[rows, milestone])], milestone] = t
+            self.completed[rows, milestone] = t
+        else:
+            self.started[rows, milestone] = np.nan
+            self.completed[rows, milestone] = np.nan
+
+    # ---------- 计算 ----------
+
+    def rows_for(self, countries=None):
+        if countries is None:
+            return np.arange(len(self))
+        codes = [COUNTRIES.index(c) for c in countries if c in COUNTRIES]
+        return np.flatnonzero(np.isin(self.country_codes, codes))
+
+    def evaluate(self, now=None, rows=None, sla=MILESTONE_SLA_DAYS):
+        """整体进度、各里程碑停留天数和 SLA 超时
+
+        返回 dict: states (n, 4)、progress (n,)、dwell (n, 4)、overdue (n, 4，未超时或未开始为 NaN)、
+        stalled (n,)、worst (n,，超时比例最大的里程碑)。
+        """
+        rows = slice(None) if rows is None else rows
+        states = unpack(self.packed[rows])
+        started, completed = self.started[rows], self.completed[rows]
+        t = self.day(now)
+
+        # 完成计 1，进行中或待处理计 0.5
+        active = (states == IN_PROGRESS) | (states == BLOCKED)
+        progress = ((states == DONE).sum(axis=1) + 0.5 * active.sum(axis=1)) / len(MILESTONE_STEPS)
+
+        dwell = np.where(states == DONE, completed, t) - started
+        late = np.where(active, dwell - sla, np.nan)
+        # 超时比例最严重的里程碑（全部为 NaN 的行取 0，再由 stalled 屏蔽）
+        ratio = np.where(late > 0, late / sla, -np.inf)
+        worst = ratio.argmax(axis=1)
+        stalled = np.take_along_axis(ratio, worst[:, None], axis=1)[:, 0] > 0
+        return {
+            "states": states, "progress": progress.astype(np.float32), "dwell": dwell,
+            "overdue": np.where(late > 0, late, np.nan), "stalled": stalled, "worst": worst,
+        }
+
+    def milestone_table(self, rows=None, result=None):
+        """里程碑表（ONBOARDING_MILESTONES 的列）"""
+        rows = np.arange(len(self)) if rows is None else rows
+        if result is None:
+            result = self.evaluate(rows=rows)
+        data = {"卖家": self.sellers[rows]}
+        for i, step in enumerate(MILESTONE_STEPS):
+            data[step] = pd.Categorical.from_codes(result["states"][:, i], dtype=MILESTONE)
+        data["整体进度"] = result["progress"].astype(np.float64)
+        return pd.DataFrame(data)
+
+    def interventions(self, rows=None, result=None, now=None):
+        """卡住的卖家的干预行动（INTERVENTION_ACTIONS 的列），按超时比例从高到低"""
+        rows = np.arange(len(self)) if rows is None else rows
+        if result is None:
+            result = self.evaluate(now, rows=rows)
+        stalled = np.flatnonzero(result["stalled"])
+        worst = result["worst"][stalled]
+        status = result["states"][stalled, worst]
+        late = result["overdue"][stalled, worst]
+        ratio = late / MILESTONE_SLA_DAYS[worst]
+        order = np.argsort(-ratio, kind="stable")
+        stalled, worst, status, late, ratio = stalled[order], worst[order], status[order], late[order], ratio[order]
+        key = worst * 4 + status
+        priority = np.select([(status == BLOCKED) | (ratio >= 1), ratio >= 0.5], ["高", "中"], "低")
+        return pd.DataFrame({
+            "卖家": self.sellers[rows[stalled]],
+            "里程碑": np.asarray(MILESTONE_STEPS, dtype=object)[worst],
+            "识别问题": _ISSUES[key],
+            "已延迟": np.ceil(late).astype(np.int64),
+            "推荐行动": _ACTIONS[key],
+            "预期解决时间": _RESOLVE_DAYS[key].astype(np.int64),
+            "优先级": priority,
+        })
+
+    def bottlenecks(self, result):
+        """各里程碑的卡住人数和平均超时天数"""
+        stalled = result["stalled"]
+        worst = result["worst"][stalled]
+        late = result["overdue"][stalled, worst]
+        counts = np.bincount(worst, minlength=len(MILESTONE_STEPS))
+        totals = np.bincount(worst, weights=late, minlength=len(MILESTONE_STEPS))
+        return [
+            {"里程碑": step, "卡住": int(counts[i]),
+             "平均超时": totals[i] / counts[i] if counts[i] else 0.0}
+            for i, step in enumerate(MILESTONE_STEPS)
+        ]
+
+
+# ---------- 模拟数据 ----------
+
+_NAMED_SELLERS = [
+    # (卖家, 国家, 各里程碑状态, 各里程碑开始于几天前, 完成于几天前)
+    ("TechCorp_VN", "VN", (DONE, DONE, DONE, DONE), (20, 18, 14, 8), (19, 15, 9, 2)),
+    ("FashionPlus_TH", "TH", (DONE, BLOCKED, DONE, NOT_STARTED), (12, 6, 10, None), (11, None, 4, None)),
+    ("HomeStyle_MY", "MY", (DONE, DONE, IN_PROGRESS, NOT_STARTED), (14, 12, 6, None), (13, 7, None, None)),
+    ("BeautyMax_SG", "SG", (DONE, DONE, NOT_STARTED, NOT_STARTED), (5, 4, None, None), (4, 1, None, None)),
+]
+
+# 各里程碑的平均耗时（天，Gamma 分布，形状参数 2）和进行中被卡住（待处理）的比例
+MOCK_DURATION_DAYS = (1.2, 2.0, 3.5, 4.5)
+MOCK_BLOCKED_SHARE = 0.25
+
+
+def generate_mock_onboarding(n=20000, now=None, days=30, seed=13):
+    """模拟入驻中的卖家: 过去 days 天内开始入驻，按顺序完成各里程碑
+
+    前4个为演示用的固定卖家。
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    rng = np.random.RandomState(seed)
+    n_named = min(n, len(_NAMED_SELLERS))
+    n_extra = n - n_named
+    steps = len(MILESTONE_STEPS)
+
+    states = np.full((n, steps), NOT_STARTED, dtype=np.uint8)
+    started = np.full((n, steps), np.nan, dtype=np.float64)
+    completed = np.full((n, steps), np.nan, dtype=np.float64)
+    for row, (_, _, status, start_ago, done_ago) in enumerate(_NAMED_SELLERS[:n_named]):
+        states[row] = status
+        started[row] = [np.nan if d is None else -d for d in start_ago]
+        completed[row] = [np.nan if d is None else -d for d in done_ago]
+
+    # 其余卖家: 依次开始和完成里程碑，未在 now 之前完成的停在该里程碑
+    t = rng.uniform(-days, 0, n_extra)
+    waiting = np.ones(n_extra, dtype=bool)
+    for i, mean in enumerate(MOCK_DURATION_DAYS):
+        finish = t + rng.gamma(2.0, mean / 2, n_extra)
+        done = waiting & (finish <= 0)
+        current = waiting & ~done
+        rows = n_named + np.flatnonzero(waiting)
+        started[rows, i] = t[waiting]
+        completed[n_named + np.flatnonzero(done), i] = finish[done]
+        states[n_named + np.flatnonzero(done), i] = DONE
+        blocked = rng.random_sample(n_extra) < MOCK_BLOCKED_SHARE
+        states[n_named + np.flatnonzero(current & blocked), i] = BLOCKED
+        states[n_named + np.flatnonzero(current & ~blocked), i] = IN_PROGRESS
+        waiting = done
+        t = finish
+
+    sellers = [s[0] for s in _NAMED_SELLERS[:n_named]] + [f"Onboarding{i:07d}" for i in range(n_named, n)]
+    countries = [s[1] for s in _NAMED_SELLERS[:n_named]] + list(rng.choice(COUNTRIES, n_extra))
+    base = now.normalize() - pd.Timedelta(days=days + 1)
+    offset = (now - base) / pd.Timedelta(days=1)
+    return MilestoneTracker(sellers, countries, states, started + offset, completed + offset, base)
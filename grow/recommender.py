@@ -0,0 +1,294 @@
+"""
+AI 推荐服务
+
+为卖家生成 AI 推荐文案（AI_Recommendation 列和各页面的 “AI推荐” 面板）。
+- 后端可插拔: FakeModel（离线、确定性）或 BedrockBackend（AWS Bedrock Claude 3）
+- 相同的提示（相同的任务和特征快照）只请求一次，多个卖家合并成一个批量请求
+- 结果写入持久化缓存（SQLite），键为特征快照的哈希，按 TTL 过期；
+  重新运行脚本或新会话对未变化的卖家不会再次产生模型延迟。
+  打开缓存时和每 evict_every 次写入后删除过期条目，数据库不会无限增长
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from grow.datastore import DEFAULT_DATA_DIR
+
+PROMPT_VERSION = 1
+DEFAULT_TTL = 24 * 3600
+
+# 每个任务的提示模板，{items} 替换为批量特征的 JSON 数组
+PROMPTS = {
+    "seller_growth": (
+        "你是跨境电商卖家增长顾问。下面是一组卖家的经营特征（JSON 数组）。"
+        "请为每个卖家给出一条不超过12个字的最优先增长行动，"
+        "按相同顺序返回一个 JSON 字符串数组，不要输出其他内容。\n{items}"
+    ),
+    "kpi_gap": (
+        "你是 AM 的绩效教练。下面每一项是一个 ICQ 指标缺口以及建议重点跟进的卖家特征（JSON 数组）。"
+        "请为每一项给出一句不超过30个字的行动建议，需包含卖家名称，"
+        "按相同顺序返回一个 JSON 字符串数组，不要输出其他内容。\n{items}"
+    ),
+}
+
+
+def feature_snapshot(record, precision=None):
+    """把一行特征整理成可哈希的快照，浮点数按精度取整避免无意义的抖动"""
+    precision = precision or {}
+    snapshot = {}
+    for key, value in record.items():
+        if hasattr(value, "item"):
+            value = value.item()
+        if isinstance(value, float):
+            value = round(value, precision.get(key, 2))
+        snapshot[key] = value
+    return snapshot
+
+
+def prompt_key(task, snapshot, model_id):
+    payload = json.dumps(
+        {"task": task, "version": PROMPT_VERSION, "model": model_id, "features": snapshot},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_batch_prompt(task, batch):
+    return PROMPTS[task].format(items=json.dumps(batch, ensure_ascii=False))
+
+
+# ---------- 后端 ----------
+
+class FakeModel:
+    """离线假模型: 基于规则生成推荐，可模拟请求延迟，记录调用次数"""
+
+    model_id = "fake-rules-v1"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.items = 0
+
+    def generate(self, task, batch):
+        self.calls += 1
+        self.items += len(batch)
+        if self.latency:
+            time.sleep(self.latency)
+        return [getattr(self, f"_{task}")(item) for item in batch]
+
+    @staticmethod
+    def _seller_growth(item):
+        if item.get("Compliance_Risk") == "High" or item.get("Compliance Score", 100) < 70:
+            return "提升合规分数"
+        if item.get("VOS_Sentiment", 5) < 3.5:
+            return "改善客户服务"
+        if item.get("Product_Gap_Count", 0) >= 8:
+            return "扩展产品线"
+        if item.get("Growth Rate", 0) < 0:
+            return "优化价格策略"
+        if item.get("GMV", 0) >= 150_000 and item.get("Growth Rate", 0) >= 15:
+            return "增加库存深度"
+        return "增加广告投入"
+
+    @staticmethod
+    def _kpi_gap(item):
+        seller = item.get("Seller", "")
+        metric = item.get("metric", "")
+        if metric == "GMS":
+            return f"重点关注高潜力卖家 {seller} (WoW增长{item.get('Growth Rate', 0):+.0f}%)"
+        if metric.startswith("FBA"):
+            return f"推荐{seller}进行FBA BA扩展 (当前GMS强劲)"
+        if metric.startswith("Ads"):
+            return f"推荐{seller}启用站内广告，提升广告覆盖"
+        return f"优先跟进{seller}的上线进度"
+
+
+class BedrockBackend:
+    """AWS Bedrock Claude 3 后端（需要 boto3 和 AWS 凭证）"""
+
+    def __init__(self, model_id=None, region=None, client=None):
+        self.model_id = model_id or os.environ.get(
+            "GROW_BEDROCK_MODEL", "anthropic.claude-3-haiku-20240307-v1:0"
+        )
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise ImportError("BedrockBackend 需要 boto3: pip install boto3") from e
+            client = boto3.client("bedrock-runtime", region_name=region or os.environ.get("AWS_REGION"))
+        self.client = client
+
+    def generate(self, task, batch):
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 64 * len(batch) + 64,
+            "messages": [{"role": "user", "content": build_batch_prompt(task, batch)}],
+        }
+        response = self.client.invoke_model(modelId=self.model_id, body=json.dumps(body))
+        text = json.loads(response["body"].read())["content"][0]["text"]
+        results = json.loads(text)
+        if not isinstance(results, list):
+            raise ValueError(f"模型返回了 {type(results).__name__}，期望 {len(batch)} 条结果的 JSON 数组")
+        if len(results) != len(batch):
+            raise ValueError(f"模型返回了 {len(results)} 条结果，期望 {len(batch)} 条")
+        return [str(r) for r in results]
+
+
+def backend_from_env():
+    """GROW_LLM_BACKEND=bedrock 时使用 Bedrock，否则使用离线假模型"""
+    if os.environ.get("GROW_LLM_BACKEND", "fake").lower() == "bedrock":
+        return BedrockBackend()
+    return FakeModel()
+
+
+# ---------- 缓存 ----------
+
+class RecommendationCache:
+    """SQLite 持久化缓存，按写入时间做 TTL 过期
+
+    打开时和每 evict_every 次 put_many 后删除过期条目。
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, evict_every=100):
+        self.path = str(path or DEFAULT_DATA_DIR / "recommendations.sqlite")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.ttl = ttl
+        self.evict_every = evict_every
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS recommendations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.evict_expired()
+
+    def get_many(self, keys, now=None):
+        """批量读取未过期的缓存，返回 {key: value}"""
+        cutoff = (time.time() if now is None else now) - self.ttl
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM recommendations WHERE created >= ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    [cutoff, *chunk],
+                )
+                found.update(rows)
+        return found
+
+    def put_many(self, items, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO recommendations (key, value, created) VALUES (?, ?, ?)",
+                [(k, v, now) for k, v in items.items()],
+            )
+            self._conn.commit()
+            self._puts += 1
+            evict = self._puts % self.evict_every == 0
+        if evict:
+            self.evict_expired(now)
+
+    def evict_expired(self, now=None):
+        """删除过期条目，返回删除数量"""
+        cutoff = (time.time() if now is None else now) - self.ttl
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM recommendations WHERE created < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM recommendations").fetchone()[0]
+
+
+# ---------- 服务 ----------
+
+class RecommendationService:
+    """批量、去重、带缓存的推荐服务"""
+
+    def __init__(self, backend=None, cache=None, batch_size=50):
+        self.backend = FakeModel() if backend is None else backend
+        self.cache = RecommendationCache() if cache is None else cache
+        self.batch_size = batch_size
+
+    def recommend(self, task, records, precision=None):
+        """为一组特征记录生成推荐，返回与 records 等长的字符串列表
+
+        records 为 dict 列表（或 DataFrame.to_dict("records") 的结果）。
+        只有缓存未命中的唯一提示才会发给模型。
+        """
+        snapshots = [feature_snapshot(r, precision) for r in records]
+        keys = [prompt_key(task, s, self.backend.model_id) for s in snapshots]
+        results = self.cache.get_many(set(keys))
+
+        pending = {}
+        for key, snapshot in zip(keys, snapshots):
+            if key not in results and key not in pending:
+                pending[key] = snapshot
+
+        pending_keys = list(pending)
+        for i in range(0, len(pending_keys), self.batch_size):
+            batch_keys = pending_keys[i:i + self.batch_size]
+            outputs = self.backend.generate(task, [pending[k] for k in batch_keys])
+            fresh = dict(zip(batch_keys, outputs))
+            self.cache.put_many(fresh)
+            results.update(fresh)
+
+        return [results[k] for k in keys]
+
+
+# 生成 AI_Recommendation 时使用的特征和取整精度
+SELLER_FEATURES = [
+    "Country", "Category", "Tier", "GMV", "Growth Rate", "Compliance Score",
+    "AI_Growth_Score", "Product_Gap_Count", "Compliance_Risk", "VOS_Sentiment",
+]
+SELLER_PRECISION = {"Growth Rate": 0, "VOS_Sentiment": 1}
+
+
+def recommend_for_sellers(service, seller_data, ai_analysis):
+    """为行对齐的卖家表生成 AI_Recommendation 列（不包含卖家名称，便于相同特征去重）"""
+    features = seller_data.join(ai_analysis.drop(columns=["Seller_ID", "Seller"]))
+    features = features[SELLER_FEATURES].copy()
+    # GMV 按 $10K 分档
+    features["GMV"] = (features["GMV"] // 10_000 * 10_000).astype("int64")
+    return service.recommend("seller_growth", features.to_dict("records"), SELLER_PRECISION)
+
+
+def kpi_gap_recommendations(service, metrics, index, countries=None, n=3):
+    """Goal 页面 “基于当前绩效缺口的AI推荐”
+
+    取缺口比例最大的 n 个 ICQ 指标（icq_metrics 的输出），
+    依次配对当前排名靠前的高潜力卖家（TopKIndex），批量生成行动建议。
+    """
+    gaps = sorted((m for m in metrics if m["gap_ratio"] < 0), key=lambda m: m["gap_ratio"])[:n]
+    leaders = index.top(len(gaps), countries)
+    items = []
+    for metric, pos in zip(gaps, leaders):
+        items.append({
+            "metric": metric["label"],
+            "gap": metric["gap"],
+            "Seller": index.sellers[pos],
+            "GMV": int(index.gmv[pos] // 1000 * 1000),
+            "Growth Rate": round(float(index.growth_rate[pos])),
+        })
+    texts = service.recommend("kpi_gap", items)
+    return [
+        {
+            "问题": f"{item['metric']}缺口 ({item['gap']})",
+            "卖家": item["Seller"],
+            "AI推荐": text,
+            "预期影响": f"+${index.revenue_potential[pos] / 1000:.0f}K GMS",
+            "优先级": "🔴 高" if metric["gap_ratio"] <= -0.2 else "🟡 中",
+        }
+        for item, text, metric, pos in zip(items, texts, gaps, leaders)
+    ]
@@ -0,0 +1,126 @@
+"""
+后台数据刷新调度器
+
+进程内唯一的后台线程，按侧边栏设置的间隔调用刷新函数，
+刷新完成后原子地替换当前快照。Streamlit 会话只读取 scheduler.snapshot，
+从不等待刷新完成；刷新失败时保留上一份快照并记录错误。
+
+调度器在进程内共享，侧边栏的 “自动刷新数据” 和 “刷新间隔” 以最近一次设置为准。
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """一次刷新的结果（只读）"""
+    version: int
+    data: dict = field(default_factory=dict)
+    synced_at: datetime = None
+    duration: float = 0.0
+
+    def age_label(self, now=None):
+        """距上次同步的时间，如 “刚刚”、“3分钟前”"""
+        if self.synced_at is None:
+            return "尚未同步"
+        seconds = ((now or datetime.now()) - self.synced_at).total_seconds()
+        if seconds < 60:
+            return "刚刚"
+        if seconds < 3600:
+            return f"{int(seconds // 60)}分钟前"
+        return f"{int(seconds // 3600)}小时前"
+
+
+class RefreshScheduler:
+    """按固定间隔在后台线程中刷新数据
+
+    refresh_fn() 返回 dict，成为新快照的 data。
+    """
+
+    def __init__(self, refresh_fn, interval=300.0, enabled=True):
+        self.refresh_fn = refresh_fn
+        self.interval = interval
+        self.enabled = enabled
+        self.snapshot = Snapshot(version=0)
+        self.last_error = ""
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._last_run = time.monotonic()
+
+    # ---------- 控制 ----------
+
+    def start(self, initial_refresh=True):
+        """启动后台线程；initial_refresh 时先同步刷新一次，保证有可用快照"""
+        if self._thread is not None:
+            return self
+        if initial_refresh:
+            self.refresh_now()
+        self._thread = threading.Thread(target=self._run, name="grow-refresh", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def configure(self, interval=None, enabled=None):
+        """更新刷新间隔或启停状态，变化时立即唤醒后台线程重新计时"""
+        changed = False
+        if interval is not None and interval != self.interval:
+            self.interval = interval
+            changed = True
+        if enabled is not None and enabled != self.enabled:
+            self.enabled = enabled
+            changed = True
+        if changed:
+            self._wake.set()
+
+    # ---------- 刷新 ----------
+
+    def refresh_now(self):
+        """立即刷新一次（阻塞调用方），返回新的快照；并发调用只执行一次"""
+        if not self._refresh_lock.acquire(blocking=False):
+            # 已有刷新在进行，等它完成后直接返回其结果
+            with self._refresh_lock:
+                return self.snapshot
+        try:
+            start = time.perf_counter()
+            # 失败时也从本次开始计时，按间隔重试
+            self._last_run = time.monotonic()
+            try:
+                data = self.refresh_fn()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return self.snapshot
+            self.last_error = ""
+            # 引用赋值是原子的，读者要么看到旧快照，要么看到新快照
+            self.snapshot = Snapshot(
+                version=self.snapshot.version + 1,
+                data=data,
+                synced_at=datetime.now(),
+                duration=time.perf_counter() - start,
+            )
+            return self.snapshot
+        finally:
+            self._refresh_lock.release()
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait = self._last_run + self.interval - time.monotonic() if self.enabled else None
+            if wait is None or wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            self.refresh_now()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
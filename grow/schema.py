@@ -0,0 +1,155 @@
+"""
+表格数据模式
+
+各标签页表格的规范列类型: 金额、比例、评分为数值列，国家、层级、优先级等为类别列，
+功能开关为布尔列。比例统一保存为小数（0.95 表示 95%）。
+每列可以指定一个显示格式（grow.formatting.FORMATTERS 的键），
+渲染时只对可见行应用，数据本身始终保持数值类型，可以直接排序和聚合。
+"""
+
+import pandas as pd
+
+from grow.datastore import COUNTRIES, TIERS
+
+# ---------- 类别 ----------
+
+COUNTRY = pd.CategoricalDtype(COUNTRIES)
+TIER = pd.CategoricalDtype(TIERS, ordered=True)
+PRIORITY = pd.CategoricalDtype(["P0", "P1", "P2"], ordered=True)
+LEVEL = pd.CategoricalDtype(["高", "中", "低"], ordered=True)
+RISK = pd.CategoricalDtype(["Low", "Medium", "High"], ordered=True)
+CATEGORY = pd.CategoricalDtype(["Electronics", "Fashion", "Beauty", "Home", "Sports", "Health"])
+BRAND = pd.CategoricalDtype(["领先品牌", "区域品牌", "新兴品牌"], ordered=True)
+POTENTIAL = pd.CategoricalDtype(["Very High", "High", "Medium", "Low"], ordered=True)
+CHANNEL = pd.CategoricalDtype(["邮件", "电话", "LinkedIn", "WhatsApp"])
+SEND_STATUS = pd.CategoricalDtype(["✅ 已发送", "📅 待发送", "📅 计划中"], ordered=True)
+MILESTONE = pd.CategoricalDtype(["✅ 完成", "🔄 进行中", "⚠️ 待处理", "📅 待开始"], ordered=True)
+HEALTH = pd.CategoricalDtype(["优秀", "良好", "一般", "需改善"], ordered=True)
+GRADE = pd.CategoricalDtype(["A+", "A", "B+", "B", "C+", "C"], ordered=True)
+
+
+class TableSchema:
+    """一张表的列类型和显示格式
+
+    columns 为 {列名: (dtype, 格式名)}，dtype 为 None 时保留推断出的类型，
+    格式名为 None 时原样显示。
+    """
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+
+    @property
+    def dtypes(self):
+        return {c: dtype for c, (dtype, _) in self.columns.items() if dtype is not None}
+
+    @property
+    def formats(self):
+        return {c: fmt for c, (_, fmt) in self.columns.items() if fmt is not None}
+
+    def apply(self, frame):
+        """把 frame 中已有的列转换为规范类型"""
+        dtypes = {c: d for c, d in self.dtypes.items() if c in frame.columns}
+        return frame.astype(dtypes)
+
+    def frame(self, data):
+        """由列数据构建规范类型的 DataFrame"""
+        return self.apply(pd.DataFrame(data))
+
+
+# ---------- 卖家明细 ----------
+
+SELLER_DETAIL = TableSchema({
+    "Country": (COUNTRY, None),
+    "Category": (CATEGORY, None),
+    "Tier": (TIER, None),
+    "GMV": ("int64", "money"),
+    "Compliance_Risk": (RISK, None),
+    "Revenue_Potential": ("int64", "money"),
+})
+
+# ---------- Recruitment ----------
+
+PROSPECT_ANALYSIS = TableSchema({
+    "卖家": (None, None),
+    "现有市场": (COUNTRY, None),
+    "类目": (CATEGORY, None),
+    "现有市场GMS": ("float64", "money"),
+    "品牌地位": (BRAND, None),
+    "跨市场匹配度": ("float64", "percent"),
+    "优先级": (PRIORITY, None),
+    "业务潜力": (POTENTIAL, None),
+})
+
+ENGAGEMENT_PLAN = TableSchema({
+    "渠道": (CHANNEL, None),
+    "已发送": ("int64", None),
+    "待发送": ("int64", None),
+    "响应率": ("float64", "percent"),
+    "状态": (SEND_STATUS, None),
+})
+
+PRIORITY_DIST = TableSchema({
+    "优先级": (PRIORITY, None),
+    "数量": ("int64", None),
+    "签约率": ("float64", "percent"),
+    "平均周期": ("float64", "days"),
+})
+
+# ---------- Onboarding ----------
+
+MILESTONE_STEPS = ["账户设置", "KYC验证", "产品Listing", "首次发货"]
+MILESTONE_STEP = pd.CategoricalDtype(MILESTONE_STEPS, ordered=True)
+
+ONBOARDING_MILESTONES = TableSchema({
+    **{step: (MILESTONE, None) for step in MILESTONE_STEPS},
+    "整体进度": ("float64", "percent"),
+})
+
+INTERVENTION_ACTIONS = TableSchema({
+    "里程碑": (MILESTONE_STEP, None),
+    "已延迟": ("int64", "days"),
+    "预期解决时间": ("Int64", "days"),
+    "优先级": (LEVEL, None),
+})
+
+TIME_PREDICTION = TableSchema({
+    "当前进度": ("float64", "percent"),
+    "预计完成": ("float64", "days"),
+    "风险等级": (LEVEL, None),
+})
+
+# ---------- Win ----------
+
+FEATURE_FLAGS = ["FBA", "广告", "促销", "优惠券"]
+
+FEATURE_ADOPTION = TableSchema({
+    **{feature: ("bool", "flag") for feature in FEATURE_FLAGS},
+    "采用率": ("float64", "percent"),
+})
+
+ADOPTION_ROLLUP = TableSchema({
+    "卖家数": ("int64", None),
+    **{feature: ("float64", "percent") for feature in FEATURE_FLAGS},
+})
+
+PERFORMANCE_SCORECARD = TableSchema({
+    "Listing质量": ("int64", "score"),
+    "广告ROI": ("float64", "multiple"),
+    "库存健康": (HEALTH, None),
+    "整体评分": (GRADE, None),
+})
+
+REVENUE_LIFT = TableSchema({
+    "基准收入": ("float64", "money"),
+    "当前收入": ("float64", "money"),
+    "收入提升": ("float64", "signed_percent"),
+})
+
+GROWTH_POTENTIAL = TableSchema({
+    "当前表现": (HEALTH, None),
+    "功能采用": ("float64", "percent"),
+    "预测增长": ("float64", "signed_percent"),
+    "预测下限": ("float64", "signed_percent"),
+    "预测上限": ("float64", "signed_percent"),
+    "信心度": ("float64", "percent"),
+})
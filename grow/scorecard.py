@@ -0,0 +1,252 @@
+"""
+绩效记分卡计算
+
+由三张原始表计算每个卖家的记分卡（PERFORMANCE_SCORECARD 的列）:
+- listings: 每个 Listing 一行（图片数、标题长度、A+ 内容、评分）→ Listing质量（百分制平均分）
+- ad_spend: 每个卖家每天一行（广告花费、广告销售额）→ 广告ROI（未投放广告为空）
+- inventory: 每个 SKU 一行（在库数量、日均销量）→ 库存覆盖天数在健康区间内的 SKU 占比 → 库存健康
+整体评分 = 三项得分的加权平均（未投放广告的卖家按其余两项），用 np.digitize 按阈值划分等级。
+
+原始表为按 Seller_ID 排序的 Parquet 文件，每个行组对应一段连续的卖家。
+计算按卖家分块进行: 每块只按 Seller_ID 范围读取命中的行组，
+用 np.searchsorted 对已排序的卖家索引做归并连接，np.bincount 按卖家聚合，
+结果逐块写出，任何时候内存中只有一块卖家的原始数据。
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from grow.schema import GRADE, HEALTH
+
+RAW_TABLES = {
+    "listings": ["Seller_ID", "Images", "Title_Length", "A_Plus", "Rating"],
+    "ad_spend": ["Seller_ID", "Spend", "Ad_Sales"],
+    "inventory": ["Seller_ID", "On_Hand", "Daily_Units"],
+}
+
+# Listing 质量: 各项满分标准和权重
+MAX_IMAGES = 9
+TARGET_TITLE_LENGTH = 150
+LISTING_WEIGHTS = {"Images": 0.35, "Title_Length": 0.25, "A_Plus": 0.2, "Rating": 0.2}
+# 广告ROI 达到 4 倍计满分
+TARGET_ROI = 4.0
+# 库存覆盖天数在此区间内为健康（0 为断货，超过上限为积压）
+HEALTHY_COVER_DAYS = (14, 90)
+# 健康 SKU 占比 → 库存健康（从低到高）
+HEALTH_THRESHOLDS = (0.4, 0.6, 0.8)
+HEALTH_LABELS = list(reversed(HEALTH.categories))
+
+# 整体评分: Listing质量、广告、库存的权重和等级阈值（从低到高）
+SCORE_WEIGHTS = (0.4, 0.3, 0.3)
+GRADE_THRESHOLDS = (45, 58, 72, 80, 90)
+GRADE_LABELS = list(reversed(GRADE.categories))
+
+# 整体评分 → 当前表现（增长潜力表）
+PERFORMANCE_BY_GRADE = {"A+": "优秀", "A": "优秀", "B+": "良好", "B": "良好", "C+": "一般", "C": "需改善"}
+
+SCORECARD_COLUMNS = ["Seller_ID", "卖家", "国家", "Listing质量", "广告ROI", "库存健康", "整体评分", "综合得分"]
+
+
+def _join(seller_ids, ids):
+    """按已排序的卖家索引连接: 返回每行所属卖家的位置，以及是否命中"""
+    pos = np.searchsorted(seller_ids, ids)
+    pos = np.minimum(pos, len(seller_ids) - 1)
+    return pos, seller_ids[pos] == ids
+
+
+def _sum(pos, hit, weights, n):
+    return np.bincount(pos[hit], weights=weights[hit], minlength=n)
+
+
+def aggregate(seller_ids, listings, ads, inventory):
+    """一块卖家的原始表 → (Listing质量, 广告ROI, 健康 SKU 占比)，与 seller_ids 对齐"""
+    n = len(seller_ids)
+
+    pos, hit = _join(seller_ids, listings["Seller_ID"].to_numpy())
+    score = (
+        LISTING_WEIGHTS["Images"] * np.minimum(listings["Images"].to_numpy() / MAX_IMAGES, 1)
+        + LISTING_WEIGHTS["Title_Length"] * np.minimum(listings["Title_Length"].to_numpy() / TARGET_TITLE_LENGTH, 1)
+        + LISTING_WEIGHTS["A_Plus"] * listings["A_Plus"].to_numpy(zero_copy_only=False)
+        + LISTING_WEIGHTS["Rating"] * (listings["Rating"].to_numpy() - 1) / 4
+    ) * 100
+    count = np.bincount(pos[hit], minlength=n)
+    listing = np.divide(_sum(pos, hit, score, n), count, out=np.full(n, np.nan), where=count > 0)
+
+    pos, hit = _join(seller_ids, ads["Seller_ID"].to_numpy())
+    spend = _sum(pos, hit, ads["Spend"].to_numpy(), n)
+    sales = _sum(pos, hit, ads["Ad_Sales"].to_numpy(), n)
+    roi = np.divide(sales, spend, out=np.full(n, np.nan), where=spend > 0)
+
+    pos, hit = _join(seller_ids, inventory["Seller_ID"].to_numpy())
+    on_hand = inventory["On_Hand"].to_numpy().astype(np.float64)
+    daily = inventory["Daily_Units"].to_numpy()
+    cover = np.divide(on_hand, daily, out=np.full(len(daily), np.inf), where=daily > 0)
+    healthy = (cover >= HEALTHY_COVER_DAYS[0]) & (cover <= HEALTHY_COVER_DAYS[1])
+    skus = np.bincount(pos[hit], minlength=n)
+    healthy_share = np.divide(_sum(pos, hit, healthy.astype(np.float64), n), skus,
+                              out=np.full(n, np.nan), where=skus > 0)
+    return listing, roi, healthy_share
+
+
+def _label(values, thresholds, labels, dtype):
+    """按阈值划分等级（labels 从低到高），空值仍为空"""
+    codes = dtype.categories.get_indexer(labels)[np.digitize(np.nan_to_num(values), thresholds)]
+    return pd.Categorical.from_codes(np.where(np.isnan(values), -1, codes), dtype=dtype)
+
+
+def grade(listing, roi, healthy_share):
+    """整体评分的综合得分和等级、库存健康等级（整个数组一次计算）"""
+    parts = np.stack([listing, np.clip(roi / TARGET_ROI, 0, 1) * 100, healthy_share * 100])
+    # 缺少的一项（如未投放广告）不计入，其余各项按权重重新归一
+    weights = np.where(np.isnan(parts), 0.0, np.asarray(SCORE_WEIGHTS)[:, None]).sum(axis=0)
+    total = np.divide(np.nansum(parts * np.asarray(SCORE_WEIGHTS)[:, None], axis=0), weights,
+                      out=np.full(parts.shape[1], np.nan), where=weights > 0)
+    return (total,
+            _label(total, GRADE_THRESHOLDS, GRADE_LABELS, GRADE),
+            _label(healthy_share, HEALTH_THRESHOLDS, HEALTH_LABELS, HEALTH))
+
+
+def iter_scorecard(raw_dir, sellers, chunk_size=50_000):
+    """按卖家分块计算记分卡，每次产出一块的 DataFrame（SCORECARD_COLUMNS）
+
+    sellers 为 Seller_ID、Seller、Country 三列的 DataFrame。
+    """
+    raw_dir = Path(raw_dir)
+    datasets = {name: ds.dataset(raw_dir / f"{name}.parquet", format="parquet") for name in RAW_TABLES}
+    sellers = sellers.sort_values("Seller_ID", kind="stable", ignore_index=True)
+    all_ids = sellers["Seller_ID"].to_numpy(dtype=np.int64)
+    for start in range(0, len(sellers), chunk_size):
+        ids = all_ids[start:start + chunk_size]
+        # 原始表按 Seller_ID 排序，范围条件只读取命中的行组
+        in_range = (ds.field("Seller_ID") >= int(ids[0])) & (ds.field("Seller_ID") <= int(ids[-1]))
+        tables = [datasets[name].to_table(columns=columns, filter=in_range) for name, columns in RAW_TABLES.items()]
+        listing, roi, healthy_share = aggregate(ids, *tables)
+        total, grades, health = grade(listing, roi, healthy_share)
+        chunk = sellers.iloc[start:start + chunk_size]
+        yield pd.DataFrame({
+            "Seller_ID": ids,
+            "卖家": chunk["Seller"].to_numpy(),
+            "国家": chunk["Country"].to_numpy(),
+            "Listing质量": np.round(np.nan_to_num(listing)).astype(np.int64),
+            "广告ROI": roi,
+            "库存健康": health,
+            "整体评分": grades,
+            "综合得分": total,
+        })
+
+
+def build_scorecard(raw_dir, sellers, path, chunk_size=50_000):
+    """流式计算全部卖家的记分卡并写入 Parquet，返回卖家数"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    writer, rows = None, 0
+    try:
+        for chunk in iter_scorecard(raw_dir, sellers, chunk_size):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        tmp_path.replace(path)
+    return rows
+
+
+def load_scorecard(path, countries=None):
+    """读取记分卡（只读所选国家；countries 为空时返回只有列的空表）"""
+    if countries is not None and not len(countries):
+        # 空列表的 in 过滤条件类型为 null，与字符串列比较会报错
+        table = pq.read_schema(path).empty_table()
+    else:
+        filters = None if countries is None else [("国家", "in", list(countries))]
+        table = pq.read_table(path, filters=filters)
+    frame = table.to_pandas()
+    return frame.astype({"库存健康": HEALTH, "整体评分": GRADE})
+
+
+# ---------- 模拟数据 ----------
+
+_NAMED_TARGETS = {
+    # 卖家: (Listing 质量, 广告ROI, 健康 SKU 占比)
+    "TechGiant_SG": (0.85, 3.2, 0.9),
+    "ElectroMax_ID": (0.72, 2.1, 0.65),
+    "FashionHub_MY": (0.68, 1.8, 0.3),
+    "BeautyPro_VN": (0.91, 4.1, 0.95),
+}
+MOCK_AD_DAYS = 14
+MOCK_AD_SHARE = 0.75
+
+
+def _mock_chunk(ids, targets, rng):
+    """一块卖家的三张原始表（按 Seller_ID 排序）"""
+    quality, roi, health = targets
+
+    n_listings = rng.poisson(8, len(ids)) + 1
+    owner = np.repeat(np.arange(len(ids)), n_listings)
+    q = np.clip(quality[owner] + rng.normal(0, 0.08, len(owner)), 0, 1)
+    listings = pa.table({
+        "Seller_ID": ids[owner],
+        "Images": rng.binomial(MAX_IMAGES, q).astype(np.int8),
+        "Title_Length": np.clip(q * TARGET_TITLE_LENGTH + rng.normal(0, 10, len(owner)), 10, 200).astype(np.int16),
+        "A_Plus": rng.random_sample(len(owner)) < q,
+        "Rating": np.clip(1 + 4 * q + rng.normal(0, 0.3, len(owner)), 1, 5).astype(np.float32),
+    })
+
+    advertisers = np.flatnonzero(~np.isnan(roi))
+    owner = np.repeat(advertisers, MOCK_AD_DAYS)
+    spend = rng.lognormal(3, 0.5, len(owner))
+    ads = pa.table({
+        "Seller_ID": ids[owner],
+        "Spend": spend,
+        "Ad_Sales": spend * roi[owner] * rng.lognormal(0, 0.2, len(owner)),
+    })
+
+    n_skus = rng.poisson(5, len(ids)) + 1
+    owner = np.repeat(np.arange(len(ids)), n_skus)
+    daily = rng.lognormal(1, 0.7, len(owner))
+    # 每个卖家前 round(健康占比 × SKU 数) 个 SKU 为健康
+    within = np.arange(len(owner)) - np.repeat(np.cumsum(n_skus) - n_skus, n_skus)
+    healthy = within < np.round(health * n_skus)[owner]
+    stockout = rng.random_sample(len(owner)) < 0.5
+    cover = np.where(healthy, rng.uniform(15, 89, len(owner)), np.where(stockout, 0, rng.uniform(180, 400, len(owner))))
+    inventory = pa.table({
+        "Seller_ID": ids[owner],
+        "On_Hand": np.round(cover * daily).astype(np.int32),
+        "Daily_Units": daily,
+    })
+    return listings, ads, inventory
+
+
+def write_mock_raw_tables(raw_dir, sellers, chunk_size=50_000, seed=5):
+    """按卖家分块生成模拟的原始表，逐块写入 Parquet（每块一个行组）"""
+    raw_dir = Path(raw_dir)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.RandomState(seed)
+    sellers = sellers.sort_values("Seller_ID", kind="stable", ignore_index=True)
+    writers = {}
+    try:
+        for start in range(0, len(sellers), chunk_size):
+            chunk = sellers.iloc[start:start + chunk_size]
+            n = len(chunk)
+            quality = rng.beta(6, 3, n)
+            roi = np.where(rng.random_sample(n) < MOCK_AD_SHARE, rng.lognormal(np.log(2.5), 0.4, n), np.nan)
+            health = rng.beta(4, 2, n)
+            for row, name in enumerate(chunk["Seller"]):
+                if name in _NAMED_TARGETS:
+                    quality[row], roi[row], health[row] = _NAMED_TARGETS[name]
+            tables = _mock_chunk(chunk["Seller_ID"].to_numpy(dtype=np.int64), (quality, roi, health), rng)
+            for name, table in zip(RAW_TABLES, tables):
+                if name not in writers:
+                    writers[name] = pq.ParquetWriter(raw_dir / f"{name}.parquet", table.schema)
+                writers[name].write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
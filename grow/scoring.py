@@ -0,0 +1,129 @@
+"""
+卖家评分引擎
+
+根据 GMV、Growth Rate、Compliance Score、Active Days 和 VOS_Sentiment 计算
+AI_Growth_Score、Revenue_Potential 和 Product_Gap_Count。
+所有计算都是对整列数组的批量 NumPy 运算，不逐行 apply。
+"""
+
+import numpy as np
+import pandas as pd
+
+# AI_Growth_Score 各因子权重
+SCORE_WEIGHTS = {
+    "growth": 0.30,
+    "gmv": 0.20,
+    "compliance": 0.20,
+    "sentiment": 0.20,
+    "tenure": 0.10,
+}
+
+# 各因子的归一化区间
+GMV_LOG10_RANGE = (4.0, 6.0)        # $10K → 0, $1M → 1
+GROWTH_RANGE = (-5.0, 25.0)         # %
+COMPLIANCE_RANGE = (50.0, 100.0)
+SENTIMENT_RANGE = (1.0, 5.0)
+TENURE_HALF_LIFE_DAYS = 180.0
+
+MAX_PRODUCT_GAPS = 14
+
+
+def _scale(values, low, high):
+    """线性缩放到 [0, 1]"""
+    return np.clip((np.asarray(values, dtype=np.float64) - low) / (high - low), 0.0, 1.0)
+
+
+def score_sellers(gmv, growth_rate, compliance_score, active_days, vos_sentiment):
+    """批量计算卖家评分
+
+    参数都是等长数组（或 Series），返回包含三列评分数组的字典:
+    - AI_Growth_Score: 0-100 的综合增长评分
+    - Revenue_Potential: 预计可提升的 GMV（美元，取整到百位）
+    - Product_Gap_Count: 预计的产品线缺口数量
+    """
+    gmv = np.asarray(gmv, dtype=np.float64)
+    growth = _scale(growth_rate, *GROWTH_RANGE)
+    size = _scale(np.log10(np.maximum(gmv, 1.0)), *GMV_LOG10_RANGE)
+    compliance = _scale(compliance_score, *COMPLIANCE_RANGE)
+    sentiment = _scale(vos_sentiment, *SENTIMENT_RANGE)
+    tenure = 1.0 - np.exp2(-np.asarray(active_days, dtype=np.float64) / TENURE_HALF_LIFE_DAYS)
+
+    score = (
+        SCORE_WEIGHTS["growth"] * growth
+        + SCORE_WEIGHTS["gmv"] * size
+        + SCORE_WEIGHTS["compliance"] * compliance
+        + SCORE_WEIGHTS["sentiment"] * sentiment
+        + SCORE_WEIGHTS["tenure"] * tenure
+    )
+
+    # 评分越高，可挖掘的增量比例越大 (10% - 50%)
+    uplift_rate = 0.10 + 0.40 * score
+    revenue_potential = np.round(gmv * uplift_rate, -2)
+
+    # 合规、口碑和经营时长越弱，产品线缺口越多
+    maturity = 0.5 * compliance + 0.3 * sentiment + 0.2 * tenure
+    gaps = np.rint(MAX_PRODUCT_GAPS * (1.0 - maturity))
+
+    return {
+        "AI_Growth_Score": np.rint(score * 100).astype(np.int64),
+        "Revenue_Potential": revenue_potential.astype(np.int64),
+        "Product_Gap_Count": gaps.astype(np.int64),
+    }
+
+
+def score_frame(seller_data, ai_analysis):
+    """对行对齐的 seller_data / ai_analysis 评分，返回更新了评分列的 ai_analysis 副本"""
+    scores = score_sellers(
+        seller_data["GMV"].to_numpy(),
+        seller_data["Growth Rate"].to_numpy(),
+        seller_data["Compliance Score"].to_numpy(),
+        seller_data["Active Days"].to_numpy(),
+        ai_analysis["VOS_Sentiment"].to_numpy(),
+    )
+    return ai_analysis.assign(**scores)
+
+
+def top_n_indices(values, n):
+    """返回 values 最大的 n 个元素的下标（降序），用 argpartition 避免全量排序"""
+    values = np.asarray(values)
+    n = min(n, len(values))
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.argpartition(-values, n - 1)[:n]
+    return idx[np.argsort(-values[idx], kind="stable")]
+
+
+def rank_keys(ai_growth_score, revenue_potential):
+    """高潜力排序键: 先比 AI_Growth_Score，同分再比 Revenue_Potential
+
+    两者压成一个 float64（Revenue_Potential < 1e10 时精确），便于整列比较。
+    """
+    return (np.asarray(ai_growth_score, dtype=np.float64) * 1e10
+            + np.asarray(revenue_potential, dtype=np.float64))
+
+
+def _money_k(values, sign=""):
+    return [f"{sign}${v / 1000:.0f}K" for v in values]
+
+
+def format_high_potential(sellers, growth_rate, gmv, recommendation, revenue_potential):
+    """高潜力卖家展示表"""
+    return pd.DataFrame({
+        "卖家": list(sellers),
+        "WoW GMS增长": [f"{g:+.0f}%" for g in growth_rate],
+        "当前GMS": _money_k(gmv),
+        "AI推荐行动": list(recommendation),
+        "潜在影响": _money_k(revenue_potential, sign="+"),
+    })
+
+
+def high_potential_table(seller_data, ai_analysis, n=3):
+    """按 AI_Growth_Score 排出高潜力卖家，生成 Goal 页面的展示表"""
+    keys = rank_keys(ai_analysis["AI_Growth_Score"], ai_analysis["Revenue_Potential"])
+    idx = top_n_indices(keys, n)
+    top = seller_data.iloc[idx]
+    return format_high_potential(
+        top["Seller"], top["Growth Rate"], top["GMV"],
+        ai_analysis["AI_Recommendation"].iloc[idx],
+        ai_analysis["Revenue_Potential"].iloc[idx],
+    )
@@ -0,0 +1,217 @@
+"""
+本地数据源替身服务器
+
+在本机随机端口上模拟 Quicksight、VOS Hub 和 Selection AI 的 JSON 接口，
+可配置响应延迟，用于测试和离线开发。
+SmtpSink / WhatsAppSink 模拟接触节奏引擎和批量发送的邮件服务器、WhatsApp 消息网关，只计数不投递。
+
+独立运行: python -m grow.stub_servers
+（打印可直接 export 的 GROW_*_URL 环境变量）
+"""
+
+import json
+import random
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from grow.connectors import DEFAULT_SOURCES, SourceConfig
+
+
+def _quicksight_payload():
+    return {"metrics": {"launched_sellers": random.randint(30, 60),
+                        "gms": round(random.uniform(2.0e6, 3.5e6), 2)}}
+
+
+def _vos_hub_payload():
+    return {"sentiment": {"average": round(random.uniform(3.5, 4.8), 2),
+                          "reviews": random.randint(500, 5000)}}
+
+
+def _selection_ai_payload():
+    return {"selection": {"product_gaps": random.randint(0, 15),
+                          "top_category": random.choice(["Electronics", "Fashion", "Home"])}}
+
+
+STUB_PAYLOADS = {
+    "Quicksight": _quicksight_payload,
+    "VOS Hub": _vos_hub_payload,
+    "Selection AI": _selection_ai_payload,
+}
+
+
+class StubServer:
+    """在后台线程中运行的 JSON 替身服务器"""
+
+    def __init__(self, name, latency=0.0, status=200, host="127.0.0.1", port=0):
+        self.name = name
+        self.latency = latency
+        self.status = status
+        payload = STUB_PAYLOADS[name]
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server.latency)
+                body = json.dumps({"source": server.name, **payload()}).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def source(self, timeout=5.0):
+        return SourceConfig(self.name, self.url, DEFAULT_SOURCES[self.name][1], timeout)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class SmtpSink:
+    """最小的 SMTP 服务器: 接受任意收件人，只统计收到的邮件数"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.received = 0
+        self.last_message = b""
+        self._lock = threading.Lock()
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            disable_nagle_algorithm = True
+
+            def reply(self, line):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            def handle(self):
+                self.reply("220 grow-smtp-sink")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line[:4].upper()
+                    if command == b"EHLO":
+                        self.reply("250-grow-smtp-sink")
+                        self.reply("250 8BITMIME")
+                    elif command == b"DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        lines = []
+                        for data in iter(self.rfile.readline, b""):
+                            if data == b".\r\n":
+                                break
+                            lines.append(data)
+                        with sink._lock:
+                            sink.received += 1
+                            sink.last_message = b"".join(lines)
+                        self.reply("250 OK")
+                    elif command == b"QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        # HELO / MAIL / RCPT / RSET / NOOP
+                        self.reply("250 OK")
+
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class WhatsAppSink(StubServer):
+    """WhatsApp 消息网关替身: POST /messages 接收批量消息，只统计条数"""
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        self.name = "WhatsApp"
+        self.latency = latency
+        self.received = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                time.sleep(sink.latency)
+                messages = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["messages"]
+                with sink._lock:
+                    sink.received += len(messages)
+                    sink.batches += 1
+                body = json.dumps({"accepted": len(messages)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+
+def start_stub_sources(latencies=None):
+    """启动三个数据源的替身服务器，latencies 为 {名称: 延迟秒数}"""
+    latencies = latencies or {}
+    return [StubServer(name, latencies.get(name, 0.0)).start() for name in STUB_PAYLOADS]
+
+
+def main():
+    servers = start_stub_sources({"Quicksight": 0.3, "VOS Hub": 0.2, "Selection AI": 0.1})
+    for server in servers:
+        print(f"export {DEFAULT_SOURCES[server.name][0]}={server.url}")
+    smtp, whatsapp = SmtpSink().start(), WhatsAppSink().start()
+    print(f"export GROW_SMTP_HOST={smtp.address[0]} GROW_SMTP_PORT={smtp.address[1]}")
+    print(f"export GROW_WHATSAPP_URL={whatsapp.url}")
+    servers += [smtp, whatsapp]
+    print("按 Ctrl+C 停止")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+入驻完成时间预测
+
+离散时间生存模型（Kaplan-Meier）: 按 里程碑 × 国家 分层，把历史里程碑耗时按 GRID_DAYS 分箱，
+累计完成次数和删失次数（仍在进行中的里程碑按已停留天数删失），得到各箱的完成风险率；
+样本少的分层向该里程碑的全体风险率收缩。由生存曲线预先算出 “已停留 a 天后剩余天数的中位数” 表，
+预测时对所有入驻中卖家一次查表:
+剩余天数 = 进行中/待处理里程碑的剩余中位数 + 未开始里程碑的期望耗时。
+
+完成记录只追加: 增量训练只累计上次训练之后新完成的里程碑，删失部分每次重新统计。
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import COUNTRIES
+from grow.onboarding import IN_PROGRESS, BLOCKED, NOT_STARTED, MILESTONE_SLA_DAYS
+from grow.schema import MILESTONE_STEPS
+
+GRID_DAYS = 0.25
+HORIZON_DAYS = 60
+BINS = int(HORIZON_DAYS / GRID_DAYS)
+# 未知国家单独一层（只用全体风险率）
+N_COUNTRIES = len(COUNTRIES) + 1
+N_STRATA = len(MILESTONE_STEPS) * N_COUNTRIES
+# 收缩强度: 相当于每个箱额外有 PRIOR_WEIGHT 个按全体风险率完成的样本
+PRIOR_WEIGHT = 20.0
+
+# 预计总入驻时间超过目标为 高 风险，超过目标的 80% 为 中
+TARGET_DAYS = float(MILESTONE_SLA_DAYS.sum())
+RISK_SHARES = (1.0, 0.8)
+
+
+def _bins(days):
+    return np.clip((days / GRID_DAYS).astype(np.int64), 0, BINS - 1)
+
+
+def _strata(tracker, rows=None):
+    """(n, 4) 分层编号: 里程碑 × 国家"""
+    codes = tracker.country_codes if rows is None else tracker.country_codes[rows]
+    codes = np.where(codes < 0, N_COUNTRIES - 1, codes).astype(np.int64)
+    return np.arange(len(MILESTONE_STEPS))[None, :] * N_COUNTRIES + codes[:, None]
+
+
+def _histogram(strata, days):
+    counts = np.bincount(strata * BINS + _bins(days), minlength=N_STRATA * BINS)
+    return counts.reshape(N_STRATA, BINS).astype(np.float64)
+
+
+class SurvivalModel:
+    """训练好的模型（只读）
+
+    events / censored 为 (分层, 箱) 的完成和删失次数，as_of 为训练截止时间（距 tracker.base 的天数）。
+    """
+
+    def __init__(self, events, censored, as_of):
+        self.events = events
+        self.censored = censored
+        self.as_of = as_of
+        survival_start, survival_end = self._survival()
+        # 从开始到完成的期望耗时（生存曲线下的面积）
+        self.mean = GRID_DAYS * ((survival_start + survival_end) / 2).sum(axis=1)
+        self.residual = self._median_residual(survival_start, survival_end)
+
+    def _survival(self):
+        """各分层在每个箱起点、终点的生存率（仍未完成的比例）"""
+        exits = self.events + self.censored
+        # 箱起点仍在进行中的样本数
+        at_risk = exits.sum(axis=1, keepdims=True) - np.cumsum(exits, axis=1) + exits
+        steps = len(MILESTONE_STEPS)
+        pooled_events = self.events.reshape(steps, N_COUNTRIES, BINS).sum(axis=1)
+        pooled_risk = at_risk.reshape(steps, N_COUNTRIES, BINS).sum(axis=1)
+        pooled = np.divide(pooled_events, pooled_risk, out=np.ones_like(pooled_events), where=pooled_risk > 0)
+        prior = np.repeat(pooled, N_COUNTRIES, axis=0)
+        hazard = (self.events + PRIOR_WEIGHT * prior) / (at_risk + PRIOR_WEIGHT)
+        # 视界处视为全部完成
+        hazard[:, -1] = 1.0
+        survival_end = np.cumprod(1 - hazard, axis=1)
+        survival_start = np.hstack([np.ones((N_STRATA, 1)), survival_end[:, :-1]])
+        return survival_start, survival_end
+
+    @staticmethod
+    def _median_residual(survival_start, survival_end):
+        """(分层, 箱): 已停留到箱起点时剩余天数的中位数
+
+        即生存率降到箱起点一半所需的时间，在所在箱内线性插值。
+        中位数的绝对误差比均值小，也不受长尾拖累。
+        """
+        target = survival_start / 2
+        # 生存率单调不增: 第一个终点生存率不超过目标的箱
+        j = np.minimum((survival_end[:, None, :] > target[:, :, None]).sum(axis=2), BINS - 1)
+        low = np.take_along_axis(survival_start, j, axis=1)
+        high = np.take_along_axis(survival_end, j, axis=1)
+        frac = np.divide(low - target, low - high, out=np.ones_like(low), where=low > high)
+        return (j + np.clip(frac, 0, 1) - np.arange(BINS)) * GRID_DAYS
+
+    def remaining(self, strata, dwell):
+        """已停留 dwell 天的里程碑的预计剩余天数（中位数）"""
+        b = _bins(dwell)
+        return np.maximum(self.residual[strata, b] - (dwell - b * GRID_DAYS), GRID_DAYS / 2)
+
+    def predict(self, tracker, rows=None, now=None, result=None):
+        """所选卖家的预计剩余天数，一次向量化计算（已全部完成的为 0）"""
+        if result is None:
+            result = tracker.evaluate(now, rows=rows)
+        states, dwell = result["states"], result["dwell"]
+        strata = _strata(tracker, rows)
+        active = (states == IN_PROGRESS) | (states == BLOCKED)
+        current = self.remaining(strata, np.where(active, dwell, 0.0))
+        remaining = np.where(active, current, np.where(states == NOT_STARTED, self.mean[strata], 0.0))
+        return remaining.sum(axis=1)
+
+    def prediction_table(self, tracker, rows=None, now=None):
+        """入驻中卖家的预测表（TIME_PREDICTION 的列），按预计总入驻时间从长到短"""
+        rows = np.arange(len(tracker)) if rows is None else np.asarray(rows)
+        result = tracker.evaluate(now, rows=rows)
+        remaining = self.predict(tracker, rows, result=result)
+        # 已入驻天数: 从最早开始的里程碑算起
+        first = np.fmin.reduce(tracker.started[rows], axis=1)
+        total = np.nan_to_num(tracker.day(now) - first) + remaining
+        risk = np.select([total > TARGET_DAYS * RISK_SHARES[0], total > TARGET_DAYS * RISK_SHARES[1]],
+                         ["高", "中"], "低")
+        keep = np.flatnonzero(result["progress"] < 1)
+        keep = keep[np.argsort(-total[keep], kind="stable")]
+        return pd.DataFrame({
+            "卖家": tracker.sellers[rows[keep]],
+            "当前进度": result["progress"][keep].astype(np.float64),
+            "预计完成": remaining[keep],
+            "风险等级": risk[keep],
+        })
+
+
+def _fit_days(tracker, t, previous=None):
+    done = tracker.completed <= t
+    strata = _strata(tracker)
+    if previous is None or previous.as_of > t:
+        new = done
+        events = np.zeros((N_STRATA, BINS))
+    else:
+        new = done & (tracker.completed > previous.as_of)
+        events = previous.events.copy()
+    events += _histogram(strata[new], (tracker.completed - tracker.started)[new])
+    open_ = (tracker.started <= t) & ~done
+    censored = _histogram(strata[open_], (t - tracker.started)[open_])
+    return SurvivalModel(events, censored, t), int(new.sum())
+
+
+def fit(tracker, now=None, previous=None):
+    """训练到 now 为止的模型；传入 previous 时只累计其后新完成的里程碑
+
+    返回 (模型, 新增完成记录数)。
+    """
+    return _fit_days(tracker, tracker.day(now), previous)
+
+
+def backtest(tracker, now=None, holdout_days=7, tolerance=1.0):
+    """以 now - holdout_days 为截止训练，预测当时进行中的里程碑何时完成并与实际比较
+
+    截止后已完成的: 预测误差不超过 tolerance 天即为准确；
+    仍未完成的只知道剩余 > holdout_days: 预测不少于 holdout_days - tolerance 即为准确（不计入平均误差）。
+    返回 (准确率, 平均绝对误差, 样本数)。
+    """
+    t = tracker.day(now)
+    cutoff = t - holdout_days
+    model, _ = _fit_days(tracker, cutoff)
+    started, completed = tracker.started, tracker.completed
+    active = (started <= cutoff) & ~(completed <= cutoff)
+    if not active.any():
+        return float("nan"), float("nan"), 0
+    predicted = model.remaining(_strata(tracker)[active], cutoff - started[active])
+    actual = completed[active] - cutoff
+    resolved = actual <= holdout_days
+    error = np.abs(predicted - actual)
+    correct = np.where(resolved, error <= tolerance, predicted >= holdout_days - tolerance)
+    mae = float(error[resolved].mean()) if resolved.any() else float("nan")
+    return float(correct.mean()), mae, int(active.sum())
+
+
+def train(tracker, now=None, previous=None, holdout_days=7):
+    """增量训练并回测，返回 RefreshScheduler 快照的 data"""
+    start = time.perf_counter()
+    model, new_events = fit(tracker, now, previous)
+    fit_seconds = time.perf_counter() - start
+    accuracy, mae, samples = backtest(tracker, now, holdout_days)
+    return {
+        "model": model, "new_events": new_events, "fit_seconds": fit_seconds,
+        "accuracy": accuracy, "mae": mae, "samples": samples,
+    }
@@ -0,0 +1,156 @@
+"""
+服务端分页表格
+
+整张表只保存在服务端（Arrow 表），排序、筛选、搜索都在服务端对索引完成，
+浏览器每次只收到当前页的 Arrow 切片。
+- 每列的排序结果（行号排列）首次使用时计算并缓存，之后换页、搜索不再重新排序
+- 类别列（Arrow 字典列）按类别顺序排序（有序类别）或按取值排序
+- 搜索在预先拼接、转小写的搜索列上做子串匹配
+- 查询结果（行号数组）按 LRU 缓存，翻页只是对行号数组切片再 take
+索引只读，可在会话之间共享。
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+PAGE_SIZE = 50
+
+
+class TableIndex:
+    """一张只读表及其排序、搜索索引
+
+    frame 可以是 DataFrame 或 pyarrow.Table。
+    search_columns 为参与搜索的列，默认所有字符串列。
+    """
+
+    def __init__(self, frame, search_columns=None, cache_size=32):
+        if isinstance(frame, pa.Table):
+            self.table = frame
+        else:
+            self.table = pa.Table.from_pandas(frame, preserve_index=False)
+        self.columns = self.table.column_names
+        if search_columns is None:
+            search_columns = [f.name for f in self.table.schema if _is_text(f.type)]
+        self.search_columns = list(search_columns)
+        self.cache_size = cache_size
+        self._orders = {}
+        self._distinct = {}
+        self._search_text = None
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def num_rows(self):
+        return self.table.num_rows
+
+    # ---------- 索引 ----------
+
+    def sort_order(self, column, descending=False):
+        """按列排序后的行号（空值在最后），按 (列, 方向) 缓存"""
+        key = (column, descending)
+        order = self._orders.get(key)
+        if order is None:
+            order = pc.array_sort_indices(
+                self._sort_key(column), order="descending" if descending else "ascending",
+            ).to_numpy()
+            self._orders[key] = order
+        return order
+
+    def _sort_key(self, column):
+        values = self.table.column(column).combine_chunks()
+        if not pa.types.is_dictionary(values.type):
+            return values
+        if values.type.ordered:
+            return values.indices
+        # 无序类别按取值排序: 先给字典里的取值排名，再按编码查排名
+        return pc.take(pc.rank(values.dictionary), values.indices)
+
+    def distinct(self, column):
+        """列的去重取值，用于筛选下拉框；有序类别按类别顺序，其余按取值排序"""
+        values = self._distinct.get(column)
+        if values is None:
+            field_type = self.table.schema.field(column).type
+            if pa.types.is_dictionary(field_type) and field_type.ordered:
+                present = set(pc.unique(pc.cast(self.table.column(column), field_type.value_type)).to_pylist())
+                categories = self.table.column(column).combine_chunks().dictionary.to_pylist()
+                values = [v for v in categories if v in present]
+            else:
+                values = sorted(pc.unique(self.table.column(column)).drop_null().to_pylist())
+            self._distinct[column] = values
+        return values
+
+    def _search_column(self):
+        if self._search_text is None:
+            parts = [pc.cast(self.table.column(c), pa.string()) for c in self.search_columns]
+            parts = [pc.fill_null(p, "") for p in parts]
+            text = pc.binary_join_element_wise(*parts, "\x1f") if len(parts) > 1 else parts[0]
+            self._search_text = pc.utf8_lower(text)
+        return self._search_text
+
+    def _mask(self, search, filters):
+        mask = None
+        if search and self.search_columns:
+            mask = pc.match_substring(self._search_column(), search.strip().lower())
+        for column, values in (filters or {}).items():
+            if not values:
+                continue
+            field_type = self.table.schema.field(column).type
+            if pa.types.is_dictionary(field_type):
+                field_type = field_type.value_type
+            values = pa.array(list(values), type=field_type)
+            selected = pc.is_in(self.table.column(column), value_set=values)
+            mask = selected if mask is None else pc.and_(mask, selected)
+        if mask is None:
+            return None
+        return pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+
+    # ---------- 查询 ----------
+
+    def query(self, sort_by=None, descending=False, search="", filters=None):
+        """返回满足条件的行号（按排序顺序），结果只读"""
+        key = (
+            sort_by, descending, (search or "").strip().lower(),
+            tuple(sorted((c, tuple(v)) for c, v in (filters or {}).items() if v)),
+        )
+        with self._lock:
+            positions = self._queries.get(key)
+            if positions is not None:
+                self._queries.move_to_end(key)
+                return positions
+
+        if sort_by is None:
+            order = np.arange(self.num_rows)
+        else:
+            order = self.sort_order(sort_by, descending)
+        mask = self._mask(search, filters)
+        positions = order if mask is None else order[mask[order]]
+        positions.flags.writeable = False
+
+        with self._lock:
+            self._queries[key] = positions
+            while len(self._queries) > self.cache_size:
+                self._queries.popitem(last=False)
+        return positions
+
+    def page(self, positions, page, page_size=PAGE_SIZE):
+        """取第 page 页（从 0 开始）的 Arrow 切片"""
+        start = page * page_size
+        return self.table.take(positions[start:start + page_size])
+
+    def page_frame(self, positions, page, page_size=PAGE_SIZE):
+        """当前页转换为 DataFrame（类别列恢复为 pandas Categorical）"""
+        return self.page(positions, page, page_size).to_pandas()
+
+    @staticmethod
+    def page_count(positions, page_size=PAGE_SIZE):
+        return max(1, -(-len(positions) // page_size))
+
+
+def _is_text(data_type):
+    if pa.types.is_dictionary(data_type):
+        data_type = data_type.value_type
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
@@ -0,0 +1,163 @@
+"""
+增量维护的高潜力卖家 Top-K 索引
+
+每个 (Country, Tier) 桶维护一个按排序键的大顶堆和一份缓存好的 Top-K 列表。
+GMV / WoW 增长的增量更新只重新评分变化的卖家并把新条目压入堆（旧条目惰性作废），
+只有当变化可能影响某个桶的 Top-K 时才把该桶标记为脏。
+查询干净的桶直接返回缓存列表，多个桶之间只合并各自的 K 个候选，不再全表排序。
+"""
+
+import heapq
+import threading
+
+import numpy as np
+
+from grow.scoring import score_sellers, rank_keys, format_high_potential
+
+
+class _Bucket:
+    __slots__ = ("heap", "top", "dirty", "size")
+
+    def __init__(self):
+        self.heap = []      # (-key, version, pos)
+        self.top = []       # 缓存的 Top-K: [(key, pos), ...] 降序
+        self.dirty = True
+        self.size = 0
+
+
+class TopKIndex:
+    """按国家和层级分桶的高潜力卖家 Top-K 索引
+
+    seller_data / ai_analysis 为行对齐的 DataFrame，索引会复制需要更新的列，不修改原表。
+    """
+
+    def __init__(self, seller_data, ai_analysis, k=10):
+        self.k = k
+        self._lock = threading.Lock()
+
+        self.seller_ids = seller_data["Seller_ID"].to_numpy(dtype=np.int64)
+        self.sellers = seller_data["Seller"].to_numpy(dtype=object)
+        self.countries = seller_data["Country"].to_numpy(dtype=object)
+        self.tiers = seller_data["Tier"].to_numpy(dtype=object)
+        self.gmv = seller_data["GMV"].to_numpy(dtype=np.float64).copy()
+        self.growth_rate = seller_data["Growth Rate"].to_numpy(dtype=np.float64).copy()
+        self.compliance = seller_data["Compliance Score"].to_numpy(dtype=np.float64)
+        self.active_days = seller_data["Active Days"].to_numpy(dtype=np.float64)
+        self.sentiment = ai_analysis["VOS_Sentiment"].to_numpy(dtype=np.float64)
+        self.recommendation = ai_analysis["AI_Recommendation"].to_numpy(dtype=object)
+
+        order = np.argsort(self.seller_ids, kind="stable")
+        self._id_order = order
+        self._sorted_ids = self.seller_ids[order]
+
+        n = len(self.seller_ids)
+        self.version = np.zeros(n, dtype=np.int64)
+        self.revenue_potential = np.zeros(n, dtype=np.float64)
+        self.keys = np.zeros(n, dtype=np.float64)
+        self._rescore(np.arange(n))
+
+        self.buckets = {}
+        self._bucket_of = [None] * n
+        groups = seller_data.groupby(["Country", "Tier"], sort=False, observed=True).indices
+        for name, members in groups.items():
+            bucket = self.buckets[name] = _Bucket()
+            bucket.heap = list(zip((-self.keys[members]).tolist(), [0] * len(members), members.tolist()))
+            heapq.heapify(bucket.heap)
+            bucket.size = len(members)
+            for pos in members.tolist():
+                self._bucket_of[pos] = name
+
+    def _rescore(self, positions):
+        scores = score_sellers(
+            self.gmv[positions], self.growth_rate[positions], self.compliance[positions],
+            self.active_days[positions], self.sentiment[positions],
+        )
+        self.revenue_potential[positions] = scores["Revenue_Potential"]
+        self.keys[positions] = rank_keys(scores["AI_Growth_Score"], scores["Revenue_Potential"])
+
+    def positions(self, seller_ids):
+        """Seller_ID → 行位置"""
+        seller_ids = np.asarray(seller_ids, dtype=np.int64)
+        found = np.searchsorted(self._sorted_ids, seller_ids)
+        found = np.minimum(found, len(self._sorted_ids) - 1)
+        if len(seller_ids) and not (self._sorted_ids[found] == seller_ids).all():
+            raise KeyError("未知的 Seller_ID")
+        return self._id_order[found]
+
+    def update(self, seller_ids, gmv=None, growth_rate=None):
+        """应用一批卖家的最新 GMV / WoW 增长，返回被标记为脏的桶数"""
+        with self._lock:
+            positions = self.positions(seller_ids)
+            if gmv is not None:
+                self.gmv[positions] = gmv
+            if growth_rate is not None:
+                self.growth_rate[positions] = growth_rate
+            self._rescore(positions)
+
+            dirty = 0
+            for pos in positions.tolist():
+                self.version[pos] += 1
+                bucket = self.buckets[self._bucket_of[pos]]
+                key = self.keys[pos]
+                heapq.heappush(bucket.heap, (-key, int(self.version[pos]), pos))
+                if bucket.dirty:
+                    continue
+                # 只有进入、离开或在 Top-K 内部移动才需要重建该桶的缓存
+                in_top = any(p == pos for _, p in bucket.top)
+                if in_top or len(bucket.top) < self.k or key > bucket.top[-1][0]:
+                    bucket.dirty = True
+                    dirty += 1
+            return dirty
+
+    def refresh(self, seller_data):
+        """与最新的卖家表对比，只把 GMV / Growth Rate 有变化的卖家作为增量应用"""
+        positions = self.positions(seller_data["Seller_ID"].to_numpy())
+        gmv = seller_data["GMV"].to_numpy(dtype=np.float64)
+        growth = seller_data["Growth Rate"].to_numpy(dtype=np.float64)
+        changed = np.flatnonzero((self.gmv[positions] != gmv) | (self.growth_rate[positions] != growth))
+        if len(changed):
+            self.update(seller_data["Seller_ID"].to_numpy()[changed], gmv[changed], growth[changed])
+        return len(changed)
+
+    def _rebuild(self, bucket):
+        """从堆顶取出 K 个有效条目，顺便丢弃作废条目"""
+        top = []
+        while bucket.heap and len(top) < self.k:
+            neg_key, version, pos = heapq.heappop(bucket.heap)
+            if version == self.version[pos]:
+                top.append((-neg_key, pos))
+        for key, pos in top:
+            heapq.heappush(bucket.heap, (-key, int(self.version[pos]), pos))
+        # 作废条目过多时整体压缩
+        if len(bucket.heap) > 2 * bucket.size + 1024:
+            bucket.heap = [e for e in bucket.heap if e[1] == self.version[e[2]]]
+            heapq.heapify(bucket.heap)
+        bucket.top = top
+        bucket.dirty = False
+
+    def top(self, k=None, countries=None, tiers=None):
+        """当前 Top-K 卖家的行位置（降序）
+
+        干净的桶直接使用缓存，只在各桶的 K 个候选之间合并。
+        """
+        k = self.k if k is None else min(k, self.k)
+        with self._lock:
+            candidates = []
+            for (country, tier), bucket in self.buckets.items():
+                if countries is not None and country not in countries:
+                    continue
+                if tiers is not None and tier not in tiers:
+                    continue
+                if bucket.dirty:
+                    self._rebuild(bucket)
+                candidates.extend(bucket.top[:k])
+        best = heapq.nlargest(k, candidates)
+        return np.array([pos for _, pos in best], dtype=np.int64)
+
+    def table(self, k=3, countries=None, tiers=None):
+        """Goal 页面的高潜力卖家展示表"""
+        idx = self.top(k, countries, tiers)
+        return format_high_potential(
+            self.sellers[idx], self.growth_rate[idx], self.gmv[idx],
+            self.recommendation[idx], self.revenue_potential[idx],
+        )
@@ -1,531 +1,900 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import random
-
-# 设置页面配置
-st.set_page_config(
-    page_title="GROW AI Assistant",
-    page_icon="🚀",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# 自定义CSS样式
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        text-align: center;
-        margin-bottom: 2rem;
-        background: linear-gradient(90deg, #FF6B6B, #4ECDC4);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #4ECDC4;
-    }
-    .success-box {
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        border-radius: 0.25rem;
-        padding: 0.75rem;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 主标题
-st.markdown('<h1 class="main-header">🚀 GROW AI Assistant</h1>', unsafe_allow_html=True)
-st.markdown("**智能卖家管理平台 - 基于重新定义的GROW方法论**")
-
-# 侧边栏配置
-with st.sidebar:
-    st.header("🎛️ 系统配置")
-    
-    # 数据刷新设置
-    auto_refresh = st.checkbox("自动刷新数据", value=True)
-    refresh_interval = st.selectbox("刷新间隔", ["5分钟", "15分钟", "30分钟", "1小时"])
-    
-    # 地区设置
-    st.subheader("🌏 地区设置")
-    selected_countries = st.multiselect(
-        "选择国家/地区",
-        ["SG", "MY", "TH", "ID", "VN", "PH"],
-        default=["SG", "MY", "TH"]
+from datetime import datetime
+import os
+import time
+
+from grow.lazy import LazyModule
+from grow.scheduler import RefreshScheduler
+
+# 延迟导入: 导入本模块只加载 streamlit，pandas、pyarrow、plotly 和各计算模块
+# 在第一次用到时才导入（只渲染当前标签页，见 main()），冷启动不为未打开的标签页付费
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+actions = LazyModule("grow.actions")
+adoption = LazyModule("grow.adoption")
+attribution = LazyModule("grow.attribution")
+cadence = LazyModule("grow.cadence")
+charts = LazyModule("grow.charts")
+connectors = LazyModule("grow.connectors")
+datastore = LazyModule("grow.datastore")
+dispatch = LazyModule("grow.dispatch")
+export = LazyModule("grow.export")
+forecast = LazyModule("grow.forecast")
+formatting = LazyModule("grow.formatting")
+funnels = LazyModule("grow.funnels")
+kpi_cube = LazyModule("grow.kpi_cube")
+matching = LazyModule("grow.matching")
+onboarding = LazyModule("grow.onboarding")
+recommender = LazyModule("grow.recommender")
+schema = LazyModule("grow.schema")
+scorecard = LazyModule("grow.scorecard")
+scoring = LazyModule("grow.scoring")
+survival = LazyModule("grow.survival")
+table_view = LazyModule("grow.table_view")
+topk = LazyModule("grow.topk")
+
+# 页面结构
+# main() 依次渲染侧边栏、当前打开的标签页和页脚（未打开的标签页不运行，
+# 也不导入它用到的计算模块）。每个带交互控件的面板都是一个
+# st.fragment: 在面板内点击按钮、拖动滑块只重新运行该面板，不会重新执行其他标签页。
+# 面板从会话状态（侧边栏控件的 key）和进程内缓存读取数据，不依赖外层变量，
+# 因此片段单独重跑时看到的输入与整页运行一致。
+# 作为模块导入（测试、基准）时不会渲染页面。
+
+def setup_page():
+    """页面配置、样式和标题"""
+    # 设置页面配置
+    st.set_page_config(
+        page_title="GROW AI Assistant",
+        page_icon="🚀",
+        layout="wide",
+        initial_sidebar_state="expanded"
     )
-    
-    # 语言设置
-    language = st.selectbox("界面语言", ["中文", "English"])
-    
-    # 系统状态
-    st.subheader("📊 系统状态")
-    st.success("🟢 所有服务正常")
-    st.info("📡 数据同步: 2分钟前")
-    st.info("🤖 AI服务: 正常")
-
-# 生成模拟数据
-@st.cache_data
-def generate_mock_data():
-    """生成模拟的卖家数据"""
-    np.random.seed(42)
-    
-    sellers = [
-        "TechGiant_SG", "ElectroMax_ID", "FashionHub_MY", "BeautyPro_VN", 
-        "HomeDecor_TH", "SportsPro_PH", "GadgetWorld_SG", "StyleMax_MY",
-        "KitchenPro_TH", "HealthPlus_ID"
-    ]
-    
-    seller_data = pd.DataFrame({
-        "Seller": sellers,
-        "Country": ["SG", "ID", "MY", "VN", "TH", "PH", "SG", "MY", "TH", "ID"],
-        "Category": ["Electronics", "Electronics", "Fashion", "Beauty", "Home", 
-                    "Sports", "Electronics", "Fashion", "Home", "Health"],
-        "GMV": np.random.randint(20000, 200000, 10),
-        "Growth Rate": np.random.uniform(-5, 25, 10),
-        "Compliance Score": np.random.randint(60, 95, 10),
-        "Active Days": np.random.randint(30, 365, 10),
-        "Tier": np.random.choice(["T0", "T1", "T2", "T3"], 10, p=[0.1, 0.2, 0.4, 0.3])
-    })
-    
-    # AI分析结果
-    ai_analysis = pd.DataFrame({
-        "Seller": sellers,
-        "AI_Growth_Score": np.random.randint(60, 95, 10),
-        "Product_Gap_Count": np.random.randint(0, 15, 10),
-        "Compliance_Risk": np.random.choice(["Low", "Medium", "High"], 10, p=[0.6, 0.3, 0.1]),
-        "VOS_Sentiment": np.random.uniform(3.0, 5.0, 10),
-        "Revenue_Potential": np.random.randint(10000, 80000, 10),
-        "AI_Recommendation": [
-            "扩展产品线", "优化listing质量", "提升合规分数", "增加广告投入",
-            "改善客户服务", "扩展到新类目", "优化价格策略", "提升品牌形象",
-            "增加库存深度", "改善物流效率"
-        ]
-    })
-    
+
+    # 自定义CSS样式
+    st.markdown("""
+    <style>
+        .main-header {
+            font-size: 2.5rem;
+            font-weight: bold;
+            text-align: center;
+            margin-bottom: 2rem;
+            background: linear-gradient(90deg, #FF6B6B, #4ECDC4);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        .metric-card {
+            background-color: #f0f2f6;
+            padding: 1rem;
+            border-radius: 0.5rem;
+            border-left: 4px solid #4ECDC4;
+        }
+        .success-box {
+            background-color: #d4edda;
+            border: 1px solid #c3e6cb;
+            border-radius: 0.25rem;
+            padding: 0.75rem;
+            margin: 1rem 0;
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # 主标题
+    st.markdown('<h1 class="main-header">🚀 GROW AI Assistant</h1>', unsafe_allow_html=True)
+    st.markdown("**智能卖家管理平台 - 基于重新定义的GROW方法论**")
+
+# 卖家数据存储（按国家分区的 Parquet 数据集，首次运行时用模拟数据初始化）
+MOCK_SELLER_COUNT = int(os.environ.get("GROW_MOCK_SELLERS", "2000"))
+# 跨市场潜在卖家池规模
+MOCK_PROSPECT_COUNT = int(os.environ.get("GROW_MOCK_PROSPECTS", "20000"))
+# 入驻中的卖家数量
+MOCK_ONBOARDING_COUNT = int(os.environ.get("GROW_MOCK_ONBOARDING", "20000"))
+
+@st.cache_resource
+def get_seller_store():
+    """进程内共享的卖家数据存储"""
+    return datastore.SellerStore().ensure(MOCK_SELLER_COUNT)
+
+# 外部数据源（Quicksight, VOS Hub, Selection AI），通过 GROW_*_URL 环境变量配置
+@st.cache_resource
+def get_connector_pool():
+    """进程内共享的数据源连接池，未配置任何数据源时返回 None"""
+    sources = connectors.sources_from_env()
+    return connectors.ConnectorPool(sources) if sources else None
+
+REFRESH_INTERVALS = {"5分钟": 300, "15分钟": 900, "30分钟": 1800, "1小时": 3600}
+
+@st.cache_resource
+def get_refresh_scheduler():
+    """进程内唯一的后台刷新调度器，定期拉取数据源并重新映射有更新的卖家数据"""
+    store, pool = get_seller_store(), get_connector_pool()
+
+    def refresh():
+        return {
+            "seller_table": store.mapped(),
+            "sources": pool.fetch_all_sync() if pool else {},
+        }
+
+    return RefreshScheduler(refresh, REFRESH_INTERVALS["5分钟"]).start()
+
+COUNTRY_OPTIONS = ["SG", "MY", "TH", "ID", "VN", "PH"]
+DEFAULT_COUNTRIES = ["SG", "MY", "TH"]
+
+def render_sidebar():
+    """侧边栏配置"""
+    with st.sidebar:
+        st.header("🎛️ 系统配置")
+
+        # 数据刷新设置
+        auto_refresh = st.checkbox("自动刷新数据", value=True)
+        refresh_interval = st.selectbox("刷新间隔", ["5分钟", "15分钟", "30分钟", "1小时"])
+
+        # 地区设置
+        st.subheader("🌏 地区设置")
+        st.multiselect(
+            "选择国家/地区",
+            COUNTRY_OPTIONS,
+            default=DEFAULT_COUNTRIES,
+            key="selected_countries",
+        )
+
+        # 语言设置
+        language = st.selectbox("界面语言", ["中文", "English"])
+
+        # 系统状态
+        st.subheader("📊 系统状态")
+        scheduler = get_refresh_scheduler()
+        scheduler.configure(interval=REFRESH_INTERVALS[refresh_interval], enabled=auto_refresh)
+        snapshot = scheduler.snapshot
+        source_results = snapshot.data.get("sources", {})
+        if all(r.ok for r in source_results.values()) and not scheduler.last_error:
+            st.success("🟢 所有服务正常")
+        for result in source_results.values():
+            if result.ok:
+                st.caption(f"🟢 {result.name}: {result.elapsed * 1000:.0f}ms")
+            else:
+                st.warning(f"🔴 {result.name}: {result.error}")
+        if scheduler.last_error:
+            st.warning(f"⚠️ 最近一次刷新失败: {scheduler.last_error}")
+        st.info(f"📡 数据同步: {snapshot.age_label()} (耗时 {snapshot.duration * 1000:.0f}ms)")
+        st.info("🤖 AI服务: 正常")
+
+@st.cache_resource
+def get_recommendation_service():
+    """AI推荐服务（批量、去重、SQLite 持久化缓存）"""
+    cache = recommender.RecommendationCache(get_seller_store().root / "recommendations.sqlite")
+    return recommender.RecommendationService(recommender.backend_from_env(), cache)
+
+def analyse_sellers(seller_data, raw_analysis):
+    """基于卖家数据重新计算评分和AI推荐"""
+    ai_analysis = scoring.score_frame(seller_data, raw_analysis)
+    ai_analysis["AI_Recommendation"] = recommender.recommend_for_sellers(
+        get_recommendation_service(), seller_data, ai_analysis
+    )
+    return ai_analysis
+
+@st.cache_resource
+def get_action_store():
+    """优先级调整和行动计划存储（SQLite WAL，后台批量写入，进程内共享）"""
+    return actions.ActionStore(get_seller_store().root / "actions.sqlite")
+
+def action_store_status(store):
+    """提交失败时提示尚未保存的修改（后台会自动重试）"""
+    if store.last_error:
+        st.warning(f"⚠️ {store.pending():,} 项修改尚未保存，正在重试: {store.last_error}")
+
+@st.cache_resource(max_entries=16)
+def load_seller_data(countries, version):
+    """只读取所选国家的卖家数据和AI分析结果
+
+    数据来自最新刷新快照中的内存映射表，各会话共用同一份只读 DataFrame，不要原地修改。
+    version 为快照版本号，快照更新后自动加载新数据。
+    """
+    table = get_refresh_scheduler().snapshot.data.get("seller_table")
+    if table is None:
+        table = get_seller_store().mapped()
+    seller_data = table.to_pandas(datastore.SELLER_COLUMNS, countries)
+    ai_analysis = analyse_sellers(seller_data, table.to_pandas(datastore.AI_COLUMNS, countries))
     return seller_data, ai_analysis
 
-# 加载数据
-seller_data, ai_analysis = generate_mock_data()
+@st.cache_resource
+def get_high_potential_index():
+    """全量卖家的高潜力 Top-K 索引，进程内共享，按增量更新"""
+    table = get_seller_store().mapped()
+    seller_data = table.to_pandas(datastore.SELLER_COLUMNS)
+    return topk.TopKIndex(seller_data, analyse_sellers(seller_data, table.to_pandas(datastore.AI_COLUMNS)), k=10)
+
+@st.cache_resource
+def get_kpi_cube():
+    """按 国家×层级×类目×周 预聚合的 ICQ 指标立方体"""
+    table = get_seller_store().mapped()
+    return kpi_cube.build_cube(datastore.iter_mock_weekly_facts(table.to_pandas(datastore.SELLER_COLUMNS)))
+
+@st.cache_resource
+def get_adoption_index():
+    """全量卖家的功能采用位图索引（进程内共享）"""
+    seller_data = get_seller_store().mapped().to_pandas(datastore.SELLER_COLUMNS)
+    return adoption.AdoptionIndex.from_frame(seller_data, adoption.generate_mock_adoption(seller_data))
+
+@st.cache_resource
+def get_scorecard_path():
+    """全量卖家的绩效记分卡: 由原始 Listing、广告、库存表按卖家分块计算，写入 Parquet"""
+    store = get_seller_store()
+    sellers = store.mapped().to_pandas(["Seller_ID", "Seller", "Country"])
+    raw_dir = store.root / "raw"
+    if not raw_dir.exists():
+        scorecard.write_mock_raw_tables(raw_dir, sellers)
+    path = store.root / "scorecard.parquet"
+    scorecard.build_scorecard(raw_dir, sellers, path)
+    return path
+
+@st.cache_resource(max_entries=16)
+def get_scorecard(countries):
+    """所选国家卖家的绩效记分卡"""
+    frame = scorecard.load_scorecard(get_scorecard_path(), countries)[["卖家", *schema.PERFORMANCE_SCORECARD.dtypes]]
+    return table_view.TableIndex(schema.PERFORMANCE_SCORECARD.apply(frame), search_columns=["卖家"])
+
+@st.cache_resource
+def get_daily_gmv():
+    """全量卖家过去两年的每日 GMV（天 × 卖家矩阵，内存映射）和各功能的启用日"""
+    store = get_seller_store()
+    seller_data = store.mapped().to_pandas(datastore.SELLER_COLUMNS)
+    enabled = attribution.generate_mock_enablement(seller_data)
+    return seller_data, enabled, attribution.write_mock_daily_gmv(store.root / "daily_gmv.npy", seller_data, enabled)
+
+@st.cache_resource
+def get_revenue_attribution():
+    """全量卖家的收入提升归因（按卖家分块做双重差分）"""
+    seller_data, enabled, gmv = get_daily_gmv()
+    result = attribution.attribute(gmv, enabled)
+    return result.assign(国家=seller_data["Country"].to_numpy()), attribution.revenue_lift_table(seller_data, result)
+
+@st.cache_resource(max_entries=16)
+def get_revenue_lift(countries):
+    """所选国家卖家的收入提升表，以及各功能的提升中位数"""
+    lifts, table = get_revenue_attribution()
+    table = table[table["国家"].isin(countries)].drop(columns="国家")
+    feature_lift = lifts.loc[lifts["国家"].isin(countries), schema.FEATURE_FLAGS].median()
+    return table_view.TableIndex(schema.REVENUE_LIFT.apply(table), search_columns=["卖家"]), feature_lift
+
+# 增长预测的后台重新计算间隔（秒）
+FORECAST_REFRESH_INTERVAL = 3600
+
+@st.cache_resource
+def get_growth_forecaster():
+    """进程内共享的增长预测，后台定期按最新周 GMV 重新预测（快照 data 见 GrowthForecaster.run）
+
+    预测结果按卖家缓存在 data/forecast_cache.npz，只重新拟合周 GMV 有变化的卖家。
+    """
+    seller_data, _, gmv = get_daily_gmv()
+    forecaster = forecast.GrowthForecaster(forecast.ForecastCache(get_seller_store().root / "forecast_cache.npz"))
+    return RefreshScheduler(
+        lambda: forecaster.run(seller_data["Seller_ID"], forecast.weekly_from_daily(gmv)),
+        FORECAST_REFRESH_INTERVAL,
+    ).start()
+
+@st.cache_resource(max_entries=16)
+def get_growth_potential(countries, version):
+    """所选国家卖家的增长潜力表（按预测增长从高到低）
+
+    当前表现来自绩效记分卡的整体评分，功能采用为已启用功能的比例。
+    """
+    seller_data, _, _ = get_daily_gmv()
+    adoption_index = get_adoption_index()
+    grades = scorecard.load_scorecard(get_scorecard_path()).set_index("Seller_ID")["整体评分"]
+    frame = pd.DataFrame({
+        "卖家": seller_data["Seller"].to_numpy(),
+        "当前表现": grades.reindex(seller_data["Seller_ID"]).map(scorecard.PERFORMANCE_BY_GRADE).to_numpy(),
+        "功能采用": adoption_index.seller_table(adoption_index.universe)["采用率"].to_numpy(),
+    })
+    frame = frame.join(get_growth_forecaster().snapshot.data["forecast"])
+    frame = frame[seller_data["Country"].isin(countries).to_numpy()]
+    frame = frame.sort_values("预测增长", ascending=False, kind="stable", ignore_index=True)
+    return table_view.TableIndex(schema.GROWTH_POTENTIAL.apply(frame), search_columns=["卖家"])
+
+@st.cache_resource
+def get_prospect_index():
+    """潜在卖家池的跨市场匹配结果，按目标市场查询 Top-N（进程内共享）"""
+    table = get_seller_store().mapped()
+    matcher = matching.ProspectMatcher(table.to_pandas(datastore.SELLER_COLUMNS), table.to_pandas(datastore.AI_COLUMNS))
+    return matching.MatchIndex(matcher.match(matching.generate_mock_prospects(MOCK_PROSPECT_COUNT)))
+
+@st.cache_resource
+def get_cadence_engine():
+    """潜在卖家接触节奏引擎（后台线程按时间轮批量发送，进程内共享）
+
+    演示数据: 潜在卖家池在过去3周内陆续加入节奏，回复按历史响应率模拟。
+    """
+    engine = cadence.CadenceEngine(cadence.senders_from_env(), on_sent=cadence.simulate_responses)
+    prospects = get_prospect_index().matched["卖家"]
+    joined = datetime.now().timestamp() - np.random.RandomState(5).uniform(0, 21, len(prospects)) * cadence.DAY
+    engine.enroll(prospects, joined)
+    return engine.start()
+
+@st.cache_resource
+def get_funnels():
+    """招募和入驻漏斗的事件计数器（由模拟的阶段变化事件生成，进程内共享）"""
+    prospects = get_prospect_index().matched
+    return funnels.build_mock_funnels(prospects, days=max(FUNNEL_PERIODS.values()))
+
+@st.cache_resource
+def get_milestone_tracker():
+    """所有入驻中卖家的里程碑状态（进程内共享）"""
+    return onboarding.generate_mock_onboarding(MOCK_ONBOARDING_COUNT)
 
-# 创建四个主要标签页
-tab1, tab2, tab3, tab4 = st.tabs([
-    "🎯 Goal - 目标设定和绩效跟踪", 
-    "🔍 Recruitment - 卖家招募自动化", 
-    "📋 Onboarding - 入驻流程管理", 
-    "🚀 Win - 卖家增长和成功管理"
-])
+@st.cache_resource(max_entries=16)
+def get_onboarding_report(countries, minute):
+    """所选国家入驻卖家的里程碑表、干预行动和瓶颈汇总（按分钟重新评估 SLA）"""
+    tracker = get_milestone_tracker()
+    rows = tracker.rows_for(countries)
+    result = tracker.evaluate(rows=rows)
+    interventions = schema.INTERVENTION_ACTIONS.apply(tracker.interventions(rows, result))
+    return {
+        "milestones": table_view.TableIndex(schema.ONBOARDING_MILESTONES.apply(tracker.milestone_table(rows, result)),
+                                 search_columns=["卖家"]),
+        "interventions": table_view.TableIndex(interventions, search_columns=["卖家", "识别问题"]),
+        "top_interventions": interventions.head(3),
+        "bottlenecks": tracker.bottlenecks(result),
+    }
+
+# 入驻完成时间模型的后台重新训练间隔（秒）
+MODEL_RETRAIN_INTERVAL = 3600
+
+@st.cache_resource
+def get_completion_model():
+    """进程内共享的入驻完成时间模型，后台定期增量重新训练（快照 data 见 grow.survival.train）"""
+    tracker = get_milestone_tracker()
+    scheduler = RefreshScheduler(
+        lambda: survival.train(tracker, previous=scheduler.snapshot.data.get("model")),
+        MODEL_RETRAIN_INTERVAL,
+    )
+    return scheduler.start()
+
+@st.cache_resource(max_entries=16)
+def get_time_prediction(countries, version, minute):
+    """所选国家入驻中卖家的完成时间预测（一次批量推理）"""
+    tracker = get_milestone_tracker()
+    model = get_completion_model().snapshot.data["model"]
+    start = time.perf_counter()
+    table = model.prediction_table(tracker, tracker.rows_for(countries))
+    latency = time.perf_counter() - start
+    return table_view.TableIndex(schema.TIME_PREDICTION.apply(table), search_columns=["卖家"]), latency
+
+@st.cache_resource
+def get_dispatcher():
+    """进程内共享的批量发送器（渲染进程池 + 后台发送线程）"""
+    return dispatch.Dispatcher(dispatch.mailer_from_env())
+
+def dispatch_status(key, label):
+    """会话中最近一次发送任务的进度；进行中时每秒刷新，完成后显示结果"""
+    job = st.session_state.get(key)
+    if job is None:
+        return
+
+    def show():
+        if not job.done:
+            st.progress(job.progress, text=f"📤 {job.state}: 已发送 {job.sent:,} / {job.total:,} 个卖家")
+            if st.button("取消发送", key=f"{key}_cancel"):
+                job.cancel()
+            return
+        if polling:
+            # 完成后整页重新运行一次，停止轮询
+            st.rerun()
+        if job.state == "失败":
+            st.error(f"❌ 发送失败: {job.last_error}")
+        elif job.state == "已取消":
+            st.info(f"已取消: 已发送 {job.sent:,} / {job.total:,} 个卖家")
+        else:
+            st.success(f"✅ 已向 {job.sent:,} 个卖家发送{label}（{job.elapsed:.1f} 秒）！")
+        if job.failed:
+            st.warning(f"⚠️ {job.failed:,} 封发送失败: {job.last_error}")
+
+    polling = not job.done
+    if polling:
+        st.fragment(show, run_every=1.0)()
+    else:
+        show()
+
+def current_onboarding_report():
+    return get_onboarding_report(tuple(selected_countries()), int(datetime.now().timestamp() // 60))
+
+FUNNEL_PERIODS = {"近30天": 30, "近90天": 90, "近180天": 180}
+# 每个国家/地区的月度签约目标
+RECRUITMENT_MONTHLY_TARGET = 70
+
+def funnel_window(key):
+    """漏斗统计周期选择框（key）对应的本期和上期起止日期"""
+    days = FUNNEL_PERIODS[st.session_state.get(key, "近90天")]
+    end = pd.Timestamp.now().normalize()
+    start = end - pd.Timedelta(days=days - 1)
+    return (start, end), (start - pd.Timedelta(days=days), start - pd.Timedelta(days=1))
+
+def selected_countries():
+    """侧边栏所选的国家/地区（片段单独重跑时同样可用）"""
+    return st.session_state.get("selected_countries", DEFAULT_COUNTRIES)
+
+def current_seller_data():
+    """所选国家在当前快照下的卖家数据和AI分析结果"""
+    return load_seller_data(tuple(selected_countries()), get_refresh_scheduler().snapshot.version)
+
+@st.cache_resource(max_entries=16)
+def get_seller_table_index(countries, version):
+    """卖家明细表的服务端索引（排序、搜索结果在会话之间共享）"""
+    seller_data, ai_analysis = load_seller_data(countries, version)
+    frame = schema.SELLER_DETAIL.apply(seller_data.join(ai_analysis.drop(columns=["Seller_ID", "Seller"])))
+    return table_view.TableIndex(frame, search_columns=["Seller_ID", "Seller", "Category", "AI_Recommendation"])
+
+def render_paged_table(index, key, page_size=None, filter_columns=(), formats=None):
+    """服务端分页表格: 只把当前页发送到浏览器
+
+    不超过一页的表直接显示；更大的表显示搜索、筛选、排序和页码控件，
+    查询在服务端索引上完成。放在片段内使用，翻页只重跑所在面板。
+    formats 为 {列名: 格式名}，只对当前页做显示格式化，排序仍按数值进行。
+    """
+    page_size = page_size or table_view.PAGE_SIZE
+    if index.num_rows <= page_size:
+        page = index.page_frame(index.query(), 0, page_size)
+        st.dataframe(formatting.format_frame(page, formats), use_container_width=True, hide_index=True)
+        export_menu(index, key)
+        return
+
+    search_col, sort_col, order_col = st.columns([3, 2, 1])
+    with search_col:
+        search = st.text_input("搜索", key=f"{key}_search", placeholder="卖家名称、ID、类目…")
+    with sort_col:
+        sort_by = st.selectbox("排序", [None, *index.columns], key=f"{key}_sort",
+                               format_func=lambda c: "默认顺序" if c is None else c)
+    with order_col:
+        descending = st.toggle("降序", key=f"{key}_desc")
+
+    filters = {}
+    if filter_columns:
+        for column, filter_col in zip(filter_columns, st.columns(len(filter_columns))):
+            with filter_col:
+                filters[column] = st.multiselect(column, index.distinct(column), key=f"{key}_filter_{column}")
+
+    positions = index.query(sort_by, descending, search, filters)
+    pages = index.page_count(positions, page_size)
+    # 搜索或筛选后页数变少时，把页码收回到有效范围
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = st.number_input("页码", min_value=1, max_value=pages, step=1, key=page_key)
+
+    page_frame = formatting.format_frame(index.page_frame(positions, page - 1, page_size), formats)
+    st.dataframe(page_frame, use_container_width=True, hide_index=True)
+    st.caption(f"第 {page}/{pages} 页 · 共 {len(positions):,} 行（仅加载当前页）")
+    export_menu(index, key, positions)
+
+def export_bytes(source, extension, rows=None):
+    """逐批导出为文件内容（下载按钮的延迟生成回调）
+
+    写出是逐批的，但返回的是完整文件的 bytes: st.download_button 无论拿到 bytes
+    还是文件对象都会整个读入媒体存储，返回文件对象也不会少这一份，还要等它被回收才关闭临时文件。
+    """
+    with export.export(source, extension, rows=rows) as output:
+        return output.read()
+
+def export_menu(index, key, positions=None):
+    """导出当前搜索、筛选和排序后的全部行（不只当前页）
+
+    文件在点击下载时才逐批生成，页面重跑和会话状态中都不保存文件内容。
+    """
+    with st.popover("⬇️ 导出"):
+        name = st.radio("格式", list(export.EXPORT_FORMATS), horizontal=True, key=f"{key}_export_format")
+        extension, mime = export.EXPORT_FORMATS[name]
+        st.download_button(f"下载 {name}", lambda: export_bytes(index, extension, positions),
+                           file_name=f"{key}.{extension}", mime=mime, on_click="ignore", key=f"{key}_export")
+
+def paged_dataframe(frame, key, table_schema=None, **kwargs):
+    """为一次性构建的表创建索引并分页显示，按 table_schema 的格式渲染"""
+    formats = table_schema.formats if table_schema is not None else None
+    render_paged_table(table_view.TableIndex(frame), key, formats=formats, **kwargs)
 
 # ----------------------
 # 1️⃣ Goal Module - 目标设定和绩效跟踪
 # ----------------------
-with tab1:
+def render_goal_tab():
     st.header("🎯 Goal - 目标设定和绩效跟踪")
     st.info("📊 明确定义和跟踪个人AM业务目标，确保与组织目标保持一致")
-    
+
     # 核心KPI仪表板
     st.subheader("📊 核心KPI仪表板")
-    
-    # ICQ指标数据 - 显示实际值、目标值和WoW变化
-    icq_col1, icq_col2, icq_col3, icq_col4, icq_col5 = st.columns(5)
-    
-    with icq_col1:
-        st.metric("Launched Sellers", "45", delta="+3 WoW", delta_color="normal")
-        st.caption("目标: 50 (缺口: -5)")
-    with icq_col2:
-        st.metric("FBA Adopted Sellers", "28", delta="+2 WoW", delta_color="normal")
-        st.caption("目标: 30 (缺口: -2)")
-    with icq_col3:
-        st.metric("FBA BA Count", "15", delta="+1 WoW", delta_color="normal")
-        st.caption("目标: 12 (超额: +3)")
-    with icq_col4:
-        st.metric("GMS", "$2.8M", delta="+$0.3M WoW", delta_color="normal")
-        st.caption("目标: $3.0M (缺口: -$0.2M)")
-    with icq_col5:
-        st.metric("Ads Adoption Rate", "67%", delta="+2% WoW", delta_color="normal")
-        st.caption("目标: 70% (缺口: -3%)")
-    
+
+    # ICQ指标数据 - 显示实际值、目标值和WoW变化（来自预聚合立方体）
+    cube = get_kpi_cube()
+    icq_columns = st.columns(5)
+
+    for icq_col, metric in zip(icq_columns, kpi_cube.icq_metrics(cube, selected_countries())):
+        with icq_col:
+            st.metric(metric["label"], metric["value"], delta=metric["delta"], delta_color="normal")
+            st.caption(metric["caption"])
+
     st.markdown("---")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        st.subheader("🔍 AI行动计划推荐")
-        
-        # 基于缺口的AI推荐
-        st.write("**基于当前绩效缺口的AI推荐：**")
-        
-        recommendations = [
-            {
-                "问题": "GMS缺口较大 (-$0.2M)",
-                "AI推荐": "重点关注高潜力卖家 TechGiant_SG (WoW增长+25%)",
-                "预期影响": "+$150K GMS",
-                "优先级": "🔴 高"
-            },
-            {
-                "问题": "FBA采用率低于目标",
-                "AI推荐": "推荐ElectroMax_ID进行FBA BA扩展 (当前GMS强劲)",
-                "预期影响": "+5个FBA BA",
-                "优先级": "🟡 中"
-            },
-            {
-                "问题": "Listing质量缺口",
-                "AI推荐": "优先处理FashionHub_MY的图片和标题优化",
-                "预期影响": "+15%转化率",
-                "优先级": "🟡 中"
-            }
-        ]
-        
-        for rec in recommendations:
-            with st.expander(f"{rec['优先级']} {rec['问题']}"):
-                st.write(f"**AI推荐**: {rec['AI推荐']}")
-                st.write(f"**预期影响**: {rec['预期影响']}")
-                if st.button(f"执行推荐", key=f"exec_{rec['问题']}"):
-                    st.success("✅ 推荐已添加到行动计划！")
-    
+        goal_action_plan_panel()
+
     with col2:
         st.subheader("📈 YTD目标进度")
-        
+
         # YTD进度追踪
-        ytd_progress = pd.DataFrame({
-            "指标": ["Launched Sellers", "FBA Adopted", "FBA BA", "GMS", "Ads Adoption"],
-            "YTD实际": [180, 120, 58, "$11.2M", "65%"],
-            "YTD目标": [200, 130, 50, "$12.0M", "70%"],
-            "完成率": ["90%", "92%", "116%", "93%", "93%"],
-            "状态": ["🔴 需努力", "🔴 需努力", "🟢 超额完成", "🔴 需努力", "🔴 需努力"]
-        })
+        ytd_progress = kpi_cube.ytd_progress_table(cube, selected_countries())
         st.dataframe(ytd_progress, use_container_width=True)
-        
-        # 高潜力卖家识别
-        st.subheader("⭐ 高潜力卖家识别")
-        
-        high_potential = pd.DataFrame({
-            "卖家": ["TechGiant_SG", "ElectroMax_ID", "FashionHub_MY"],
-            "WoW GMS增长": ["+25%", "+18%", "+12%"],
-            "当前GMS": ["$180K", "$120K", "$95K"],
-            "AI推荐行动": ["扩大产品线", "启用FBA BA", "优化Listing"],
-            "潜在影响": ["+$50K", "+$30K", "+$20K"]
-        })
-        st.dataframe(high_potential, use_container_width=True)
-        
-        if st.button("🤖 重新分析高潜力卖家", type="primary"):
-            st.success("✅ AI重新分析完成！发现2个新的高潜力机会。")
+
+        goal_high_potential_panel()
+
+    st.markdown("---")
+    goal_seller_list_panel()
+
+@st.fragment
+def goal_action_plan_panel():
+    st.subheader("🔍 AI行动计划推荐")
+
+    # 基于缺口的AI推荐
+    st.write("**基于当前绩效缺口的AI推荐：**")
+
+    countries = selected_countries()
+    recommendations = recommender.kpi_gap_recommendations(
+        get_recommendation_service(), kpi_cube.icq_metrics(get_kpi_cube(), countries),
+        get_high_potential_index(), countries,
+    )
+    if not recommendations:
+        st.write("✅ 当前所有ICQ指标均已达到目标")
+
+    store = get_action_store()
+
+    for rec in recommendations:
+        with st.expander(f"{rec['优先级']} {rec['问题']}"):
+            st.write(f"**AI推荐**: {rec['AI推荐']}")
+            st.write(f"**预期影响**: {rec['预期影响']}")
+            if st.button(f"执行推荐", key=f"exec_{rec['问题']}"):
+                store.add_action(rec["卖家"], rec["问题"], rec["AI推荐"], rec["预期影响"])
+                st.success("✅ 推荐已添加到行动计划！")
+
+    action_store_status(store)
+    recent = store.recent_actions(5)
+    if recent:
+        st.write("**最近加入的行动计划：**")
+        unsaved = store.unsaved_actions()
+        st.dataframe(pd.DataFrame({
+            "卖家": [a["seller"] for a in recent],
+            "问题": [a["title"] for a in recent],
+            "预期影响": [a["impact"] for a in recent],
+            "加入时间": pd.to_datetime([a["created"] for a in recent], unit="s").strftime("%m-%d %H:%M"),
+            "状态": ["未保存" if a["uid"] in unsaved else "已保存" for a in recent],
+        }), use_container_width=True, hide_index=True)
+
+@st.fragment
+def goal_high_potential_panel():
+    # 高潜力卖家识别
+    st.subheader("⭐ 高潜力卖家识别")
+
+    countries = selected_countries()
+    hp_index = get_high_potential_index()
+    high_potential_slot = st.empty()
+
+    if st.button("🤖 重新分析高潜力卖家", type="primary"):
+        seller_data, _ = current_seller_data()
+        previous = set(hp_index.top(3, countries))
+        changed = hp_index.refresh(seller_data)
+        new_entries = len(set(hp_index.top(3, countries)) - previous)
+        st.success(f"✅ AI重新分析完成！{changed}个卖家数据有变化，发现{new_entries}个新的高潜力机会。")
+
+    high_potential = hp_index.table(3, countries=countries)
+    high_potential_slot.dataframe(high_potential, use_container_width=True)
+
+@st.fragment
+def goal_seller_list_panel():
+    st.subheader("📋 卖家明细")
+    index = get_seller_table_index(tuple(selected_countries()), get_refresh_scheduler().snapshot.version)
+    render_paged_table(index, "seller_list", filter_columns=["Country", "Tier", "Compliance_Risk"],
+                       formats=schema.SELLER_DETAIL.formats)
 
 # ----------------------
 # 2️⃣ Recruitment Module - 卖家招募自动化
 # ----------------------
-with tab2:
+def render_recruitment_tab():
     st.header("🔍 Recruitment - 卖家招募自动化")
     st.info("🎯 识别、优先排序和接触能够推动市场增长的卖家")
-    
+
     # 卖家画像和优先级排序
     st.subheader("📊 卖家画像和优先级排序")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        st.write("**基于GMS表现的卖家实力分析**")
-        
-        # 潜在卖家分析
-        prospect_analysis = pd.DataFrame({
-            "卖家": ["TechCorp_VN", "FashionPlus_TH", "HomeStyle_MY", "BeautyMax_SG"],
-            "现有市场GMS": ["$2.5M", "$1.8M", "$1.2M", "$2.1M"],
-            "品牌地位": ["领先品牌", "区域品牌", "新兴品牌", "领先品牌"],
-            "跨市场匹配度": ["95%", "87%", "78%", "92%"],
-            "优先级": ["P0", "P1", "P2", "P0"],
-            "业务潜力": ["Very High", "High", "Medium", "Very High"]
-        })
-        st.dataframe(prospect_analysis, use_container_width=True)
-        
-        # 手动调整优先级
-        st.write("**优先级手动调整**")
-        selected_seller = st.selectbox("选择卖家进行调整", prospect_analysis["卖家"])
-        new_priority = st.selectbox("调整优先级", ["P0", "P1", "P2"])
-        
-        if st.button("更新优先级"):
-            st.success(f"✅ {selected_seller} 的优先级已更新为 {new_priority}")
-    
+        recruitment_priority_panel()
+
     with col2:
-        st.write("**接触路线图和邮件节奏**")
-        
-        # 接触计划
-        engagement_plan = pd.DataFrame({
-            "接触点": ["Day 1", "Day 3", "Day 7", "Day 14", "电话跟进"],
-            "渠道": ["邮件", "邮件", "邮件", "邮件", "电话"],
-            "内容类型": ["初次介绍", "价值主张", "案例分享", "最后机会", "直接沟通"],
-            "响应率": ["25%", "18%", "12%", "8%", "35%"],
-            "状态": ["✅ 已发送", "✅ 已发送", "📅 待发送", "📅 计划中", "📅 计划中"]
-        })
-        st.dataframe(engagement_plan, use_container_width=True)
-        
-        # 动态调整设置
-        st.write("**动态调整设置**")
-        response_threshold = st.slider("响应阈值 (天)", 1, 14, 7)
-        escalation_channel = st.selectbox("升级渠道", ["电话", "LinkedIn", "WhatsApp"])
-        
-        if st.button("应用动态调整"):
-            st.success("✅ 接触频率和渠道已根据响应度动态调整")
-    
+        recruitment_engagement_panel()
+
     st.markdown("---")
-    
+
     # 招募漏斗跟踪
     st.subheader("📈 招募漏斗跟踪")
-    
+
     col3, col4 = st.columns(2)
-    
+
+    # 漏斗数字由阶段变化事件的增量计数器按 统计周期 × 国家 切片得到
+    recruitment, _ = get_funnels()
+    countries = selected_countries()
+    st.selectbox("统计周期", list(FUNNEL_PERIODS), index=1, key="recruitment_period")
+    current, previous = funnel_window("recruitment_period")
+
     with col3:
-        # 漏斗可视化
-        funnel_stages = ["潜在对象", "已联系", "谈判中", "已签约"]
-        funnel_counts = [150, 80, 25, 8]
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
-        bars = ax.barh(funnel_stages, funnel_counts, color=colors)
-        
-        # 添加数值标签
-        for i, (bar, count) in enumerate(zip(bars, funnel_counts)):
-            conversion_rate = count / funnel_counts[0] * 100 if i > 0 else 100
-            ax.text(bar.get_width() + 2, bar.get_y() + bar.get_height()/2, 
-                   f'{count} ({conversion_rate:.1f}%)', 
-                   ha='left', va='center')
-        
-        ax.set_title('招募漏斗分析')
-        ax.set_xlabel('数量')
-        st.pyplot(fig)
-    
+        # 漏斗可视化（按进入漏斗的日期统计）
+        funnel_counts = recruitment.counts(*current, countries)
+        fig = charts.recruitment_funnel_figure(recruitment.stages, tuple(funnel_counts.tolist()))
+        st.plotly_chart(fig, use_container_width=True)
+
     with col4:
         st.write("**招募绩效指标**")
-        
-        # 绩效指标
+
+        # 绩效指标: 与上一个同样长度的周期比较
+        conversion = recruitment.conversion(*current, countries)
+        cycle = recruitment.average_days(-1, *current, countries)
+        today = pd.Timestamp.now().normalize()
+        month_start = today.replace(day=1)
+        signed = recruitment.counts(month_start, today, countries, by="activity")[-1]
+        signed_before = recruitment.counts(month_start - pd.DateOffset(months=1),
+                                           today - pd.DateOffset(months=1), countries, by="activity")[-1]
+        projected = signed / today.day * today.days_in_month
         perf_col1, perf_col2 = st.columns(2)
         with perf_col1:
-            st.metric("总转化率", "5.3%", delta="+0.8%")
-            st.metric("平均招募周期", "18天", delta="-3天")
+            st.metric("总转化率", f"{conversion * 100:.1f}%",
+                      delta=f"{(conversion - recruitment.conversion(*previous, countries)) * 100:+.1f}%")
+            st.metric("平均招募周期", f"{cycle:.0f}天",
+                      delta=f"{cycle - recruitment.average_days(-1, *previous, countries):+.0f}天",
+                      delta_color="inverse")
         with perf_col2:
-            st.metric("本月新签约", "8个", delta="+3个")
-            st.metric("预期月度完成", "12个", delta="目标10个")
-        
-        st.write("**按优先级分布**")
-        priority_dist = pd.DataFrame({
-            "优先级": ["P0", "P1", "P2"],
-            "数量": [25, 45, 80],
-            "签约率": ["32%", "18%", "8%"],
-            "平均周期": ["12天", "18天", "28天"]
-        })
-        st.dataframe(priority_dist, use_container_width=True)
-        
-        if st.button("🔄 刷新招募数据", type="primary"):
-            st.success("✅ 招募数据已刷新！发现5个新的高优先级机会。")
+            st.metric("本月新签约", f"{signed}个", delta=f"{signed - signed_before:+d}个")
+            st.metric("预期月度完成", f"{projected:.0f}个", delta=f"目标{RECRUITMENT_MONTHLY_TARGET * len(countries)}个", delta_color="off")
+
+        recruitment_pipeline_panel()
+
+PROSPECT_TOP_N = 10
+
+@st.fragment
+def recruitment_priority_panel():
+    st.write("**基于GMS表现的卖家实力分析**")
+
+    # 潜在卖家分析: 按目标市场成功卖家画像匹配出的 Top 潜在卖家
+    prospect_index = get_prospect_index()
+    target_market = st.selectbox("目标市场", selected_countries() or COUNTRY_OPTIONS, key="prospect_market")
+    prospect_analysis = prospect_index.top(target_market, PROSPECT_TOP_N)[list(schema.PROSPECT_ANALYSIS.columns)]
+    # AM 手动调整过的优先级覆盖模型给出的优先级
+    store = get_action_store()
+    overrides = prospect_analysis["卖家"].map(store.priorities())
+    prospect_analysis = prospect_analysis.assign(
+        优先级=overrides.fillna(prospect_analysis["优先级"]).astype(schema.PRIORITY)
+    )
+    paged_dataframe(prospect_analysis, "prospect_analysis", schema.PROSPECT_ANALYSIS)
+    st.caption(f"从 {len(prospect_index.matched):,} 个跨市场潜在卖家中按匹配度选出")
+
+    # 手动调整优先级
+    st.write("**优先级手动调整**")
+    selected_seller = st.selectbox("选择卖家进行调整", prospect_analysis["卖家"])
+    new_priority = st.selectbox("调整优先级", ["P0", "P1", "P2"])
+
+    if st.button("更新优先级"):
+        store.set_priority(selected_seller, new_priority)
+        st.success(f"✅ {selected_seller} 的优先级已更新为 {new_priority}")
+    action_store_status(store)
+
+@st.fragment
+def recruitment_engagement_panel():
+    st.write("**接触路线图和邮件节奏**")
+
+    # 接触计划: 各接触点的实际发送和回复情况
+    engine = get_cadence_engine()
+    engagement_plan = schema.ENGAGEMENT_PLAN.frame(engine.plan_table())
+    paged_dataframe(engagement_plan, "engagement_plan", schema.ENGAGEMENT_PLAN)
+    st.caption(f"{len(engine.names):,} 个潜在卖家在节奏中")
+    if engine.last_error:
+        st.warning(f"⚠️ 累计 {engine.failed:,} 条接触发送失败，已按退避重新排队: {engine.last_error}")
+
+    # 动态调整设置
+    st.write("**动态调整设置**")
+    response_threshold = st.slider("响应阈值 (天)", 1, 14, engine.threshold_days)
+    escalation_channel = st.selectbox("升级渠道", cadence.ESCALATION_CHANNELS,
+                                      index=cadence.ESCALATION_CHANNELS.index(engine.escalation_channel))
+
+    if st.button("应用动态调整"):
+        replanned = engine.configure(response_threshold, escalation_channel)
+        st.success(f"✅ 接触频率和渠道已根据响应度动态调整: {replanned:,} 个未回复的潜在卖家将在首次接触"
+                   f" {response_threshold} 天后通过{escalation_channel}跟进")
+
+@st.fragment
+def recruitment_pipeline_panel():
+    st.write("**按优先级分布**")
+    recruitment, _ = get_funnels()
+    current, _ = funnel_window("recruitment_period")
+    priority_dist = schema.PRIORITY_DIST.frame(recruitment.priority_table(*current, selected_countries()))
+    paged_dataframe(priority_dist, "priority_dist", schema.PRIORITY_DIST)
+
+    if st.button("🔄 刷新招募数据", type="primary"):
+        st.success("✅ 招募数据已刷新！发现5个新的高优先级机会。")
 
 # ----------------------
 # 3️⃣ Onboarding Module - 入驻流程管理
 # ----------------------
-with tab3:
+def render_onboarding_tab():
     st.header("📋 Onboarding - 入驻流程管理")
     st.info("🛠️ 确保卖家顺利完成激活流程，提供逐步可见性和AI指导")
-    
+
     # 入驻进度跟踪
     st.subheader("📊 入驻进度跟踪")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        st.write("**关键入驻里程碑**")
-        
-        # 入驻里程碑数据
-        onboarding_milestones = pd.DataFrame({
-            "卖家": ["TechCorp_VN", "FashionPlus_TH", "HomeStyle_MY", "BeautyMax_SG"],
-            "账户设置": ["✅ 完成", "✅ 完成", "✅ 完成", "✅ 完成"],
-            "KYC验证": ["✅ 完成", "⚠️ 待处理", "✅ 完成", "✅ 完成"],
-            "产品Listing": ["✅ 完成", "✅ 完成", "🔄 进行中", "📅 待开始"],
-            "首次发货": ["✅ 完成", "📅 待开始", "📅 待开始", "📅 待开始"],
-            "整体进度": ["100%", "60%", "75%", "50%"]
-        })
-        st.dataframe(onboarding_milestones, use_container_width=True)
-        
-        # AI监控和瓶颈识别
-        st.write("**AI瓶颈识别**")
-        bottlenecks = [
-            "🔴 FashionPlus_TH: KYC文档缺失，已延迟3天",
-            "🟡 HomeStyle_MY: Listing图片质量需要改善",
-            "🟢 BeautyMax_SG: 进展正常，无瓶颈"
-        ]
-        
-        for bottleneck in bottlenecks:
-            st.write(f"• {bottleneck}")
-    
+        onboarding_milestone_panel()
+
     with col2:
-        st.write("**AI推荐干预行动**")
-        
-        # AI推荐的干预行动
-        intervention_actions = pd.DataFrame({
-            "卖家": ["FashionPlus_TH", "HomeStyle_MY", "BeautyMax_SG"],
-            "识别问题": ["KYC延迟", "Listing质量", "无问题"],
-            "推荐行动": ["联系协助KYC", "提供图片指导", "继续监控"],
-            "预期解决时间": ["2天", "1天", "N/A"],
-            "优先级": ["高", "中", "低"]
-        })
-        st.dataframe(intervention_actions, use_container_width=True)
-        
-        # 卖家赋能资源
-        st.write("**卖家赋能资源**")
-        
-        enablement_resources = [
-            "📄 快速入门指南 (中英文)",
-            "❓ 常见问题FAQ",
-            "🎥 产品Listing最佳实践视频",
-            "📞 专属客服热线",
-            "💬 卖家社群支持"
-        ]
-        
-        for resource in enablement_resources:
-            st.write(f"• {resource}")
-        
-        if st.button("📤 发送定制化指导", type="primary"):
-            st.success("✅ 已向所有入驻中的卖家发送定制化指导文档！")
-    
+        onboarding_guidance_panel()
+
     st.markdown("---")
-    
+
     # 入驻成功率分析
     st.subheader("📈 入驻成功率分析")
-    
+
     col3, col4 = st.columns(2)
-    
+
+    _, onboarding_funnel = get_funnels()
+    countries = selected_countries()
+    st.selectbox("统计周期", list(FUNNEL_PERIODS), index=1, key="onboarding_period")
+    current, previous = funnel_window("onboarding_period")
+
     with col3:
         # 入驻转化漏斗
-        onboarding_funnel = ["初次接触", "签约意向", "开始入驻", "完成入驻", "首次销售"]
-        onboarding_counts = [100, 75, 60, 45, 38]
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57']
-        bars = ax.bar(onboarding_funnel, onboarding_counts, color=colors)
-        
-        # 添加数值标签
-        for bar, count in zip(bars, onboarding_counts):
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                   f'{count}', ha='center', va='bottom')
-        
-        ax.set_title('入驻转化漏斗')
-        ax.set_ylabel('数量')
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
-    
+        onboarding_counts = onboarding_funnel.counts(*current, countries)
+        fig = charts.onboarding_funnel_figure(onboarding_funnel.stages, tuple(onboarding_counts.tolist()))
+        st.plotly_chart(fig, use_container_width=True)
+
     with col4:
         st.write("**入驻绩效指标**")
-        
-        # 入驻绩效指标
+
+        # 入驻绩效指标: 与上一个同样长度的周期比较
+        def onboarding_rates(window):
+            return (
+                onboarding_funnel.conversion(*window, countries, from_stage="开始入驻", to_stage="完成入驻"),
+                onboarding_funnel.average_days("完成入驻", *window, countries),
+                onboarding_funnel.conversion(*window, countries, from_stage="完成入驻", to_stage="首次销售"),
+            )
+
+        success, duration, first_sale = onboarding_rates(current)
+        success_before, duration_before, first_sale_before = onboarding_rates(previous)
         onboard_col1, onboard_col2 = st.columns(2)
         with onboard_col1:
-            st.metric("入驻成功率", "75%", delta="+5%")
-            st.metric("平均入驻时间", "14天", delta="-2天")
+            st.metric("入驻成功率", f"{success * 100:.0f}%", delta=f"{(success - success_before) * 100:+.0f}%")
+            st.metric("平均入驻时间", f"{duration:.0f}天", delta=f"{duration - duration_before:+.0f}天",
+                      delta_color="inverse")
         with onboard_col2:
-            st.metric("首次销售转化", "84%", delta="+8%")
+            st.metric("首次销售转化", f"{first_sale * 100:.0f}%",
+                      delta=f"{(first_sale - first_sale_before) * 100:+.0f}%")
             st.metric("30天留存率", "92%", delta="+3%")
-        
-        # 预测入驻时间
-        st.write("**入驻时间预测**")
-        time_prediction = pd.DataFrame({
-            "卖家": ["FashionPlus_TH", "HomeStyle_MY", "BeautyMax_SG"],
-            "当前进度": ["60%", "75%", "50%"],
-            "预计完成": ["5天", "3天", "7天"],
-            "风险等级": ["中", "低", "低"]
-        })
-        st.dataframe(time_prediction, use_container_width=True)
-        
-        if st.button("🔮 更新预测模型", type="primary"):
-            st.success("✅ 基于最新数据更新预测模型！准确率提升至89%。")
+
+        onboarding_prediction_panel()
+
+@st.fragment
+def onboarding_milestone_panel():
+    st.write("**关键入驻里程碑**")
+
+    report = current_onboarding_report()
+    render_paged_table(report["milestones"], "onboarding_milestones",
+                       formats=schema.ONBOARDING_MILESTONES.formats)
+
+    # AI监控和瓶颈识别: 进行中或待处理超过 SLA 的里程碑
+    st.write("**AI瓶颈识别**")
+    worst = max(item["卡住"] for item in report["bottlenecks"])
+    for item, sla in zip(report["bottlenecks"], onboarding.MILESTONE_SLA_DAYS):
+        icon = "🔴" if item["卡住"] == worst > 0 else "🟡" if item["卡住"] else "🟢"
+        if item["卡住"]:
+            st.write(f"• {icon} {item['里程碑']}: {item['卡住']:,} 个卖家超过 SLA ({sla:.0f}天)，"
+                     f"平均超时 {item['平均超时']:.1f} 天")
+        else:
+            st.write(f"• {icon} {item['里程碑']}: 进展正常，无瓶颈")
+    for row in report["top_interventions"].itertuples():
+        st.write(f"• 🔴 {row.卖家}: {row.识别问题}，已延迟{row.已延迟}天")
+
+@st.fragment
+def onboarding_guidance_panel():
+    st.write("**AI推荐干预行动**")
+
+    # AI推荐的干预行动: 每个卡住的卖家按超时最严重的里程碑给出
+    report = current_onboarding_report()
+    render_paged_table(report["interventions"], "intervention_actions", filter_columns=["里程碑", "优先级"],
+                       formats=schema.INTERVENTION_ACTIONS.formats)
+
+    # 卖家赋能资源
+    st.write("**卖家赋能资源**")
+
+    for resource in dispatch.ENABLEMENT_RESOURCES:
+        st.write(f"• {resource}")
+
+    # 每个卡住的卖家一封: 干预行动 + 赋能资源
+    if st.button("📤 发送定制化指导", type="primary"):
+        st.session_state["onboarding_dispatch"] = get_dispatcher().submit(
+            "onboarding_guidance", report["interventions"].table)
+    dispatch_status("onboarding_dispatch", "定制化指导文档")
+
+@st.fragment
+def onboarding_prediction_panel():
+    # 预测入驻时间
+    st.write("**入驻时间预测**")
+    scheduler = get_completion_model()
+    countries = tuple(selected_countries())
+    minute = int(datetime.now().timestamp() // 60)
+    index, _ = get_time_prediction(countries, scheduler.snapshot.version, minute)
+    render_paged_table(index, "time_prediction", filter_columns=["风险等级"],
+                       formats=schema.TIME_PREDICTION.formats)
+
+    if st.button("🔮 更新预测模型", type="primary"):
+        snapshot = scheduler.refresh_now()
+        if scheduler.last_error:
+            st.error(f"❌ 模型更新失败: {scheduler.last_error}")
+        else:
+            data = snapshot.data
+            index, latency = get_time_prediction(countries, snapshot.version, minute)
+            st.success(
+                f"✅ 模型已增量更新（新增 {data['new_events']:,} 条完成记录，训练 {data['fit_seconds'] * 1000:.0f} ms）！"
+                f"近7天回测准确率 {data['accuracy']:.0%}（误差±1天内），平均误差 {data['mae']:.1f} 天；"
+                f"批量预测 {index.num_rows:,} 个卖家耗时 {latency * 1000:.0f} ms。"
+            )
 
 # ----------------------
 # 4️⃣ Win Module - 卖家增长和成功管理
 # ----------------------
-with tab4:
+def render_win_tab():
     st.header("🚀 Win - 卖家增长和成功管理")
     st.info("📈 专注于推动可持续的卖家增长，基于功能采用和质量评分评估绩效")
-    
+
     # 功能采用跟踪
     st.subheader("📊 功能采用跟踪")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.write("**关键增长功能采用情况**")
-        
-        # 功能采用数据
-        feature_adoption = pd.DataFrame({
-            "卖家": ["TechGiant_SG", "ElectroMax_ID", "FashionHub_MY", "BeautyPro_VN"],
-            "FBA": ["✅ 已启用", "❌ 未启用", "✅ 已启用", "✅ 已启用"],
-            "广告": ["✅ 已启用", "✅ 已启用", "❌ 未启用", "✅ 已启用"],
-            "促销": ["✅ 已启用", "❌ 未启用", "✅ 已启用", "❌ 未启用"],
-            "优惠券": ["❌ 未启用", "✅ 已启用", "✅ 已启用", "✅ 已启用"],
-            "采用率": ["75%", "50%", "75%", "75%"]
-        })
-        st.dataframe(feature_adoption, use_container_width=True)
-        
-        # 功能采用建议
+
+        # 功能采用数据: 所选国家卖家的位图查询
+        index = get_adoption_index()
+        countries = selected_countries()
+        feature_adoption = index.seller_table(index.query(countries=countries))
+        paged_dataframe(feature_adoption, "feature_adoption", schema.FEATURE_ADOPTION)
+
+        # 采用率汇总
+        rollup_by = st.radio("采用率汇总", ["国家", "类目"], horizontal=True, key="adoption_rollup")
+        paged_dataframe(index.adoption_rates(rollup_by, countries), "adoption_rollup", schema.ADOPTION_ROLLUP)
+
+        # 功能采用建议: 每条规则是一次人群查询
         st.write("**AI功能采用建议**")
-        adoption_recommendations = [
-            "🎯 ElectroMax_ID: 强劲目录但广告采用低 → 推荐启用广告",
-            "📈 FashionHub_MY: 高广告支出但ROI低 → 建议优化活动",
-            "🏷️ TechGiant_SG: 缺少优惠券功能 → 推荐启用促销工具"
-        ]
-        
-        for rec in adoption_recommendations:
-            st.write(f"• {rec}")
-    
+        for icon, label, action, count, example in index.recommendations(countries):
+            if count:
+                st.write(f"• {icon} {label}: {count:,} 个卖家（如 {example}）→ {action}")
+
     with col2:
-        st.write("**绩效记分卡**")
-        
-        # 绩效记分卡
-        performance_scorecard = pd.DataFrame({
-            "卖家": ["TechGiant_SG", "ElectroMax_ID", "FashionHub_MY", "BeautyPro_VN"],
-            "Listing质量": ["85/100", "72/100", "68/100", "91/100"],
-            "广告ROI": ["3.2x", "2.1x", "1.8x", "4.1x"],
-            "库存健康": ["优秀", "良好", "需改善", "优秀"],
-            "整体评分": ["A", "B", "C+", "A+"]
-        })
-        st.dataframe(performance_scorecard, use_container_width=True)
-        
-        # 改善建议
-        st.write("**质量改善建议**")
-        quality_improvements = pd.DataFrame({
-            "卖家": ["FashionHub_MY", "ElectroMax_ID"],
-            "主要问题": ["图片质量低", "标题不完整"],
-            "建议行动": ["更新产品图片", "优化标题关键词"],
-            "预期提升": ["+20%转化率", "+15%搜索排名"]
-        })
-        st.dataframe(quality_improvements, use_container_width=True)
-        
-        if st.button("📧 发送改善建议", type="primary"):
-            st.success("✅ 已向相关卖家发送个性化改善建议！")
-    
+        win_quality_panel()
+
     st.markdown("---")
-    
+
     # 成功结果定义和跟踪
     st.subheader("🎯 成功结果定义和跟踪")
-    
+
     col3, col4 = st.columns(2)
-    
+
     with col3:
         st.write("**收入提升跟踪**")
-        
-        # 收入提升数据
-        revenue_lift = pd.DataFrame({
-            "卖家": ["TechGiant_SG", "ElectroMax_ID", "FashionHub_MY", "BeautyPro_VN"],
-            "基准收入": ["$150K", "$80K", "$60K", "$120K"],
-            "当前收入": ["$195K", "$98K", "$72K", "$156K"],
-            "收入提升": ["+30%", "+23%", "+20%", "+30%"],
-            "功能贡献": ["广告+FBA", "FBA", "促销", "全功能"]
-        })
-        st.dataframe(revenue_lift, use_container_width=True)
-        
+
+        # 收入提升数据: 启用功能前后的双重差分归因
+        index, feature_lift = get_revenue_lift(tuple(countries))
+        render_paged_table(index, "revenue_lift", filter_columns=["功能贡献"], formats=schema.REVENUE_LIFT.formats)
+        st.caption("功能带来的收入提升（中位数）: " + "，".join(
+            f"{feature} {lift:+.1%}" for feature, lift in feature_lift.items() if pd.notna(lift)))
+
         # 持续参与度
         st.write("**持续参与度指标**")
         engagement_metrics = pd.DataFrame({
@@ -534,49 +903,124 @@ with tab4:
             "目标值": ["25天", "3个", "2个", "4小时"],
             "达成状态": ["✅ 超额", "✅ 超额", "✅ 超额", "✅ 超额"]
         })
-        st.dataframe(engagement_metrics, use_container_width=True)
-    
+        paged_dataframe(engagement_metrics, "engagement_metrics")
+
     with col4:
-        st.write("**增长潜力预测**")
-        
-        # 增长潜力预测
-        growth_potential = pd.DataFrame({
-            "卖家": ["TechGiant_SG", "ElectroMax_ID", "FashionHub_MY", "BeautyPro_VN"],
-            "当前表现": ["优秀", "良好", "一般", "优秀"],
-            "功能采用": ["75%", "50%", "75%", "75%"],
-            "预测增长": ["+40%", "+35%", "+25%", "+45%"],
-            "信心度": ["92%", "78%", "65%", "95%"]
-        })
-        st.dataframe(growth_potential, use_container_width=True)
-        
-        # 成功案例展示
-        st.write("**成功案例**")
-        success_stories = [
-            "🏆 TechGiant_SG: 启用全功能后3个月收入增长30%",
-            "📈 BeautyPro_VN: 优化Listing质量后转化率提升25%",
-            "🎯 ElectroMax_ID: 启用FBA后客户满意度提升至4.8分"
-        ]
-        
-        for story in success_stories:
-            st.write(f"• {story}")
-        
-        if st.button("📊 生成成功报告", type="primary"):
-            st.success("✅ 成功案例报告已生成！包含详细的ROI分析和最佳实践。")
-
-# 页面底部信息
-st.markdown("---")
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.info("📊 **数据源**: Quicksight, VOS Hub, Selection AI")
-with col2:
-    st.info("🤖 **AI引擎**: AWS Bedrock Claude 3")
-with col3:
-    st.info("🔄 **最后更新**: " + datetime.now().strftime("%Y-%m-%d %H:%M"))
-
-# 版权信息
-st.markdown("""
-<div style='text-align: center; color: #666; margin-top: 2rem;'>
-    <p>© 2025 GROW AI Assistant | Powered by Amazon Web Services</p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+        win_growth_panel()
+
+@st.fragment
+def win_quality_panel():
+    st.write("**绩效记分卡**")
+
+    # 绩效记分卡
+    render_paged_table(get_scorecard(tuple(selected_countries())), "performance_scorecard",
+                       filter_columns=["库存健康", "整体评分"], formats=schema.PERFORMANCE_SCORECARD.formats)
+
+    # 改善建议
+    st.write("**质量改善建议**")
+    quality_improvements = pd.DataFrame({
+        "卖家": ["FashionHub_MY", "ElectroMax_ID"],
+        "主要问题": ["图片质量低", "标题不完整"],
+        "建议行动": ["更新产品图片", "优化标题关键词"],
+        "预期提升": ["+20%转化率", "+15%搜索排名"]
+    })
+    paged_dataframe(quality_improvements, "quality_improvements")
+
+    if st.button("📧 发送改善建议", type="primary"):
+        st.session_state["quality_dispatch"] = get_dispatcher().submit("quality_improvements", quality_improvements)
+    dispatch_status("quality_dispatch", "个性化改善建议")
+
+@st.fragment
+def win_growth_panel():
+    st.write("**增长潜力预测**")
+
+    # 增长潜力预测: 周 GMV 趋势 + 季节性模型，未来 13 周 vs 最近 13 周
+    scheduler = get_growth_forecaster()
+    countries = tuple(selected_countries())
+    render_paged_table(get_growth_potential(countries, scheduler.snapshot.version), "growth_potential",
+                       filter_columns=["当前表现"], formats=schema.GROWTH_POTENTIAL.formats)
+
+    if st.button("🔄 更新增长预测"):
+        snapshot = scheduler.refresh_now()
+        if scheduler.last_error:
+            st.error(f"❌ 预测更新失败: {scheduler.last_error}")
+        else:
+            data = snapshot.data
+            st.success(f"✅ 预测已更新（缓存版本 v{data['version']}）: 重新拟合 {data['recomputed']:,} 个卖家，"
+                       f"{data['cached']:,} 个卖家周 GMV 无变化、复用缓存，耗时 {data['seconds'] * 1000:.0f} ms")
+
+    # 成功案例展示
+    st.write("**成功案例**")
+    success_stories = [
+        "🏆 TechGiant_SG: 启用全功能后3个月收入增长30%",
+        "📈 BeautyPro_VN: 优化Listing质量后转化率提升25%",
+        "🎯 ElectroMax_ID: 启用FBA后客户满意度提升至4.8分"
+    ]
+
+    for story in success_stories:
+        st.write(f"• {story}")
+
+    # 全量卖家成功报告: 评分、功能采用、收入提升归因和增长预测，点击下载时逐批生成
+    format_col, button_col = st.columns([2, 1])
+    with format_col:
+        name = st.radio("报告格式", list(export.EXPORT_FORMATS), horizontal=True, key="success_report_format")
+    extension, mime = export.EXPORT_FORMATS[name]
+    with button_col:
+        st.download_button("📊 生成成功报告", lambda: export_bytes(success_report(), extension),
+                           file_name=f"success_report.{extension}", mime=mime, type="primary",
+                           on_click="ignore", key="success_report")
+
+def success_report():
+    """全量卖家成功报告的 RecordBatch 迭代器（见 grow.export.success_report_batches）"""
+    seller_data, _, _ = get_daily_gmv()
+    adoption_index = get_adoption_index()
+    grades = scorecard.load_scorecard(get_scorecard_path()).set_index("Seller_ID")["整体评分"]
+    return export.success_report_batches(
+        seller_data,
+        grades.reindex(seller_data["Seller_ID"]),
+        adoption_index.seller_table(adoption_index.universe)["采用率"],
+        get_revenue_attribution()[0],
+        get_growth_forecaster().snapshot.data["forecast"],
+    )
+
+def render_footer():
+    # 页面底部信息
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.info("📊 **数据源**: Quicksight, VOS Hub, Selection AI")
+    with col2:
+        st.info("🤖 **AI引擎**: AWS Bedrock Claude 3")
+    with col3:
+        st.info("🔄 **最后更新**: " + datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+    # 版权信息
+    st.markdown("""
+    <div style='text-align: center; color: #666; margin-top: 2rem;'>
+        <p>© 2025 GROW AI Assistant | Powered by Amazon Web Services</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+TABS = {
+    "🎯 Goal - 目标设定和绩效跟踪": render_goal_tab,
+    "🔍 Recruitment - 卖家招募自动化": render_recruitment_tab,
+    "📋 Onboarding - 入驻流程管理": render_onboarding_tab,
+    "🚀 Win - 卖家增长和成功管理": render_win_tab,
+}
+
+def main():
+    setup_page()
+    render_sidebar()
+
+    # 四个主要标签页: 只运行当前打开的标签页，切换标签页时重新运行脚本
+    tabs = st.tabs(list(TABS), key="main_tab", on_change="rerun")
+    for tab, render_tab in zip(tabs, TABS.values()):
+        if tab.open:
+            with tab:
+                render_tab()
+
+    render_footer()
+
+if __name__ == "__main__":
+    main()
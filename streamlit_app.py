@@ -4,5 +4,7 @@ Streamlit Cloud 部署入口文件
 这个文件是为了兼容 Streamlit Cloud 的默认命名约定
 """
 
-# 直接导入并运行主应用
-import grow_ai_assistant
\ No newline at end of file
+# 导入并运行主应用
+from grow_ai_assistant import main
+
+main()
@@ -0,0 +1,124 @@
+"""
+优先级和行动计划存储测试
+运行: python -m pytest test_actions.py
+"""
+
+import sqlite3
+import threading
+
+from grow import actions
+from grow.actions import ActionStore
+
+
+def test_writes_are_visible_before_commit_and_persist(tmp_path):
+    """写入立即可读，提交后新实例也能读到"""
+    store = ActionStore(tmp_path / "actions.sqlite")
+    store.set_priority("TechCorp_VN", "P0")
+    uid = store.add_action("TechCorp_VN", "GMS缺口", "扩充选品", "+$50K GMS")
+    assert store.priority("TechCorp_VN") == "P0"
+    assert [a["uid"] for a in store.actions("TechCorp_VN")] == [uid]
+
+    assert store.flush(5)
+    assert store.pending() == 0 and store.last_error == ""
+    store.close()
+
+    reopened = ActionStore(tmp_path / "actions.sqlite")
+    assert reopened.priorities() == {"TechCorp_VN": "P0"}
+    assert [a["title"] for a in reopened.actions("TechCorp_VN")] == ["GMS缺口"]
+    assert [a["uid"] for a in reopened.recent_actions()] == [uid]
+    reopened.close()
+
+
+def test_last_write_wins_and_no_duplicates_after_commit(tmp_path):
+    """同一卖家多次调整保留最后一次；提交前后读到的行动计划不重复"""
+    store = ActionStore(tmp_path / "actions.sqlite")
+    for priority in ["P2", "P1", "P0", "P1"]:
+        store.set_priority("FashionPlus_TH", priority)
+    store.add_action("FashionPlus_TH", "转化率缺口", "优化Listing")
+    assert store.priority("FashionPlus_TH") == "P1"
+    store.flush(5)
+    assert store.priority("FashionPlus_TH") == "P1"
+    assert len(store.actions("FashionPlus_TH")) == 1
+    assert len(store.recent_actions()) == 1
+    # 最近的行动计划走读缓存，尚未提交的写入立即可见
+    uid = store.add_action("HomeStyle_MY", "新卖家数量缺口", "加快入驻")
+    assert [a["uid"] for a in store.recent_actions(1)] == [uid]
+    store.close()
+
+
+def test_failed_commit_is_retried(tmp_path, monkeypatch):
+    """提交失败的写入保持未保存并退避重试，数据库恢复可写后落盘"""
+    path = tmp_path / "actions.sqlite"
+    store = ActionStore(path)
+    monkeypatch.setattr(actions, "RETRY_DELAY", 0.05)
+    connect = actions._connect
+    # 写线程拿到只读连接，提交时报错
+    monkeypatch.setattr(actions, "_connect", lambda p: sqlite3.connect(
+        f"file:{p}?mode=ro", uri=True, check_same_thread=False))
+    store.set_priority("TechCorp_VN", "P0")
+    uid = store.add_action("TechCorp_VN", "GMS缺口", "扩充选品")
+    assert not store.flush(0.3)
+    assert "readonly" in store.last_error
+    assert store.pending() == 2 and store.unsaved_actions() == {uid}
+    assert store.priority("TechCorp_VN") == "P0"
+
+    monkeypatch.setattr(actions, "_connect", connect)
+    assert store.flush(10)
+    assert store.pending() == 0 and store.unsaved_actions() == set() and store.last_error == ""
+    store.close()
+
+    reopened = ActionStore(path)
+    assert reopened.priorities() == {"TechCorp_VN": "P0"}
+    assert [a["uid"] for a in reopened.actions("TechCorp_VN")] == [uid]
+    reopened.close()
+
+
+def test_cache_invalidated_by_other_connections(tmp_path):
+    """其他进程（另一个连接）提交的修改会让读缓存失效"""
+    path = tmp_path / "actions.sqlite"
+    store = ActionStore(path)
+    store.set_priority("HomeStyle_MY", "P2")
+    store.flush(5)
+    assert store.priority("HomeStyle_MY") == "P2"
+    assert store.actions("HomeStyle_MY") == []
+
+    other = ActionStore(path)
+    other.set_priority("HomeStyle_MY", "P0")
+    other.add_action("HomeStyle_MY", "新卖家数量缺口", "加快入驻")
+    other.flush(5)
+    other.close()
+    assert store.priority("HomeStyle_MY") == "P0"
+    assert len(store.actions("HomeStyle_MY")) == 1
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM priority_overrides")
+    conn.close()
+    assert store.priorities() == {}
+    store.close()
+
+
+def test_concurrent_writers(tmp_path):
+    """多个会话线程同时写入，全部落盘且不丢失"""
+    store = ActionStore(tmp_path / "actions.sqlite", batch_size=32)
+
+    def am_session(am):
+        for i in range(200):
+            store.add_action(f"Seller{i % 20:02d}", f"问题{i}", "推荐", am=am)
+            store.set_priority(f"Seller{i % 20:02d}", ["P0", "P1", "P2"][i % 3], am=am)
+
+    threads = [threading.Thread(target=am_session, args=(f"AM{t}",)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.flush(10)
+    assert store.committed == 8 * 200 * 2
+    assert store.pending() == 0
+
+    conn = sqlite3.connect(tmp_path / "actions.sqlite")
+    assert conn.execute("SELECT COUNT(*) FROM action_items").fetchone()[0] == 1600
+    assert conn.execute("SELECT COUNT(*) FROM priority_overrides").fetchone()[0] == 20
+    conn.close()
+    assert sum(len(store.actions(f"Seller{i:02d}")) for i in range(20)) == 1600
+    store.close()
@@ -0,0 +1,71 @@
+"""
+功能采用位图索引测试
+运行: python -m pytest test_adoption.py
+"""
+
+import numpy as np
+import pytest
+
+from grow.adoption import AdoptionIndex, generate_mock_adoption, popcount, to_bitset, to_mask
+from grow.datastore import generate_mock_data
+from grow.schema import FEATURE_FLAGS
+
+
+@pytest.fixture
+def sellers():
+    # 卖家数不是 64 的倍数，覆盖最后一个字的空位
+    frame = generate_mock_data(1037)
+    adopted = generate_mock_adoption(frame)
+    frame[FEATURE_FLAGS] = adopted
+    rank = frame["GMV"].rank(ascending=False, method="first") - 1
+    frame["GMV档位"] = np.select([rank < 0.3 * len(frame), rank < 0.7 * len(frame)], ["强劲", "中等"], "较弱")
+    return frame, AdoptionIndex.from_frame(frame, adopted)
+
+
+def test_bitset_roundtrip():
+    """布尔数组 ↔ 位图无损转换，空位不计数"""
+    mask = np.random.RandomState(0).random_sample(1000) < 0.3
+    bits = to_bitset(mask)
+    assert bits.dtype == np.uint64 and len(bits) == 16
+    assert (to_mask(bits, 1000) == mask).all()
+    assert popcount(bits) == mask.sum()
+    assert popcount(to_bitset(np.ones(1000, dtype=bool))) == 1000
+
+
+def test_queries_match_pandas_masks(sellers):
+    """人群查询和采用率汇总与 pandas 布尔筛选一致"""
+    frame, index = sellers
+    bits = index.query(gmv=["强劲"], has=["FBA"], lacks=["广告"], countries=["SG", "TH"])
+    expected = (frame["GMV档位"] == "强劲") & frame["FBA"] & ~frame["广告"] & frame["Country"].isin(["SG", "TH"])
+    assert index.count(bits) == expected.sum()
+    assert (index.rows(bits) == np.flatnonzero(expected)).all()
+
+    # 只有 lacks 条件时不会把最后一个字的空位算进去
+    assert index.count(index.query(lacks=["优惠券"])) == (~frame["优惠券"]).sum()
+
+    rates = index.adoption_rates("类目", countries=["MY"]).set_index("类目")
+    mine = frame[frame["Country"] == "MY"].groupby("Category")
+    assert (rates["卖家数"] == mine.size()).all()
+    for feature in FEATURE_FLAGS:
+        assert np.allclose(rates[feature], mine[feature].mean())
+
+    table = index.seller_table(index.query(countries=["VN"]))
+    assert list(table["卖家"]) == list(frame.loc[frame["Country"] == "VN", "Seller"])
+    assert table.loc[0, "卖家"] == "BeautyPro_VN" and table.loc[0, "采用率"] == 0.75
+
+
+def test_updates_and_recommendations(sellers):
+    """启用 / 停用功能后查询立即反映；建议给出人群数量和 GMV 最高的卖家"""
+    frame, index = sellers
+    rows = np.flatnonzero(~frame["广告"].to_numpy())[:50]
+    index.set(np.concatenate([rows, rows[:5]]), "广告", True)
+    assert index.count(index.query(has=["广告"])) == frame["广告"].sum() + 50
+    index.set(rows, "广告", False)
+    assert index.count(index.query(has=["广告"])) == frame["广告"].sum()
+
+    icon, label, action, count, example = index.recommendations(["ID"])[0]
+    assert action == "推荐启用广告"
+    target = frame[(frame["GMV档位"] == "强劲") & frame["FBA"] & ~frame["广告"] & (frame["Country"] == "ID")]
+    assert count == len(target)
+    assert example == target.loc[target["GMV"].idxmax(), "Seller"]
+    assert "HealthPlus_ID" in set(target["Seller"])
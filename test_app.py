@@ -24,7 +24,7 @@ def test_dependencies():
         'pandas', 
         'numpy',
         'plotly',
-        'matplotlib'
+        'pyarrow'
     ]
     
     failed_packages = []
@@ -0,0 +1,113 @@
+"""
+接触节奏引擎测试（使用 FakeSink 和本地 SMTP / WhatsApp 替身）
+运行: python -m pytest test_cadence.py
+"""
+
+import numpy as np
+import pytest
+
+from grow.cadence import (
+    CadenceEngine, FakeSink, SmtpSender, WhatsAppSender, DAY, ESCALATION, ESCALATION_CHANNELS,
+)
+from grow.stub_servers import SmtpSink, WhatsAppSink
+
+T0 = 1_000 * DAY
+
+
+def _engine(**kwargs):
+    senders = {channel: FakeSink() for channel in ["邮件", *ESCALATION_CHANNELS]}
+    return CadenceEngine(senders, clock=lambda: T0, **kwargs), senders
+
+
+def test_cadence_fires_in_order_and_skips_responders():
+    """按 Day 1/3/7/14 依次发送，已回复的潜在卖家不再接触，阈值到期后升级"""
+    engine, senders = _engine(threshold_days=7)
+    assert engine.enroll(["A", "B", "C", "A"], T0) == 3
+
+    assert engine.run_due(T0 - 1) == {}
+    assert engine.run_due(T0)[0].tolist() == [0, 1, 2]
+    assert engine.run_due(T0 + 1 * DAY) == {}
+    assert len(engine.run_due(T0 + 2 * DAY)[1]) == 3
+
+    engine.record_responses(["B"])
+    assert len(engine.run_due(T0 + 6 * DAY)[2]) == 2
+    escalated = engine.run_due(T0 + 7 * DAY)[ESCALATION]
+    assert [engine.names[i] for i in escalated] == ["A", "C"]
+    assert [m["prospect"] for m in senders["电话"].messages] == ["A", "C"]
+
+    engine.catch_up(T0 + 30 * DAY)
+    table = engine.plan_table()
+    assert table["已发送"].tolist() == [3, 3, 2, 2, 2]
+    assert table["待发送"].tolist() == [0, 0, 0, 0, 0]
+    # B 在 Day 3 之后回复
+    assert table["响应率"][1] == pytest.approx(1 / 3)
+    assert senders["邮件"].sent == 10
+
+
+def test_threshold_change_replans_escalations():
+    """缩短响应阈值后，未升级的潜在卖家按新阈值升级，原计划不会重复发送"""
+    engine, senders = _engine(threshold_days=7)
+    engine.enroll([f"P{i}" for i in range(1000)], T0)
+    engine.catch_up(T0 + 2 * DAY)
+    engine.record_responses([f"P{i}" for i in range(100)])
+
+    assert engine.configure(threshold_days=3, escalation_channel="WhatsApp") == 900
+    assert engine.pending[ESCALATION] == 900
+    engine.catch_up(T0 + 3 * DAY)
+    assert senders["WhatsApp"].sent == 900
+    engine.catch_up(T0 + 30 * DAY)
+    assert senders["WhatsApp"].sent == 900 and senders["电话"].sent == 0
+    assert engine.configure(threshold_days=10) == 0
+
+    with pytest.raises(ValueError):
+        engine.configure(escalation_channel="传真")
+
+
+def test_senders_deliver_to_local_sinks():
+    """邮件经 SMTP 替身、升级经 WhatsApp 替身批量发送"""
+    with SmtpSink() as smtp, WhatsAppSink() as whatsapp:
+        senders = {"邮件": SmtpSender(*smtp.address), "WhatsApp": WhatsAppSender(whatsapp.url)}
+        engine = CadenceEngine(senders, threshold_days=1, escalation_channel="WhatsApp",
+                               batch_size=40, clock=lambda: T0)
+        engine.enroll([f"Prospect{i:03d}" for i in range(100)], T0)
+        engine.catch_up(T0 + 1 * DAY)
+        assert engine.failed == 0 and engine.last_error == ""
+        assert smtp.received == 100
+        assert b"Prospect099@example.com" in smtp.last_message
+        assert whatsapp.received == 100 and whatsapp.batches == 3
+
+
+def test_send_failures_are_retried_with_backoff():
+    """发送失败的接触不算发出，按退避重新排队，渠道恢复后补发；不影响其他渠道"""
+    class Flaky:
+        down = True
+
+        def __init__(self):
+            self.received = []
+
+        def send(self, messages):
+            if self.down:
+                raise ConnectionError("gateway down")
+            self.received.extend(m["prospect"] for m in messages)
+            return len(messages)
+
+    engine, senders = _engine(threshold_days=0, escalation_channel="LinkedIn")
+    flaky = engine.senders["LinkedIn"] = Flaky()
+    engine.enroll(["A", "B"], T0)
+    sent = engine.run_due(T0)
+    assert engine.failed == 2 and "gateway down" in engine.last_error
+    assert senders["邮件"].sent == 2 and ESCALATION not in sent
+    assert engine.pending[ESCALATION] == 2 and engine.sent[ESCALATION] == 0
+
+    # 第 1 次失败后 1 个刻度重试，再失败后 2 个刻度
+    assert engine.next_due() == T0 + engine.tick
+    engine.run_due(T0 + engine.tick)
+    assert engine.failed == 4 and engine.next_due() == T0 + 3 * engine.tick
+
+    flaky.down = False
+    assert engine.catch_up(T0 + 3 * engine.tick) == 2
+    assert sorted(flaky.received) == ["A", "B"]
+    assert engine.sent[ESCALATION] == 2 and engine.pending[ESCALATION] == 0 and engine.last_error == ""
+    # 回复计入最终发出的升级接触
+    engine.respond(np.array([engine.names.index("A")]))
+    assert engine.responses[ESCALATION] == 1
@@ -0,0 +1,33 @@
+"""
+图表构建测试
+运行: python -m pytest test_charts.py
+"""
+
+import plotly.graph_objects as go
+
+from grow.charts import conversion_labels, recruitment_funnel_figure, onboarding_funnel_figure
+
+
+def test_conversion_labels():
+    """转化率相对第一阶段计算"""
+    assert conversion_labels((150, 80, 25, 8)) == ["150 (100.0%)", "80 (53.3%)", "25 (16.7%)", "8 (5.3%)"]
+    assert conversion_labels((0, 0)) == ["0 (0.0%)", "0 (0.0%)"]
+
+
+def test_figures_are_memoized_on_input_data():
+    """输入不变时返回同一个图形对象，输入变化时重新构建"""
+    stages = ("潜在对象", "已联系", "谈判中", "已签约")
+    first = recruitment_funnel_figure(stages, (150, 80, 25, 8))
+    assert isinstance(first, go.Figure)
+    assert recruitment_funnel_figure(stages, (150, 80, 25, 8)) is first
+    assert recruitment_funnel_figure(stages, (150, 80, 25, 9)) is not first
+
+
+def test_onboarding_funnel_bars():
+    """入驻漏斗每个阶段一根柱子"""
+    stages = ("初次接触", "签约意向", "开始入驻", "完成入驻", "首次销售")
+    fig = onboarding_funnel_figure(stages, (100, 75, 60, 45, 38))
+    bar = fig.data[0]
+    assert list(bar.x) == list(stages)
+    assert list(bar.y) == [100, 75, 60, 45, 38]
+    assert fig.layout.title.text == "入驻转化漏斗"
@@ -0,0 +1,68 @@
+"""
+数据源连接器测试（使用本地替身服务器）
+运行: python -m pytest test_connectors.py
+"""
+
+import time
+
+from grow.connectors import ConnectorPool, SourceConfig, sources_from_env
+from grow.stub_servers import StubServer, start_stub_sources
+
+LATENCIES = {"Quicksight": 0.4, "VOS Hub": 0.3, "Selection AI": 0.2}
+
+
+def test_fan_out_takes_as_long_as_slowest_source():
+    """并发拉取的耗时接近最慢的数据源，而不是三者之和"""
+    servers = start_stub_sources(LATENCIES)
+    pool = ConnectorPool([s.source() for s in servers])
+    try:
+        start = time.perf_counter()
+        results = pool.fetch_all_sync()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+        for s in servers:
+            s.stop()
+    assert all(r.ok for r in results.values())
+    assert results["VOS Hub"].payload["source"] == "VOS Hub"
+    assert elapsed < sum(LATENCIES.values()) - 0.2
+
+
+def test_bounded_concurrency_serialises_requests():
+    """并发上限为1时请求依次执行"""
+    servers = start_stub_sources(LATENCIES)
+    pool = ConnectorPool([s.source() for s in servers], max_concurrency=1)
+    try:
+        start = time.perf_counter()
+        pool.fetch_all_sync()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+        for s in servers:
+            s.stop()
+    assert elapsed >= sum(LATENCIES.values()) - 0.05
+
+
+def test_per_source_timeout_and_errors():
+    """超时和错误只影响对应的数据源"""
+    with StubServer("Quicksight", latency=1.0) as slow, \
+            StubServer("VOS Hub", status=500) as broken, \
+            StubServer("Selection AI") as healthy:
+        pool = ConnectorPool([slow.source(timeout=0.2), broken.source(), healthy.source()])
+        start = time.perf_counter()
+        results = pool.fetch_all_sync()
+        elapsed = time.perf_counter() - start
+        pool.close()
+    assert not results["Quicksight"].ok and "超时" in results["Quicksight"].error
+    assert not results["VOS Hub"].ok
+    assert results["Selection AI"].ok
+    assert elapsed < 0.9
+
+
+def test_sources_from_env(monkeypatch):
+    """只返回配置了地址的数据源"""
+    monkeypatch.delenv("GROW_QUICKSIGHT_URL", raising=False)
+    monkeypatch.delenv("GROW_SELECTION_AI_URL", raising=False)
+    monkeypatch.setenv("GROW_VOS_HUB_URL", "http://vos.example/")
+    sources = sources_from_env(timeout=2)
+    assert sources == [SourceConfig("VOS Hub", "http://vos.example", "/api/sentiment", 2.0)]
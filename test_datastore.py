@@ -0,0 +1,65 @@
+"""
+卖家列式数据存储测试
+运行: python -m pytest test_datastore.py
+"""
+
+from grow.datastore import SellerStore, generate_mock_data, SELLER_COLUMNS, AI_COLUMNS
+
+
+def test_mock_data_keeps_named_sellers():
+    """前10个卖家保持演示用的固定名称和国家"""
+    frame = generate_mock_data(50)
+    assert len(frame) == 50
+    assert frame["Seller"].iloc[0] == "TechGiant_SG"
+    assert frame["Country"].iloc[1] == "ID"
+    assert frame["Seller_ID"].is_unique
+
+
+def test_store_partitions_by_country(tmp_path):
+    """数据按国家分区写入磁盘"""
+    store = SellerStore(tmp_path).ensure(200)
+    assert store.exists()
+    assert set(store.countries()) <= {"SG", "MY", "TH", "ID", "VN", "PH"}
+    assert (tmp_path / "sellers" / "Country=SG").is_dir()
+
+
+def test_load_prunes_columns_and_countries(tmp_path):
+    """只返回请求的列和国家"""
+    source = generate_mock_data(500)
+    store = SellerStore(tmp_path)
+    store.write(source)
+
+    frame = store.load(["Seller", "GMV"], ["SG", "MY"])
+    assert list(frame.columns) == ["Seller", "GMV"]
+    assert len(frame) == source["Country"].isin(["SG", "MY"]).sum()
+
+    sellers = store.load(SELLER_COLUMNS, ["TH"])
+    analysis = store.load(AI_COLUMNS, ["TH"])
+    assert set(sellers["Country"]) == {"TH"}
+    assert (sellers["Seller_ID"].values == analysis["Seller_ID"].values).all()
+
+    assert store.load(["Seller"], []).empty
+
+
+def test_mapped_table_is_shared_and_zero_copy(tmp_path):
+    """内存映射表在进程内只打开一次，数值列不复制"""
+    import numpy as np
+
+    store = SellerStore(tmp_path).ensure(300)
+    table = store.mapped()
+    assert table is store.mapped()
+    assert table.num_rows == 300
+
+    frame = table.to_pandas(["Seller_ID", "GMV"], ["SG"])
+    buffer = table.partitions["SG"].column("GMV").chunk(0).buffers()[1]
+    assert np.shares_memory(frame["GMV"].values, np.frombuffer(buffer, dtype=np.int64))
+    assert table.select(["GMV"], []).num_rows == 0
+
+
+def test_rewrite_invalidates_mapped_table(tmp_path):
+    """重写数据集后重新映射新数据"""
+    store = SellerStore(tmp_path).ensure(100)
+    first = store.mapped()
+    store.write(generate_mock_data(40))
+    assert store.mapped() is not first
+    assert store.mapped().num_rows == 40
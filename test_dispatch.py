@@ -0,0 +1,131 @@
+"""
+批量发送测试
+运行: python -m pytest test_dispatch.py
+"""
+
+import base64
+import email
+import time
+
+import pandas as pd
+import pytest
+
+from grow.cadence import FakeSink
+from grow.dispatch import Dispatcher, SmtpMailer, render_chunk
+from grow.stub_servers import SmtpSink
+
+
+def _interventions(n):
+    return pd.DataFrame({
+        "卖家": [f"S{i:05d}" for i in range(n)],
+        "里程碑": ["KYC验证"] * n,
+        "识别问题": ["KYC文档缺失"] * n,
+        "已延迟": range(n),
+        "推荐行动": ["联系协助KYC"] * n,
+        "预期解决时间": pd.array([2] * (n - 1) + [None], dtype="Int64"),
+        "优先级": ["高"] * n,
+    })
+
+
+def test_render_chunk():
+    """按模板填充每个卖家的字段，空值显示为 “-”，标题和正文按 UTF-8 编码"""
+    rows = _interventions(2).to_dict("records")
+    rows[1]["预期解决时间"] = None
+    rendered = render_chunk("onboarding_guidance", rows, "grow@example.com", "sellers.test")
+    to_addr, raw = rendered[1]
+    assert to_addr == "S00001@sellers.test"
+    message = email.message_from_string(raw)
+    assert str(email.header.make_header(email.header.decode_header(message["Subject"]))) == \
+        "[入驻指导] KYC验证: KYC文档缺失"
+    body = base64.b64decode(message.get_payload()).decode()
+    assert body.startswith("S00001 您好")
+    assert "已延迟 1 天" in body and "预计解决时间: - 天" in body and "快速入门指南" in body
+
+
+def test_dispatch_in_background():
+    """提交后立即返回，后台按顺序分块发送全部卖家"""
+    sink = FakeSink(keep=10_000)
+    dispatcher = Dispatcher(sink, workers=1, chunk_size=64)
+    job = dispatcher.submit("onboarding_guidance", _interventions(1000))
+    assert job.total == 1000
+    assert job.wait(10)
+    dispatcher.close()
+    assert (job.state, job.sent, job.failed, job.progress) == ("已完成", 1000, 0, 1.0)
+    assert sink.batches == 16
+    assert [to for to, _ in sink.messages] == [f"S{i:05d}@example.com" for i in range(1000)]
+
+    with pytest.raises(ValueError):
+        dispatcher.submit("newsletter", _interventions(1))
+
+
+class FlakySink(FakeSink):
+    """第二块发送失败"""
+
+    def send(self, messages):
+        if self.batches == 1:
+            self.batches += 1
+            raise ConnectionError("smtp down")
+        return super().send(messages)
+
+
+def test_failed_chunks_and_cancel():
+    """某一块发送失败时记录错误并继续；取消后停止发送剩余的块"""
+    dispatcher = Dispatcher(FlakySink(), workers=1, chunk_size=100)
+    job = dispatcher.submit("onboarding_guidance", _interventions(350))
+    job.wait(10)
+    assert (job.state, job.sent, job.failed) == ("已完成", 250, 100)
+    assert "smtp down" in job.last_error
+
+    slow = Dispatcher(FakeSink(latency=0.05), workers=1, chunk_size=10)
+    job = slow.submit("onboarding_guidance", _interventions(1000))
+    job.cancel()
+    job.wait(10)
+    assert job.state == "已取消" and job.sent < 1000
+    slow.close()
+    dispatcher.close()
+
+
+class PoolBreakingSink(FakeSink):
+    """发送第一块时杀掉渲染进程，等进程池标记为损坏后返回"""
+
+    def __init__(self):
+        super().__init__(keep=10_000)
+        self.dispatcher = None
+
+    def send(self, messages):
+        executor = self.dispatcher._executor
+        if self.batches == 0 and executor is not None:
+            for process in list(executor._processes.values()):
+                process.kill()
+            deadline = time.monotonic() + 30
+            while not executor._broken and time.monotonic() < deadline:
+                time.sleep(0.01)
+        return super().send(messages)
+
+
+def test_broken_pool_falls_back_without_losing_chunks():
+    """任务进行中进程池损坏时退回线程内渲染，在途和正在提交的块都不丢失"""
+    sink = PoolBreakingSink()
+    dispatcher = sink.dispatcher = Dispatcher(sink, workers=2, chunk_size=10)
+    job = dispatcher.submit("onboarding_guidance", _interventions(200))
+    assert job.wait(60)
+    dispatcher.close()
+    assert "BrokenProcessPool" in job.last_error
+    assert job.state == "已完成" and job.sent + job.failed == job.total == 200
+    assert sorted(to for to, _ in sink.messages) == [f"S{i:05d}@example.com" for i in range(200)]
+
+
+def test_process_pool_to_smtp_sink():
+    """进程池渲染，经本地 SMTP 替身发送"""
+    frame = pd.DataFrame({"卖家": ["FashionHub_MY", "ElectroMax_ID", "BeautyPro_VN"],
+                          "主要问题": ["图片质量低", "标题不完整", "图片质量低"],
+                          "建议行动": ["更新产品图片", "优化标题关键词", "更新产品图片"],
+                          "预期提升": ["+20%转化率", "+15%搜索排名", "+20%转化率"]})
+    with SmtpSink() as smtp:
+        dispatcher = Dispatcher(SmtpMailer(*smtp.address), workers=2, chunk_size=1)
+        job = dispatcher.submit("quality_improvements", frame)
+        job.wait(60)
+        dispatcher.close()
+        assert (job.state, job.sent) == ("已完成", 3)
+        assert smtp.received == 3
+        assert b"To: BeautyPro_VN@example.com" in smtp.last_message
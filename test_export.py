@@ -0,0 +1,120 @@
+"""
+表格和报告导出测试
+运行: python -m pytest test_export.py
+"""
+
+import io
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from grow import export as export_module
+from grow.export import export, iter_batches, success_report_batches
+from grow.schema import FEATURE_FLAGS
+from grow.table_view import TableIndex
+
+
+def _frame(n):
+    return pd.DataFrame({
+        "卖家": [f"Seller{i:05d}" for i in range(n)],
+        "层级": pd.Categorical(["T0", "T1", "T2"] * (n // 3) + ["T0"] * (n % 3)),
+        "收入": np.where(np.arange(n) % 4 == 0, np.nan, np.arange(n) * 1.5),
+    })
+
+
+class _CountingSink(io.RawIOBase):
+    """只统计写入字节数的输出，峰值内存不含文件内容本身；每次写入时记录 pyarrow 已分配的内存"""
+
+    def __init__(self):
+        self.size = 0
+        self.arrow_peak = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.size += len(data)
+        self.arrow_peak = max(self.arrow_peak, pa.total_allocated_bytes())
+        return len(data)
+
+
+def _read(data, extension):
+    if extension == "csv":
+        return pd.read_csv(io.BytesIO(data), encoding="utf-8-sig", keep_default_na=True)
+    if extension == "parquet":
+        return pq.read_table(io.BytesIO(data)).to_pandas()
+    sheet = load_workbook(io.BytesIO(data), read_only=True).active
+    header, *rows = sheet.values
+    return pd.DataFrame(rows, columns=header).astype({"收入": float})
+
+
+def test_formats_roundtrip():
+    """三种格式写出相同的行: 类别列按值写出，NaN 为空值；空表只有表头"""
+    frame = _frame(25)
+    for extension in ["csv", "xlsx", "parquet"]:
+        data = export(frame, extension, batch_rows=7).read()
+        result = _read(data, extension)
+        assert list(result.columns) == ["卖家", "层级", "收入"]
+        assert result["卖家"].tolist() == frame["卖家"].tolist()
+        assert result["层级"].tolist() == frame["层级"].astype(str).tolist()
+        pd.testing.assert_series_equal(result["收入"], frame["收入"], check_names=False)
+
+        empty = _read(export(frame.iloc[:0], extension).read(), extension)
+        assert list(empty.columns) == ["卖家", "层级", "收入"] and empty.empty
+    assert export(frame, "csv").read().startswith(b"\xef\xbb\xbf")
+
+
+def test_rows_order_sheet_rollover_and_constant_memory(monkeypatch):
+    """按查询结果的行号顺序导出；超过工作表行数上限时续写到新工作表；CSV/Parquet 峰值内存有与行数无关的上限"""
+    index = TableIndex(_frame(30))
+    positions = index.query("收入", True)
+    batches = list(iter_batches(index, batch_rows=8, rows=positions))
+    assert [len(b) for b in batches] == [8, 8, 8, 6]
+    data = export(index, "csv", rows=positions, batch_rows=8).read()
+    assert _read(data, "csv")["卖家"].tolist() == index.page_frame(positions, 0, 30)["卖家"].tolist()
+
+    monkeypatch.setattr(export_module, "XLSX_MAX_ROWS", 11)
+    workbook = load_workbook(io.BytesIO(export(_frame(25), "xlsx").read()), read_only=True)
+    assert workbook.sheetnames == ["数据", "数据 (2)", "数据 (3)"]
+    assert [len(list(sheet.values)) for sheet in workbook.worksheets] == [11, 11, 6]
+
+    # 100 万行（约 27 MB）: 整表转为 Python 对象或合并成一块都会远超下面的固定上限
+    table = TableIndex(_frame(1_000_000)).table
+    for extension in ["csv", "parquet"]:
+        sink, before = _CountingSink(), pa.total_allocated_bytes()
+        tracemalloc.start()
+        export(table, extension, sink=sink)
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert sink.size > 0
+        assert python_peak < 1024 * 1024
+        assert sink.arrow_peak - before < 8 * 1024 * 1024 < table.nbytes
+
+
+def test_success_report_batches():
+    """成功报告逐批组装，功能贡献由归因结果得出"""
+    n = 5
+    sellers = pd.DataFrame({
+        "Seller": [f"S{i}" for i in range(n)], "Country": ["SG", "MY", "TH", "VN", "ID"],
+        "Category": ["Beauty"] * n, "Tier": ["T0", "T1", "T2", "T0", "T1"],
+    })
+    lifts = np.zeros((n, len(FEATURE_FLAGS)))
+    lifts[0] = 0.1
+    lifts[1, 0] = 0.2
+    attribution = pd.DataFrame(lifts, columns=FEATURE_FLAGS).assign(
+        基准收入=1000.0, 当前收入=1100.0, 收入提升=0.1)
+    forecast = pd.DataFrame({"预测增长": np.linspace(0, 0.4, n), "信心度": 0.9})
+    grades = pd.Series(["A", "B", None, "C", "A+"])
+
+    batches = list(success_report_batches(sellers, grades, np.full(n, 0.5), attribution, forecast, batch_rows=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    report = pd.read_csv(io.BytesIO(export(batches, "csv").read()), encoding="utf-8-sig")
+    assert list(report.columns) == ["卖家", "国家", "类目", "层级", "整体评分", "功能采用", "基准收入",
+                                    "当前收入", "收入提升", "预测增长", "信心度", "功能贡献"]
+    assert report["功能贡献"].tolist()[:3] == ["全功能", "FBA", "无显著贡献"]
+    assert report["整体评分"].isna().tolist() == [False, False, True, False, False]
+    assert np.allclose(report["预测增长"], forecast["预测增长"])
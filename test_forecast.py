@@ -0,0 +1,76 @@
+"""
+增长潜力预测测试
+运行: python -m pytest test_forecast.py
+"""
+
+import numpy as np
+
+from grow.forecast import (
+    FORECAST_COLUMNS, ForecastCache, GrowthForecaster, fingerprints, fit_forecast, weekly_from_daily,
+)
+
+
+def _weekly(n, weeks=104, seed=0):
+    """n 个卖家: 年增长 0~40%，年度季节性，周波动 5%"""
+    rng = np.random.RandomState(seed)
+    t = np.arange(weeks)[:, None]
+    growth = rng.uniform(0, 0.4, n)
+    level = rng.uniform(5e3, 5e4, n) * (1 + growth) ** (t / 52) * (1 + 0.2 * np.sin(2 * np.pi * t / 52))
+    return (level * rng.lognormal(0, 0.05, (weeks, n))).astype(np.float32, order="F"), growth
+
+
+def test_fit_forecast():
+    """拟合出趋势和季节性；区间包含真实增长，波动越大信心度越低"""
+    weekly, growth = _weekly(500)
+    t = np.arange(104, 117)
+    truth = ((1 + growth) ** (t[:, None] / 52) * (1 + 0.2 * np.sin(2 * np.pi * t[:, None] / 52))).sum(axis=0)
+    recent = np.arange(91, 104)[:, None]
+    truth = truth / ((1 + growth) ** (recent / 52) * (1 + 0.2 * np.sin(2 * np.pi * recent / 52))).sum(axis=0) - 1
+
+    result = fit_forecast(weekly)
+    assert result.shape == (500, len(FORECAST_COLUMNS))
+    point, lower, upper, confidence = result.T
+    assert np.median(np.abs(point - truth)) < 0.02 and np.abs(point - truth).max() < 0.1
+    assert ((lower <= truth) & (truth <= upper)).mean() > 0.85
+    noisy = fit_forecast(weekly * np.random.RandomState(1).lognormal(0, 0.3, weekly.shape))
+    assert (noisy[:, 3] < confidence).all()
+
+    # 按整周汇总，丢弃最早不足一周的天
+    daily = np.arange(30 * 2, dtype=np.float32).reshape(30, 2)
+    weekly = weekly_from_daily(daily)
+    assert weekly.shape == (4, 2) and weekly[0, 0] == daily[2:9, 0].sum() and weekly[-1, 1] == daily[-7:, 1].sum()
+
+
+def test_cache_refits_only_changed_sellers(tmp_path):
+    """再次运行只重新拟合周 GMV 有变化的卖家；缓存保存到文件，新进程继续使用"""
+    weekly, _ = _weekly(300)
+    ids = np.arange(1000, 1300)[::-1]
+    forecaster = GrowthForecaster(ForecastCache(tmp_path / "cache.npz"), workers=1)
+    first = forecaster.run(ids, weekly)
+    assert (first["recomputed"], first["cached"], first["version"]) == (300, 0, 1)
+
+    changed = weekly.copy()
+    changed[-1, [3, 150, 299]] *= 1.2
+    second = forecaster.run(ids, changed)
+    assert (second["recomputed"], second["cached"], second["version"]) == (3, 297, 2)
+    moved = ~np.isclose(first["forecast"]["预测增长"], second["forecast"]["预测增长"])
+    assert list(np.flatnonzero(moved)) == [3, 150, 299]
+
+    reloaded = GrowthForecaster(ForecastCache(tmp_path / "cache.npz"), workers=1)
+    third = reloaded.run(ids[:100], changed[:, :100])
+    assert (third["recomputed"], third["version"]) == (0, 2)
+    assert np.allclose(third["forecast"], second["forecast"][:100])
+    assert (fingerprints(weekly) != fingerprints(changed)).sum() == 3
+
+
+def test_process_pool_matches_inline():
+    """进程池通过共享内存分块拟合，结果与调用线程内拟合相同"""
+    weekly, _ = _weekly(250)
+    ids = np.arange(250)
+    pooled = GrowthForecaster(workers=2, chunk_size=60)
+    try:
+        result = pooled.run(ids, weekly)
+    finally:
+        pooled.close()
+    inline = GrowthForecaster(workers=1).run(ids, weekly)
+    assert np.allclose(result["forecast"], inline["forecast"])
@@ -0,0 +1,114 @@
+"""
+事件溯源漏斗测试
+运行: python -m pytest test_funnels.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grow.funnels import (
+    FunnelTracker, RECRUITMENT_STAGES, RECRUITMENT_ADVANCE, RECRUITMENT_DWELL,
+    generate_mock_transitions, replay,
+)
+
+END = pd.Timestamp("2026-06-30 12:00")
+
+
+def _events(n=3000):
+    rng = np.random.RandomState(0)
+    return generate_mock_transitions(
+        [f"S{i}" for i in range(n)], rng.choice(["SG", "MY", "TH"], n), rng.choice(["P0", "P1", "P2"], n),
+        RECRUITMENT_STAGES, RECRUITMENT_ADVANCE, RECRUITMENT_DWELL, END, days=120,
+    )
+
+
+def _rescan(events, start, end, countries, by):
+    """直接扫描事件日志的参考实现（阶段顺序推进、无跳过）"""
+    entered = events[events["阶段"] == RECRUITMENT_STAGES[0]].set_index("卖家")["时间"]
+    events = events.assign(进入=events["卖家"].map(entered))
+    day = events["进入" if by == "cohort" else "时间"].dt.normalize()
+    subset = events[(day >= start) & (day <= end) & events["国家"].isin(countries)]
+    return [int((subset["阶段"] == stage).sum()) for stage in RECRUITMENT_STAGES], subset
+
+
+def test_slices_match_rescan_of_event_log():
+    """任意日期范围、国家切片的计数与重扫事件日志一致"""
+    events = _events()
+    tracker = FunnelTracker(RECRUITMENT_STAGES, END - pd.Timedelta(days=120))
+    # 分多批追加，模拟事件流
+    for batch in np.array_split(np.arange(len(events)), 7):
+        tracker.record_many(events.iloc[batch])
+
+    start, end = pd.Timestamp("2026-03-15"), pd.Timestamp("2026-05-20")
+    for by in ["cohort", "activity"]:
+        expected, subset = _rescan(events, start, end, ["SG", "TH"], by)
+        assert tracker.counts(start, end, ["SG", "TH"], by=by).tolist() == expected
+    assert tracker.counts().tolist() == _rescan(events, END - pd.Timedelta(days=200), END, ["SG", "MY", "TH"],
+                                                "cohort")[0]
+
+    # 平均周期 = 签约时间 - 进入时间 的平均值
+    _, subset = _rescan(events, start, end, ["SG", "TH"], "cohort")
+    signed = subset[subset["阶段"] == RECRUITMENT_STAGES[-1]]
+    expected_days = ((signed["时间"] - signed["进入"]) / pd.Timedelta(days=1)).mean()
+    assert tracker.average_days(-1, start, end, ["SG", "TH"]) == pytest.approx(expected_days)
+
+
+def test_priority_table():
+    """按优先级的 数量、签约率、平均周期"""
+    events = _events()
+    tracker = replay(events, RECRUITMENT_STAGES, END - pd.Timedelta(days=120))
+    table = tracker.priority_table()
+    assert table["优先级"] == ["P0", "P1", "P2"]
+    for priority, count, rate in zip(table["优先级"], table["数量"], table["签约率"]):
+        mine = events[events["优先级"] == priority]
+        assert count == (mine["阶段"] == "潜在对象").sum()
+        assert rate == pytest.approx((mine["阶段"] == "已签约").sum() / count)
+    # 高优先级签约更多、周期更短
+    assert table["签约率"][0] > table["签约率"][2]
+    assert table["平均周期"][0] < table["平均周期"][2]
+
+
+def test_single_records_between_queries_match_replay():
+    """批量写入后逐条写入、穿插查询: 增量更新的计数和前缀和与重放事件日志一致"""
+    events = _events()
+    tracker = FunnelTracker(RECRUITMENT_STAGES, END - pd.Timedelta(days=120))
+    tracker.record_many(events)
+    window = (pd.Timestamp("2026-04-01"), END)
+    tracker.counts(*window)
+    signed = set(events.loc[events["阶段"] == RECRUITMENT_STAGES[-1], "卖家"])
+    pending = [s for s in events["卖家"].unique() if s not in signed][:40]
+    for i, seller in enumerate(pending):
+        tracker.record(seller, RECRUITMENT_STAGES[-1], END + pd.Timedelta(hours=i))
+        tracker.record(f"New{i}", RECRUITMENT_STAGES[0], END + pd.Timedelta(hours=i), "SG", "P1")
+        if i % 10 == 0:
+            tracker.counts(*window, by="activity")
+
+    expected = replay(tracker.events(), RECRUITMENT_STAGES, END - pd.Timedelta(days=120))
+    for by in ["cohort", "activity"]:
+        assert tracker.counts(*window, ["SG", "TH"], by=by).tolist() == \
+            expected.counts(*window, ["SG", "TH"], by=by).tolist()
+    assert tracker.average_days(-1, *window) == pytest.approx(expected.average_days(-1, *window))
+    assert len(tracker.events()) == len(events) + 80
+
+
+def test_out_of_order_and_skipped_stages():
+    """跳过的阶段一并计入，重复和回退的事件不计数；非法事件被拒绝"""
+    tracker = FunnelTracker(RECRUITMENT_STAGES, "2026-01-01")
+    tracker.record("A", "潜在对象", "2026-01-02", "SG", "P0")
+    tracker.record("A", "谈判中", "2026-01-05")
+    tracker.record("A", "已联系", "2026-01-06")
+    tracker.record("A", "谈判中", "2026-01-07")
+    tracker.record("B", "已签约", "2026-01-03", "MY", "P1")
+    assert tracker.counts().tolist() == [2, 2, 2, 1]
+    assert tracker.counts("2026-01-05", "2026-01-05", by="activity").tolist() == [0, 1, 1, 0]
+    assert tracker.counts(priorities=["P0"]).tolist() == [1, 1, 1, 0]
+    assert tracker.average_days("谈判中", countries=["SG"]) == pytest.approx(3)
+    assert len(tracker.events()) == 5
+
+    with pytest.raises(ValueError):
+        tracker.record("C", "面试", "2026-01-08", "SG", "P0")
+    with pytest.raises(ValueError):
+        tracker.record("C", "潜在对象", "2025-12-31", "SG", "P0")
+    with pytest.raises(ValueError):
+        tracker.record("C", "潜在对象", "2026-01-08", "JP", "P0")
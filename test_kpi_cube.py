@@ -0,0 +1,100 @@
+"""
+ICQ 指标聚合立方体测试
+运行: python -m pytest test_kpi_cube.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grow.datastore import generate_mock_data, iter_mock_weekly_facts
+from grow.kpi_cube import KPICube, WEEKLY_TARGETS, build_cube, icq_metrics, target_share, ytd_progress_table
+
+
+def _weekly_facts(weeks=20):
+    sellers = generate_mock_data(400)
+    return list(iter_mock_weekly_facts(sellers, weeks=weeks, end="2026-03-02"))
+
+
+def test_week_totals_match_full_scan():
+    """单周切片与明细全量扫描结果一致"""
+    facts = _weekly_facts()
+    cube = build_cube(facts)
+    week, frame = facts[-3]
+    subset = frame[frame["Country"].isin(["SG", "TH"]) & (frame["Tier"] == "T2")]
+    totals = cube.week_totals(week, countries=["SG", "TH"], tiers=["T2"])
+    assert totals["launched"] == subset["Launched"].sum()
+    assert np.isclose(totals["gms"], subset["GMS"].sum())
+    assert totals["active_sellers"] == len(subset)
+
+
+def test_range_totals_use_prefix_sums():
+    """区间合计等于逐周相加，YTD 只包含当年的周"""
+    facts = _weekly_facts()
+    cube = build_cube(facts)
+    start, end = facts[4][0], facts[12][0]
+    expected = sum(f["GMS"].sum() for w, f in facts if start <= w <= end)
+    assert np.isclose(cube.range_totals(start, end)["gms"], expected)
+
+    ytd = sum(f["FBA_BA"].sum() for w, f in facts if w.year == 2026)
+    assert cube.ytd_totals()["fba_ba"] == ytd
+
+
+def test_incremental_ingest_updates_later_prefixes():
+    """补录历史周数据后，之后各周的累计值同步更新"""
+    facts = _weekly_facts(weeks=6)
+    cube = build_cube(facts)
+    before = cube.range_totals(facts[0][0], facts[-1][0])["gms"]
+    week, frame = facts[2]
+    cube.ingest(week, frame.head(10))
+    after = cube.range_totals(facts[0][0], facts[-1][0])["gms"]
+    assert np.isclose(after - before, frame.head(10)["GMS"].sum())
+
+
+def test_new_week_extends_cube():
+    """新一周数据到达时立方体向后扩展，跳过的周视为0"""
+    facts = _weekly_facts(weeks=3)
+    cube = build_cube(facts)
+    week, frame = facts[-1]
+    cube.ingest(week + pd.Timedelta(weeks=2), frame)
+    assert cube.n_weeks == 5
+    assert cube.week_totals(week + pd.Timedelta(weeks=1))["gms"] == 0
+    assert np.isclose(cube.week_totals()["gms"], frame["GMS"].sum())
+
+
+def test_dashboard_tables():
+    """仪表板指标和 YTD 表结构完整"""
+    cube = build_cube(_weekly_facts())
+    metrics = icq_metrics(cube, ["SG", "MY"])
+    assert [m["label"] for m in metrics][0] == "Launched Sellers"
+    assert all(m["delta"].endswith("WoW") for m in metrics)
+    table = ytd_progress_table(cube, ["SG", "MY"])
+    assert list(table.columns) == ["指标", "YTD实际", "YTD目标", "完成率", "状态"]
+    assert len(table) == 5
+
+
+def test_targets_are_shared_by_selected_countries():
+    """周目标是全部国家的合计；只选部分国家时计数类目标按活跃卖家占比分摊，比率类目标不变"""
+    facts = _weekly_facts()
+    cube = build_cube(facts)
+    sellers = pd.concat([frame for _, frame in facts])
+    share = target_share(cube, ["SG", "MY"])
+    assert share == pytest.approx(sellers["Country"].isin(["SG", "MY"]).mean())
+    assert target_share(cube) == target_share(cube, list(cube.dims["Country"])) == 1.0
+
+    everywhere, selected = icq_metrics(cube), icq_metrics(cube, ["SG", "MY"])
+    assert everywhere[0]["caption"].startswith(f"目标: {WEEKLY_TARGETS['Launched Sellers']}")
+    assert selected[0]["caption"].startswith(f"所选国家目标: {WEEKLY_TARGETS['Launched Sellers'] * share:.0f}")
+    assert selected[-1]["caption"].startswith("所选国家目标: 70%")
+    ytd = ytd_progress_table(cube, ["SG", "MY"]).set_index("指标")["YTD目标"]
+    assert ytd["Ads Adoption"] == "70%"
+
+
+def test_rejects_misaligned_week():
+    """周起始日期必须对齐"""
+    cube = KPICube("2026-01-05")
+    try:
+        cube.week_index("2026-01-07")
+    except ValueError:
+        return
+    raise AssertionError("未对齐的周应报错")
@@ -0,0 +1,85 @@
+"""
+入驻里程碑跟踪测试
+运行: python -m pytest test_onboarding.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grow.onboarding import (
+    MilestoneTracker, DONE, IN_PROGRESS, BLOCKED, NOT_STARTED, MILESTONE_SLA_DAYS,
+    generate_mock_onboarding, pack, unpack,
+)
+
+NOW = pd.Timestamp("2026-06-30 12:00")
+
+
+def test_pack_roundtrip():
+    """每个卖家 1 字节，4 个里程碑状态无损还原"""
+    states = np.random.RandomState(0).randint(0, 4, size=(1000, 4))
+    packed = pack(states)
+    assert packed.dtype == np.uint8 and packed.shape == (1000,)
+    assert (unpack(packed) == states).all()
+
+
+def test_evaluate_matches_per_seller_loop():
+    """向量化的进度、停留天数和 SLA 超时与逐卖家计算一致"""
+    tracker = generate_mock_onboarding(3000, now=NOW)
+    result = tracker.evaluate(NOW)
+    t = (NOW - tracker.base) / pd.Timedelta(days=1)
+    states = unpack(tracker.packed)
+    for i in range(len(tracker)):
+        progress, worst_ratio = 0.0, 0.0
+        for m in range(4):
+            status = states[i, m]
+            if status == DONE:
+                progress += 1
+            elif status in (IN_PROGRESS, BLOCKED):
+                progress += 0.5
+                late = t - tracker.started[i, m] - MILESTONE_SLA_DAYS[m]
+                worst_ratio = max(worst_ratio, late / MILESTONE_SLA_DAYS[m])
+        assert result["progress"][i] == pytest.approx(progress / 4)
+        assert result["stalled"][i] == (worst_ratio > 0)
+
+    # 按国家筛选的行与全量结果一致
+    rows = tracker.rows_for(["TH", "MY"])
+    subset = tracker.evaluate(NOW, rows=rows)
+    assert (subset["stalled"] == result["stalled"][rows]).all()
+    table = tracker.milestone_table(rows, subset)
+    assert len(table) == len(rows) and list(table.columns[1:5]) == ["账户设置", "KYC验证", "产品Listing", "首次发货"]
+
+
+def test_interventions_and_status_updates():
+    """卡住的卖家生成干预行动；更新状态后不再卡住"""
+    tracker = generate_mock_onboarding(4, now=NOW)
+    actions = tracker.interventions(now=NOW).set_index("卖家")
+    assert list(actions.index) == ["FashionPlus_TH", "HomeStyle_MY"]
+    assert actions.loc["FashionPlus_TH", "识别问题"] == "KYC文档缺失"
+    assert actions.loc["FashionPlus_TH", "已延迟"] == 3
+    assert actions.loc["FashionPlus_TH", "优先级"] == "高"
+    assert actions.loc["HomeStyle_MY", "里程碑"] == "产品Listing"
+
+    tracker.set_status([1], 1, DONE, NOW)
+    tracker.set_status([1], 3, IN_PROGRESS, NOW)
+    result = tracker.evaluate(NOW)
+    assert list(unpack(tracker.packed[[1]])[0]) == [DONE, DONE, DONE, IN_PROGRESS]
+    assert result["progress"][1] == pytest.approx(0.875)
+    assert not result["stalled"][1]
+    assert [b["卡住"] for b in tracker.bottlenecks(result)] == [0, 0, 1, 0]
+
+    tracker.set_status([2], 2, NOT_STARTED)
+    assert np.isnan(tracker.started[2, 2])
+    assert not tracker.evaluate(NOW)["stalled"].any()
+
+
+def test_timestamps_are_converted_to_days():
+    """Timestamp 输入按 base 转为天数"""
+    started = np.array([["2026-06-01", "2026-06-03", "NaT", "NaT"]], dtype="datetime64[ns]")
+    completed = np.array([["2026-06-02", "NaT", "NaT", "NaT"]], dtype="datetime64[ns]")
+    tracker = MilestoneTracker(["A"], ["SG"], [[DONE, IN_PROGRESS, NOT_STARTED, NOT_STARTED]],
+                               started, completed, "2026-06-01")
+    result = tracker.evaluate("2026-06-10")
+    assert result["dwell"][0, 0] == pytest.approx(1)
+    assert result["dwell"][0, 1] == pytest.approx(7)
+    assert result["overdue"][0, 1] == pytest.approx(4)
@@ -0,0 +1,95 @@
+"""
+AI 推荐服务测试（使用离线假模型）
+运行: python -m pytest test_recommender.py
+"""
+
+import json
+
+import pytest
+
+from grow.datastore import generate_mock_data, AI_COLUMNS, SELLER_COLUMNS
+from grow.recommender import (
+    BedrockBackend, FakeModel, RecommendationCache, RecommendationService,
+    recommend_for_sellers,
+)
+
+
+def _service(tmp_path, **kwargs):
+    backend = FakeModel()
+    cache = RecommendationCache(tmp_path / "rec.sqlite", **kwargs)
+    return RecommendationService(backend, cache, batch_size=10), backend
+
+
+def test_identical_prompts_are_deduplicated_and_batched(tmp_path):
+    """相同特征只请求一次，未命中的唯一提示按批合并"""
+    service, backend = _service(tmp_path)
+    records = [{"Tier": "T1", "GMV": 100_000 + i % 25} for i in range(100)]
+    results = service.recommend("seller_growth", records)
+    assert len(results) == 100
+    assert backend.items == 25
+    assert backend.calls == 3
+
+
+def test_cache_survives_new_service_instances(tmp_path):
+    """持久化缓存让新会话不再请求模型"""
+    frame = generate_mock_data(300)
+    seller_data, ai_analysis = frame[SELLER_COLUMNS], frame[AI_COLUMNS]
+    service, backend = _service(tmp_path)
+    first = recommend_for_sellers(service, seller_data, ai_analysis)
+    assert backend.calls > 0
+
+    again, backend_again = _service(tmp_path)
+    assert recommend_for_sellers(again, seller_data, ai_analysis) == first
+    assert backend_again.calls == 0
+
+
+def test_changed_features_miss_the_cache(tmp_path):
+    """特征快照变化后重新请求"""
+    service, backend = _service(tmp_path)
+    service.recommend("seller_growth", [{"Growth Rate": 5.0}])
+    service.recommend("seller_growth", [{"Growth Rate": 5.001}])
+    assert backend.items == 1
+    service.recommend("seller_growth", [{"Growth Rate": -3.0}])
+    assert backend.items == 2
+
+
+def test_ttl_eviction(tmp_path):
+    """过期条目不再命中，打开缓存时和每 evict_every 次写入后被删除"""
+    service, backend = _service(tmp_path, ttl=60, evict_every=2)
+    service.cache.put_many({"stale": "x"}, now=0)
+    assert service.cache.get_many(["stale"]) == {}
+    assert len(service.cache) == 1
+    service.cache.put_many({"fresh": "y"})
+    assert len(service.cache) == 1
+
+    service.cache.put_many({"stale": "x"}, now=0)
+    reopened = RecommendationCache(tmp_path / "rec.sqlite", ttl=60)
+    assert reopened.get_many(["fresh", "stale"]) == {"fresh": "y"} and len(reopened) == 1
+
+
+def test_bedrock_backend_packs_batch_into_one_request():
+    """Bedrock 后端一次请求处理整批卖家"""
+    class Body:
+        def __init__(self, text):
+            self.text = text
+
+        def read(self):
+            return json.dumps({"content": [{"text": self.text}]})
+
+    class Client:
+        requests = []
+
+        def invoke_model(self, modelId, body):
+            self.requests.append(json.loads(body))
+            return {"body": Body(json.dumps(["扩展产品线", "增加广告投入"]))}
+
+    client = Client()
+    backend = BedrockBackend(model_id="test-model", client=client)
+    assert backend.generate("seller_growth", [{"GMV": 1}, {"GMV": 2}]) == ["扩展产品线", "增加广告投入"]
+    assert len(client.requests) == 1
+    assert '"GMV": 2' in client.requests[0]["messages"][0]["content"]
+
+    # 返回的不是数组时报出明确的错误
+    Client.invoke_model = lambda self, modelId, body: {"body": Body(json.dumps({"error": "overloaded"}))}
+    with pytest.raises(ValueError, match="dict"):
+        backend.generate("seller_growth", [{"GMV": 1}])
@@ -0,0 +1,92 @@
+"""
+后台刷新调度器测试
+运行: python -m pytest test_scheduler.py
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from grow.scheduler import RefreshScheduler, Snapshot
+
+
+def _counter():
+    calls = []
+
+    def refresh():
+        calls.append(time.monotonic())
+        return {"n": len(calls)}
+
+    return refresh, calls
+
+
+def test_refreshes_on_interval_in_background():
+    """按间隔在后台刷新，快照版本递增"""
+    refresh, calls = _counter()
+    scheduler = RefreshScheduler(refresh, interval=0.05).start()
+    try:
+        time.sleep(0.3)
+    finally:
+        scheduler.stop()
+    assert len(calls) >= 3
+    assert scheduler.snapshot.version == len(calls)
+    assert scheduler.snapshot.data == {"n": len(calls)}
+
+
+def test_disabled_scheduler_does_not_refresh():
+    """关闭自动刷新后只保留初始快照"""
+    refresh, calls = _counter()
+    scheduler = RefreshScheduler(refresh, interval=0.05, enabled=False).start()
+    try:
+        time.sleep(0.2)
+        assert len(calls) == 1
+        scheduler.configure(enabled=True)
+        time.sleep(0.15)
+    finally:
+        scheduler.stop()
+    assert len(calls) >= 2
+
+
+def test_readers_never_block_on_slow_refresh():
+    """刷新进行中，读取快照不需要等待"""
+    release = threading.Event()
+
+    def slow_refresh():
+        release.wait(2)
+        return {"fresh": True}
+
+    scheduler = RefreshScheduler(slow_refresh, interval=3600)
+    worker = threading.Thread(target=scheduler.refresh_now)
+    worker.start()
+    start = time.perf_counter()
+    snapshot = scheduler.snapshot
+    assert time.perf_counter() - start < 0.01
+    assert snapshot.version == 0
+    release.set()
+    worker.join()
+    assert scheduler.snapshot.data == {"fresh": True}
+    assert scheduler.snapshot.duration > 0
+
+
+def test_failed_refresh_keeps_previous_snapshot():
+    """刷新失败时保留上一份快照并记录错误"""
+    state = {"fail": False}
+
+    def refresh():
+        if state["fail"]:
+            raise RuntimeError("数据源不可用")
+        return {"ok": True}
+
+    scheduler = RefreshScheduler(refresh, interval=3600)
+    first = scheduler.refresh_now()
+    state["fail"] = True
+    assert scheduler.refresh_now() is first
+    assert "数据源不可用" in scheduler.last_error
+
+
+def test_age_label():
+    """同步时间显示"""
+    now = datetime(2026, 1, 1, 12, 0)
+    assert Snapshot(1, synced_at=now).age_label(now) == "刚刚"
+    assert Snapshot(1, synced_at=now - timedelta(minutes=3)).age_label(now) == "3分钟前"
+    assert Snapshot(0).age_label(now) == "尚未同步"
@@ -0,0 +1,60 @@
+"""
+表格数据模式和显示格式化测试
+运行: python -m pytest test_schema.py
+"""
+
+import pandas as pd
+
+from grow import schema
+from grow.formatting import format_frame, money, percent, signed_percent, flag
+from grow.table_view import TableIndex
+
+
+def test_formatters_match_display_strings():
+    """格式化结果与原先预格式化的显示文本一致"""
+    assert money(pd.Series([2.5e6, 150e3, 98e3, 800])).tolist() == ["$2.5M", "$150K", "$98K", "$800"]
+    assert percent(pd.Series([0.95, 0.08, 1.0])).tolist() == ["95%", "8%", "100%"]
+    assert signed_percent(pd.Series([0.3, -0.05])).tolist() == ["+30%", "-5%"]
+    assert flag(pd.Series([True, False])).tolist() == ["✅ 已启用", "❌ 未启用"]
+
+
+def test_missing_values_render_as_na():
+    frame = schema.INTERVENTION_ACTIONS.frame({"预期解决时间": [2, None], "优先级": ["高", "低"]})
+    assert str(frame["预期解决时间"].dtype) == "Int64"
+    shown = format_frame(frame, schema.INTERVENTION_ACTIONS.formats)
+    assert shown["预期解决时间"].tolist() == ["2天", "N/A"]
+    # 格式化返回新表，原表保持数值类型
+    assert frame["预期解决时间"].iloc[0] == 2
+
+
+def test_schema_applies_typed_columns():
+    """数值、类别、布尔列按模式转换，未列出的文本列保持不变"""
+    frame = schema.FEATURE_ADOPTION.frame({
+        "卖家": ["A", "B"], "FBA": [True, False], "广告": [True, True],
+        "促销": [False, False], "优惠券": [True, False],
+    })
+    assert all(frame[f].dtype == bool for f in schema.FEATURE_FLAGS)
+    assert frame[schema.FEATURE_FLAGS].mean(axis=1).tolist() == [0.75, 0.25]
+
+    prospects = schema.PROSPECT_ANALYSIS.frame({
+        "卖家": ["A", "B", "C"], "现有市场GMS": [1.2e6, 150e3, 2.5e6],
+        "优先级": ["P2", "P0", "P1"], "业务潜力": ["Medium", "Very High", "High"],
+    })
+    assert prospects["优先级"].dtype == schema.PRIORITY
+    # 数值排序: 字符串 “$150K” 按字典序会排在 “$1.2M” 之后
+    assert prospects.sort_values("现有市场GMS")["卖家"].tolist() == ["B", "A", "C"]
+    assert prospects.sort_values("业务潜力")["卖家"].tolist() == ["B", "C", "A"]
+
+
+def test_table_index_sorts_categories_in_category_order():
+    """有序类别按类别顺序排序，筛选下拉框也按类别顺序"""
+    frame = schema.TIME_PREDICTION.frame({
+        "卖家": ["A", "B", "C", "D"], "风险等级": ["低", "高", "中", "低"], "当前进度": [0.6, 0.7, 0.5, 0.9],
+    })
+    index = TableIndex(frame)
+    assert index.table.take(index.query("风险等级")).column("卖家").to_pylist() == ["B", "C", "A", "D"]
+    assert index.distinct("风险等级") == ["高", "中", "低"]
+    assert index.query(filters={"风险等级": ["低"]}).tolist() == [0, 3]
+    assert index.query(search="高").tolist() == [1]
+    page = index.page_frame(index.query("当前进度", descending=True), 0)
+    assert page["风险等级"].dtype == schema.LEVEL
@@ -0,0 +1,84 @@
+"""
+绩效记分卡测试
+运行: python -m pytest test_scorecard.py
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from grow.datastore import generate_mock_data
+from grow.scorecard import aggregate, build_scorecard, grade, load_scorecard, write_mock_raw_tables
+
+
+@pytest.fixture
+def raw(tmp_path):
+    sellers = generate_mock_data(1500)[["Seller_ID", "Seller", "Country"]]
+    write_mock_raw_tables(tmp_path / "raw", sellers, chunk_size=400)
+    return tmp_path, sellers
+
+
+def test_grades_by_threshold():
+    """阈值边界归入较高一档；未投放广告的卖家按其余两项重新加权；缺失数据为空"""
+    listing = np.array([90.0, 88.0, 50.0, 100.0, np.nan])
+    roi = np.array([4.0, np.nan, 0.0, 4.0, np.nan])
+    healthy = np.array([0.8, 0.8, 0.4, 0.6, np.nan])
+    total, grades, health = grade(listing, roi, healthy)
+    assert np.allclose(total[:4], [90, (0.4 * 88 + 0.3 * 80) / 0.7, 20 + 0 + 12, 40 + 30 + 18])
+    assert list(grades[:4]) == ["A+", "A", "C", "A"] and pd.isna(grades[4])
+    assert list(health[:4]) == ["优秀", "优秀", "一般", "良好"] and pd.isna(health[4])
+
+
+def test_join_matches_pandas_merge():
+    """按已排序卖家索引的连接聚合与 pandas groupby + merge 一致，不在本块的卖家被忽略"""
+    rng = np.random.RandomState(0)
+    ids = np.array([3, 5, 8, 13])
+    listings = pd.DataFrame({"Seller_ID": rng.choice([1, 3, 5, 13, 21], 200), "Images": rng.randint(0, 10, 200),
+                             "Title_Length": rng.randint(10, 200, 200), "A_Plus": rng.random_sample(200) < 0.5,
+                             "Rating": rng.uniform(1, 5, 200)})
+    ads = pd.DataFrame({"Seller_ID": rng.choice([3, 13, 21], 50), "Spend": rng.uniform(1, 10, 50),
+                        "Ad_Sales": rng.uniform(1, 40, 50)})
+    inventory = pd.DataFrame({"Seller_ID": rng.choice([3, 5, 13], 80), "On_Hand": rng.randint(0, 500, 80),
+                              "Daily_Units": rng.uniform(0, 10, 80)})
+    listing, roi, healthy = aggregate(ids, *(pa.Table.from_pandas(t) for t in (listings, ads, inventory)))
+
+    score = (0.35 * np.minimum(listings["Images"] / 9, 1) + 0.25 * np.minimum(listings["Title_Length"] / 150, 1)
+             + 0.2 * listings["A_Plus"] + 0.2 * (listings["Rating"] - 1) / 4) * 100
+    expected = pd.DataFrame({"Seller_ID": ids}).merge(
+        score.groupby(listings["Seller_ID"]).mean().rename("listing"), left_on="Seller_ID", right_index=True, how="left")
+    sums = ads.groupby("Seller_ID")[["Spend", "Ad_Sales"]].sum()
+    expected = expected.merge((sums["Ad_Sales"] / sums["Spend"]).rename("roi"),
+                              left_on="Seller_ID", right_index=True, how="left")
+    cover = inventory["On_Hand"] / inventory["Daily_Units"]
+    share = cover.between(14, 90).groupby(inventory["Seller_ID"]).mean().rename("healthy")
+    expected = expected.merge(share, left_on="Seller_ID", right_index=True, how="left")
+
+    assert np.allclose(listing, expected["listing"], equal_nan=True)
+    assert np.allclose(roi, expected["roi"], equal_nan=True)
+    assert np.allclose(healthy, expected["healthy"], equal_nan=True)
+    assert np.isnan(roi[1]) and np.isnan(listing[2]) and np.isnan(healthy[2])
+
+
+def test_chunked_build_matches_single_pass(raw):
+    """分块流式计算与一次性计算结果相同；演示卖家的评分保持原有水平"""
+    tmp_path, sellers = raw
+    assert build_scorecard(tmp_path / "raw", sellers, tmp_path / "a.parquet", chunk_size=97) == 1500
+    build_scorecard(tmp_path / "raw", sellers.sample(frac=1, random_state=0), tmp_path / "b.parquet",
+                    chunk_size=10_000)
+    chunked, single = load_scorecard(tmp_path / "a.parquet"), load_scorecard(tmp_path / "b.parquet")
+    pd.testing.assert_frame_equal(chunked, single)
+    assert list(chunked["卖家"]) == list(sellers["Seller"])
+
+    demo = chunked.set_index("卖家").loc[["TechGiant_SG", "FashionHub_MY", "BeautyPro_VN"]]
+    assert list(demo["整体评分"]) == ["A", "C+", "A+"]
+    assert list(demo["库存健康"]) == ["优秀", "需改善", "优秀"]
+    assert (demo["广告ROI"] - [3.2, 1.8, 4.1]).abs().max() < 0.5
+
+    mine = load_scorecard(tmp_path / "a.parquet", ["VN", "PH"])
+    assert set(mine["国家"]) == {"VN", "PH"} and len(mine) == sellers["Country"].isin(["VN", "PH"]).sum()
+
+    # 侧边栏清空所有国家时返回空表，列和类型不变
+    empty = load_scorecard(tmp_path / "a.parquet", [])
+    assert empty.empty and list(empty.columns) == list(chunked.columns)
+    assert (empty.dtypes == chunked.dtypes).all()
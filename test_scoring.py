@@ -0,0 +1,64 @@
+"""
+卖家评分引擎测试
+运行: python -m pytest test_scoring.py
+"""
+
+import time
+
+import numpy as np
+
+from grow.datastore import generate_mock_data
+from grow.scoring import score_sellers, score_frame, top_n_indices, high_potential_table
+
+
+def test_scores_stay_in_range():
+    """评分落在约定区间内"""
+    frame = generate_mock_data(5000)
+    scores = score_frame(frame, frame)
+    assert scores["AI_Growth_Score"].between(0, 100).all()
+    assert scores["Product_Gap_Count"].between(0, 14).all()
+    assert (scores["Revenue_Potential"] >= 0).all()
+
+
+def test_better_inputs_score_higher():
+    """增长、规模、合规、口碑更好的卖家得分更高"""
+    scores = score_sellers(
+        gmv=[50_000, 500_000],
+        growth_rate=[0.0, 20.0],
+        compliance_score=[65, 92],
+        active_days=[40, 300],
+        vos_sentiment=[3.2, 4.8],
+    )
+    assert scores["AI_Growth_Score"][1] > scores["AI_Growth_Score"][0]
+    assert scores["Revenue_Potential"][1] > scores["Revenue_Potential"][0]
+    assert scores["Product_Gap_Count"][1] < scores["Product_Gap_Count"][0]
+
+
+def test_top_n_matches_full_sort():
+    """argpartition 取前N与全量排序一致"""
+    values = np.random.RandomState(0).permutation(1000)
+    assert list(top_n_indices(values, 5)) == list(np.argsort(-values)[:5])
+    assert len(top_n_indices(values[:2], 5)) == 2
+
+
+def test_high_potential_table_ranks_by_score():
+    """高潜力卖家表按 AI_Growth_Score 降序"""
+    frame = generate_mock_data(200)
+    table = high_potential_table(frame, frame, n=5)
+    ranked = frame.set_index("Seller").loc[table["卖家"], "AI_Growth_Score"]
+    assert len(table) == 5
+    assert ranked.is_monotonic_decreasing
+    assert ranked.iloc[0] == frame["AI_Growth_Score"].max()
+
+
+def test_scores_one_million_sellers_under_a_second():
+    """100万卖家评分在1秒内完成"""
+    n = 1_000_000
+    rng = np.random.RandomState(1)
+    inputs = (
+        rng.randint(20000, 200000, n), rng.uniform(-5, 25, n), rng.randint(60, 95, n),
+        rng.randint(30, 365, n), rng.uniform(3.0, 5.0, n),
+    )
+    start = time.perf_counter()
+    score_sellers(*inputs)
+    assert time.perf_counter() - start < 1.0
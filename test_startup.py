@@ -0,0 +1,67 @@
+"""
+冷启动测试
+运行: python -m pytest test_startup.py
+
+用 python -X importtime 在新进程中导入页面模块，检查导入耗时；检查导入后加载了哪些模块。
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+# 导入 grow_ai_assistant 的耗时预算（毫秒，不含 streamlit 本身）；较慢的机器可用环境变量调整
+STARTUP_BUDGET_MS = float(os.environ.get("GROW_STARTUP_BUDGET_MS", "150"))
+# 只在标签页渲染时才用到的库和计算模块，导入页面模块时不应加载
+LAZY_MODULES = [
+    "pandas", "numpy", "pyarrow", "plotly.express", "openpyxl", "matplotlib", "requests",
+    "grow.datastore", "grow.schema", "grow.table_view", "grow.charts", "grow.matching", "grow.forecast", "grow.export",
+]
+
+
+def run_python(statement, *options):
+    return subprocess.run([sys.executable, *options, "-c", statement],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def import_times():
+    """新进程中导入页面模块，返回 -X importtime 的 {模块: (自身耗时, 累计耗时)}，单位微秒
+
+    importtime 只记录 import 语句，不记录 importlib.import_module（LazyModule 的导入），
+    检查加载了哪些模块要看 sys.modules。
+    """
+    times = {}
+    for line in run_python("import grow_ai_assistant", "-X", "importtime").stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def test_heavy_modules_are_lazy():
+    """导入页面模块只加载 streamlit，不加载 pandas、pyarrow 和各计算模块"""
+    loaded = set(run_python("import sys, grow_ai_assistant; print(*sys.modules)").stdout.split())
+    assert "streamlit" in loaded and "grow_ai_assistant" in loaded
+    assert [m for m in LAZY_MODULES if m in loaded] == []
+
+
+def test_startup_budget():
+    """导入页面模块自身的耗时（累计耗时减去 streamlit）不超过预算，取 3 次中最快的一次"""
+    costs = []
+    for _ in range(3):
+        times = import_times()
+        costs.append((times["grow_ai_assistant"][1] - times["streamlit"][1]) / 1000)
+    assert min(costs) < STARTUP_BUDGET_MS, f"冷启动 {min(costs):.0f} ms 超过预算 {STARTUP_BUDGET_MS:.0f} ms"
+
+
+def test_lazy_module_imports_on_first_use():
+    """LazyModule 创建时不导入，第一次访问属性时才导入"""
+    run_python("\n".join([
+        "import sys",
+        "from grow.lazy import LazyModule",
+        "forecast = LazyModule('grow.forecast')",
+        "assert 'grow.forecast' not in sys.modules",
+        "assert forecast.HORIZON_WEEKS == 13 and 'grow.forecast' in sys.modules",
+        "assert forecast.GrowthForecaster is sys.modules['grow.forecast'].GrowthForecaster",
+    ]))
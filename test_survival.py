@@ -0,0 +1,87 @@
+"""
+入驻完成时间预测测试
+运行: python -m pytest test_survival.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grow.onboarding import (
+    MilestoneTracker, DONE, IN_PROGRESS, NOT_STARTED, MOCK_DURATION_DAYS, generate_mock_onboarding, unpack,
+)
+from grow.survival import fit, backtest, train, _strata
+
+NOW = pd.Timestamp("2026-06-30 12:00")
+
+
+def test_fit_recovers_durations_with_censoring():
+    """期望耗时接近真实均值；剩余天数考虑已停留时间（含仍在进行中的删失样本）"""
+    tracker = generate_mock_onboarding(50000, now=NOW)
+    model, events = fit(tracker, NOW)
+    assert events == int((tracker.completed <= tracker.day(NOW)).sum())
+    means = model.mean.reshape(4, -1)[:, :-1]
+    assert np.allclose(means, np.array(MOCK_DURATION_DAYS)[:, None], rtol=0.1)
+
+    # 耗时固定为 4 天: 已停留 1 天的剩余约 3 天
+    n = 400
+    started = np.zeros((n, 4))
+    completed = np.full((n, 4), np.nan)
+    completed[:300, 0] = 4.0
+    started[300:, 0] = np.linspace(7, 9.5, 100)
+    started[:, 1:] = np.nan
+    states = np.full((n, 4), NOT_STARTED)
+    states[:300, 0], states[300:, 0] = DONE, IN_PROGRESS
+    fixed = MilestoneTracker([f"S{i}" for i in range(n)], ["SG"] * n, states, started, completed, "2026-01-01")
+    model, _ = fit(fixed, pd.Timestamp("2026-01-01") + pd.Timedelta(days=10))
+    strata = _strata(fixed)[:1, 0]
+    assert model.remaining(strata, np.array([1.0]))[0] == pytest.approx(3.0, abs=0.3)
+
+
+def test_incremental_fit_matches_full_fit():
+    """增量训练只累计新完成的里程碑，结果与全量训练一致"""
+    tracker = generate_mock_onboarding(5000, now=NOW)
+    previous, _ = fit(tracker, NOW)
+    later = NOW + pd.Timedelta(days=2)
+    rows = np.flatnonzero(unpack(tracker.packed)[:, 3] == IN_PROGRESS)[:200]
+    tracker.set_status(rows, 3, DONE, NOW + pd.Timedelta(days=1))
+
+    incremental, new = fit(tracker, later, previous=previous)
+    full, _ = fit(tracker, later)
+    assert new == len(rows)
+    assert np.array_equal(incremental.events, full.events)
+    assert np.allclose(incremental.residual, full.residual)
+
+
+def test_batch_prediction_matches_per_seller_sum():
+    """批量预测 = 进行中里程碑的期望剩余 + 未开始里程碑的期望耗时"""
+    tracker = generate_mock_onboarding(2000, now=NOW)
+    data = train(tracker, NOW)
+    model = data["model"]
+    assert 0 < data["accuracy"] <= 1 and data["samples"] > 0
+
+    result = tracker.evaluate(NOW)
+    remaining = model.predict(tracker, result=result)
+    strata = _strata(tracker)
+    for i in range(0, len(tracker), 97):
+        expected = 0.0
+        for m in range(4):
+            status = result["states"][i, m]
+            if status == NOT_STARTED:
+                expected += model.mean[strata[i, m]]
+            elif status != DONE:
+                expected += model.remaining(strata[i:i + 1, m], result["dwell"][i:i + 1, m])[0]
+        assert remaining[i] == pytest.approx(expected)
+
+    table = model.prediction_table(tracker, tracker.rows_for(["TH", "MY"]), NOW)
+    assert "TechCorp_VN" not in set(table["卖家"])
+    assert {"FashionPlus_TH", "HomeStyle_MY"} <= set(table["卖家"])
+    assert (table["当前进度"] < 1).all()
+    assert set(table["风险等级"]) <= {"高", "中", "低"}
+
+
+def test_backtest_without_history():
+    """没有截止前进行中的里程碑时返回 NaN"""
+    tracker = generate_mock_onboarding(4, now=NOW)
+    accuracy, mae, samples = backtest(tracker, NOW - pd.Timedelta(days=60))
+    assert samples == 0 and np.isnan(accuracy)
@@ -0,0 +1,58 @@
+"""
+服务端分页表格测试
+运行: python -m pytest test_table_view.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from grow.datastore import generate_mock_data
+from grow.table_view import TableIndex
+
+
+def test_sorted_pages_match_pandas():
+    """排序后的分页与 pandas 全表排序一致"""
+    frame = generate_mock_data(1000)
+    index = TableIndex(frame)
+    positions = index.query("GMV", descending=True)
+    expected = frame.sort_values("GMV", ascending=False, kind="stable")
+    page = index.page(positions, 2, 50).to_pandas()
+    assert len(page) == 50
+    assert page["GMV"].tolist() == expected["GMV"].iloc[100:150].tolist()
+    assert index.page_count(positions, 50) == 20
+
+
+def test_search_and_filters():
+    """搜索不区分大小写，筛选按取值集合过滤"""
+    frame = generate_mock_data(1000)
+    index = TableIndex(frame, search_columns=["Seller", "Category"])
+    positions = index.query(search="_sg")
+    assert len(positions) == frame["Seller"].str.lower().str.contains("_sg").sum()
+
+    positions = index.query("Growth Rate", filters={"Tier": ["T0", "T1"], "Country": ["MY"]})
+    expected = frame[frame["Tier"].isin(["T0", "T1"]) & (frame["Country"] == "MY")]
+    result = index.table.take(positions).to_pandas()
+    assert sorted(result["Seller_ID"]) == sorted(expected["Seller_ID"])
+    assert result["Growth Rate"].is_monotonic_increasing
+    assert index.distinct("Tier") == ["T0", "T1", "T2", "T3"]
+
+
+def test_query_results_are_cached_and_read_only():
+    """相同查询返回同一个只读行号数组，空结果也只有一页"""
+    index = TableIndex(generate_mock_data(200))
+    first = index.query("GMV", search="seller")
+    assert index.query("GMV", search=" SELLER ") is first
+    assert not first.flags.writeable
+
+    empty = index.query(search="no-such-seller")
+    assert len(empty) == 0
+    assert index.page_count(empty) == 1
+    assert index.page(empty, 0).num_rows == 0
+
+
+def test_nulls_sort_last():
+    frame = pd.DataFrame({"name": ["b", None, "a"], "value": [2.0, 1.0, np.nan]})
+    index = TableIndex(frame)
+    for descending in (False, True):
+        assert index.query("value", descending).tolist()[-1] == 2
+    assert index.query(search="a").tolist() == [2]
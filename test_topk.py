@@ -0,0 +1,62 @@
+"""
+高潜力卖家 Top-K 索引测试
+运行: python -m pytest test_topk.py
+"""
+
+import numpy as np
+
+from grow.datastore import generate_mock_data
+from grow.scoring import score_frame, rank_keys, high_potential_table
+from grow.topk import TopKIndex
+
+
+def _full_sort_top(index, k, countries=None):
+    mask = np.ones(len(index.keys), dtype=bool)
+    if countries is not None:
+        mask = np.isin(index.countries, countries)
+    positions = np.flatnonzero(mask)
+    return positions[np.argsort(-index.keys[positions], kind="stable")[:k]]
+
+
+def test_initial_top_matches_high_potential_table():
+    """初始 Top-K 与全量评分排序一致"""
+    frame = generate_mock_data(2000)
+    index = TopKIndex(frame, frame, k=5)
+    expected = high_potential_table(frame, score_frame(frame, frame), n=5)
+    assert list(index.table(5)["卖家"]) == list(expected["卖家"])
+
+
+def test_delta_updates_match_full_resort():
+    """随机增量更新后 Top-K 与全量重排一致"""
+    rng = np.random.RandomState(7)
+    frame = generate_mock_data(5000)
+    index = TopKIndex(frame, frame, k=10)
+    for _ in range(30):
+        ids = rng.choice(frame["Seller_ID"], 50, replace=False)
+        index.update(ids, gmv=rng.randint(20000, 400000, 50), growth_rate=rng.uniform(-5, 30, 50))
+        for countries in (None, ["SG", "MY"]):
+            got = index.top(10, countries)
+            want = _full_sort_top(index, 10, countries)
+            assert np.allclose(index.keys[got], index.keys[want])
+
+
+def test_demoted_seller_leaves_top():
+    """Top-K 内的卖家下滑后被后续卖家替换"""
+    frame = generate_mock_data(500)
+    index = TopKIndex(frame, frame, k=3)
+    leader = index.top(1)[0]
+    index.update([index.seller_ids[leader]], gmv=[1000], growth_rate=[-5])
+    assert leader not in index.top(3)
+    assert np.allclose(index.keys[index.top(3)], index.keys[_full_sort_top(index, 3)])
+
+
+def test_refresh_applies_only_changed_rows():
+    """refresh 只把有变化的行作为增量"""
+    frame = generate_mock_data(300)
+    index = TopKIndex(frame, frame, k=3)
+    assert index.refresh(frame) == 0
+    changed = frame.copy()
+    changed.loc[[3, 4], "GMV"] = 900_000
+    assert index.refresh(changed) == 2
+    assert index.gmv[3] == 900_000
+    assert np.allclose(index.keys[index.top(3)], index.keys[_full_sort_top(index, 3)])